@@ -0,0 +1,61 @@
+""" Backfill benchmark: parsing pages in the fetching threads vs. in a process pool. """
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from vdatafeed.ssi.backfill import ProcessBackfill
+from vdatafeed.ssi.columnar import BarColumns
+from vdatafeed.ssi.model import IntradayOHLC
+from vdatafeed.utils import list_adapter
+
+SYMBOLS = [f"S{i:03d}" for i in range(24)]
+LATENCY = 0.05  # seconds per request
+THREADS = 4
+
+
+def synthetic_page(symbol: str) -> bytes:
+    rows = [
+        {
+            "Symbol": symbol, "TradingDate": f"{9 + d:02d}/09/2024",
+            "Time": f"{9 + m // 60:02d}:{m % 60:02d}:00", "Open": "25.1", "High": "25.3",
+            "Low": "25.0", "Close": "25.2", "Volume": "1200", "Value": "30240000",
+        }
+        for d in range(3) for m in range(15, 255)
+    ]
+    return json.dumps({"status": 200, "totalRecord": len(rows), "data": rows}).encode()
+
+
+class FakeAPI:
+    scheduler = None
+    url_intraday_ohlc = "intraday"
+
+    def fetch_raw(self, url: str, params: dict) -> bytes:
+        time.sleep(LATENCY)
+        return synthetic_page(params["Symbol"])
+
+
+def in_threads(api: FakeAPI) -> int:
+    # the regular path: decode and build models next to the request, under the GIL
+    def fetch(symbol: str) -> BarColumns:
+        body = api.fetch_raw(api.url_intraday_ohlc, {"Symbol": symbol})
+        rows = list_adapter(IntradayOHLC).validate_python(json.loads(body)["data"])
+        return BarColumns.from_models(rows)
+    with ThreadPoolExecutor(THREADS) as executor:
+        return len(BarColumns.concat(list(executor.map(fetch, SYMBOLS))))
+
+
+def in_processes(api: FakeAPI) -> int:
+    backfill = ProcessBackfill(api, threads=THREADS)
+    return len(backfill.run("intraday", SYMBOLS, "2024-09-09", "2024-09-11"))
+
+
+if __name__ == "__main__":
+    api = FakeAPI()
+    print(f"{len(SYMBOLS)} requests of {len(synthetic_page('S'))} bytes, {LATENCY}s latency")
+    baseline = None
+    for name, fn in (("threads", in_threads), ("processes", in_processes)):
+        start = time.perf_counter()
+        rows = fn(api)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{name:>10}: {rows} rows in {elapsed:6.2f}s  ({baseline / elapsed:5.2f}x)")
@@ -0,0 +1,41 @@
+""" Throughput benchmark: one TradeTick per update vs. one TradeBatch per frame. """
+import time
+
+from vdatafeed.ssi import TradeBatch
+from vdatafeed.ssi.model import TradeTick
+
+FRAMES = 2000
+UPDATES = 20  # updates per frame
+
+
+def synthetic_frame() -> list:
+    return [
+        {
+            "Symbol": f"S{i:03d}", "TradingDate": "10/09/2024", "Time": "10:15:30",
+            "Ceiling": 27.5, "Floor": 23.9, "RefPrice": 25.7, "LastPrice": 25.8,
+            "LastVol": 1000, "TotalVol": 1250000 + i, "TotalVal": 3.2e10,
+        }
+        for i in range(UPDATES)
+    ]
+
+
+def per_tick(frame: list) -> None:
+    for msg in frame:
+        TradeTick(**dict(msg))
+
+
+def per_frame(frame: list) -> None:
+    TradeBatch.from_messages(frame)
+
+
+if __name__ == "__main__":
+    frame = synthetic_frame()
+    print(f"{FRAMES} frames of {UPDATES} trades")
+    baseline = None
+    for name, fn in (("per tick", per_tick), ("per frame", per_frame)):
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            fn(frame)
+        rate = FRAMES * UPDATES / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{name:>10}: {rate:12,.0f} updates/s  ({rate / baseline:5.2f}x)")
@@ -0,0 +1,38 @@
+""" Memory and update-time benchmark: float64 stores vs. stores built with a TickCodec. """
+import time
+
+import numpy as np
+
+from vdatafeed.ssi import OrderBookStore, TickCodec, TickTape
+
+SYMBOLS = 1600
+CAPACITY = 1024  # trades kept per symbol
+TRADES = 200000
+
+
+def fill(codec) -> tuple:
+    names = [f"S{i:04d}" for i in range(SYMBOLS)]
+    tape = TickTape(CAPACITY, names, codec=codec)
+    books = OrderBookStore(SYMBOLS, names, codec=codec)
+    rng = np.random.default_rng(0)
+    sids = rng.integers(0, SYMBOLS, TRADES)
+    prices = 10 * rng.integers(1000, 10000, TRADES)
+    start = time.perf_counter()
+    for n, (sid, price) in enumerate(zip(sids.tolist(), prices.tolist())):
+        tape.update(names[sid], price, 100, n, "2024-09-10T10:15:30")
+    for sid, price in zip(sids[:SYMBOLS].tolist(), prices.tolist()):
+        books.update(names[sid], [price] * 10, [500] * 10, [price + 10] * 10, [500] * 10)
+    return tape.nbytes, books.book.nbytes, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{SYMBOLS} symbols, {CAPACITY} trades per symbol, {TRADES} updates")
+    baseline = None
+    for name, codec in (("float64", None), ("codec", TickCodec(unit=10))):
+        tape, books, elapsed = fill(codec)
+        total = tape + books
+        baseline = baseline or total
+        print(
+            f"{name:>8}: tape {tape / 2 ** 20:7.1f} MiB, books {books / 2 ** 20:5.1f} MiB, "
+            f"{baseline / total:.2f}x smaller, {elapsed:.2f}s"
+        )
@@ -0,0 +1,56 @@
+""" Load-time benchmark: unpickling bar models vs. attaching to Arrow IPC buffers. """
+import os
+import pickle
+import tempfile
+import time
+
+from vdatafeed.ssi import BarColumns
+from vdatafeed.ssi.ipc import from_table, read_ipc, read_shared, write_ipc, write_shared
+from vdatafeed.ssi.model import EndOfDayOHLC
+
+SYMBOLS = 1600
+DAYS = 250
+
+
+def synthetic_bars() -> list:
+    return [
+        EndOfDayOHLC(
+            Symbol=f"S{s:04d}", Market="HOSE", TradingDate=f"{d % 28 + 1:02d}/01/2024",
+            Open="10.5", High="11", Low="10", Close="10.8", Volume="1000", Value="1e7"
+        )
+        for s in range(SYMBOLS) for d in range(DAYS)
+    ]
+
+
+def timed(name: str, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    print(f"{name:>22}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    bars = synthetic_bars()
+    columns = BarColumns.from_models(bars)
+    print(f"{len(bars):,} daily bars")
+    with tempfile.TemporaryDirectory() as directory:
+        pickled = os.path.join(directory, "bars.pkl")
+        with open(pickled, "wb") as file:
+            pickle.dump(bars, file)
+        arrow = write_ipc(columns, os.path.join(directory, "bars.arrow"))
+        block = write_shared(columns)
+
+        def load_pickle():
+            with open(pickled, "rb") as file:
+                pickle.load(file)
+
+        def load_shared():
+            table, attached = read_shared(block.name)
+            from_table(table)
+            del table
+            attached.close()
+
+        timed("unpickle models", load_pickle)
+        timed("memory-mapped IPC", lambda: from_table(read_ipc(arrow)))
+        timed("shared memory IPC", load_shared)
+        block.close()
+        block.unlink()
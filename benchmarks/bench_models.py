@@ -0,0 +1,42 @@
+""" Throughput benchmark: per-row vs. batch model building on 1000-row pages. """
+import json
+import time
+
+from vdatafeed.ssi.model import InstrumentInfo, InstrumentInfoTyped
+from vdatafeed.utils import list_adapter
+
+from bench_stream_parse import synthetic_page
+
+PAGES = 50
+
+
+def per_row(rows: list) -> list:
+    return [InstrumentInfo(**i) for i in rows]
+
+
+def batch(rows: list) -> list:
+    return list_adapter(InstrumentInfo).validate_python(rows)
+
+
+def batch_typed(rows: list) -> list:
+    return list_adapter(InstrumentInfoTyped).validate_python(rows)
+
+
+def raw(rows: list) -> list:
+    return list(rows)
+
+
+if __name__ == "__main__":
+    rows = json.loads(synthetic_page())["data"]
+    print(f"{PAGES} pages of {len(rows)} rows")
+    baseline = None
+    for name, fn in (
+        ("per-row", per_row), ("batch", batch), ("batch typed", batch_typed), ("raw", raw)
+    ):
+        fn(rows)  # warm up the cached adapters
+        start = time.perf_counter()
+        for _ in range(PAGES):
+            fn(rows)
+        rate = PAGES * len(rows) / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{name:>12}: {rate:12,.0f} rows/s  ({rate / baseline:5.2f}x)")
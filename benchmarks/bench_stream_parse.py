@@ -0,0 +1,58 @@
+""" Memory benchmark: buffered vs. streamed parsing of a synthetic 1000-row page. """
+import json
+import time
+import tracemalloc
+
+from vdatafeed.ssi.model import InstrumentInfo
+from vdatafeed.utils import JSONStream
+
+ROWS = 1000
+CHUNK = 65536
+
+
+def synthetic_page(rows: int = ROWS) -> bytes:
+    """
+    Builds a DailyStockPrice-shaped response body with ``rows`` rows.
+    """
+    data = []
+    for n in range(rows):
+        row = {
+            name: str(n) for name in (
+                f.validation_alias.choices[-1] for f in InstrumentInfo.model_fields.values()
+            )
+        }
+        row.update(Symbol=f"S{n:04d}", TradingDate="09/09/2024")
+        data.append(row)
+    return json.dumps({
+        "message": "Success", "status": "Success", "data": data, "totalRecord": rows
+    }).encode()
+
+
+def buffered(body: bytes) -> int:
+    # what res.json() does: decode the whole body, then build every dict, then the models
+    res = json.loads(body.decode())
+    return len([InstrumentInfo(**i) for i in res.get("data")])
+
+
+def streamed(body: bytes) -> int:
+    view = memoryview(body)
+    chunks = (bytes(view[i:i + CHUNK]) for i in range(0, len(view), CHUNK))
+    return len([InstrumentInfo(**i) for i in JSONStream(chunks)])
+
+
+def measure(fn, body: bytes) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, peak, elapsed
+
+
+if __name__ == "__main__":
+    body = synthetic_page()
+    print(f"payload: {len(body) / 1024:.0f} KiB, {ROWS} rows")
+    for name, fn in (("buffered", buffered), ("streamed", streamed)):
+        rows, peak, elapsed = measure(fn, body)
+        print(f"{name:>9}: {rows} rows, peak {peak / 1024:8.0f} KiB, {elapsed * 1000:7.1f} ms")
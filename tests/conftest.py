@@ -0,0 +1,194 @@
+""" Fixtures of the offline tests: HTTP is answered by a fake, nothing leaves the host. """
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+import requests
+
+from vdatafeed import Config
+from vdatafeed.ssi import SSIDatafeedAPI, SSIDatafeedHUB
+
+# live-network smoke scripts, run by hand with real credentials
+collect_ignore = ["test_api.py", "test_hub.py"]
+
+
+SIGNING_KEY = "offline-tests-signing-key-0123456789"
+
+
+def make_token(consumer_id: str = "id", ttl: int = 3600) -> str:
+    claims = {"sub": consumer_id, "exp": int(time.time()) + ttl}
+    return jwt.encode(claims, SIGNING_KEY, algorithm="HS256")
+
+
+def api_row(model, **values) -> dict:
+    """
+    Returns a response row of ``model`` as the API sends it: every member present,
+    blank unless given in ``values`` (by API member name).
+    """
+    row = {f.validation_alias.choices[-1]: "" for f in model.model_fields.values()}
+    row.update(values)
+    return row
+
+
+class FakeResponse:
+    def __init__(self, body=None, status: int = 200, headers: dict = None) -> None:
+        self.status_code: int = status
+        self.headers: dict = headers or {}
+        self.content: bytes = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.closed: bool = False
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeHTTP:
+    """
+    Stands in for ``requests.get``/``requests.post``. ``responder(url, params, headers)``
+    answers GETs (a ``FakeResponse`` or a JSON-serializable body); the auth endpoint
+    answers with a fresh token for the consumer ID posted.
+    """
+    def __init__(self) -> None:
+        self.calls: list = []  # (method, url, params or data, headers)
+        self.responder = lambda url, params, headers: {"data": [], "totalRecord": 0}
+
+    def get(self, url, headers=None, params=None, timeout=None, stream=False):
+        self.calls.append(("GET", url, dict(params or {}), dict(headers or {})))
+        res = self.responder(url, dict(params or {}), dict(headers or {}))
+        return res if isinstance(res, FakeResponse) else FakeResponse(res)
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.calls.append(("POST", url, dict(json or {}), dict(headers or {})))
+        token = make_token((json or {}).get("consumerID"))
+        return FakeResponse({"status": 200, "data": {"accessToken": token}})
+
+    def gets(self, part: str = "") -> list:
+        return [c for c in self.calls if c[0] == "GET" and part in c[1]]
+
+
+@pytest.fixture
+def http(monkeypatch) -> FakeHTTP:
+    fake = FakeHTTP()
+    monkeypatch.setattr(requests, "get", fake.get)
+    monkeypatch.setattr(requests, "post", fake.post)
+    return fake
+
+
+@pytest.fixture
+def make_api(http, tmp_path):
+    """
+    Builds SSI APIs answered by ``http``, with the one-second request spacing removed.
+    """
+    def make(**options) -> SSIDatafeedAPI:
+        options.setdefault("ssi_datafeed_id", "id")
+        options.setdefault("ssi_datafeed_secret", "secret")
+        options.setdefault("session_file", str(tmp_path / "session"))
+        api = SSIDatafeedAPI(Config(**options))
+        for credential in api.pool.credentials:
+            credential.limiter.interval = 0
+        if api.scheduler is not None and api.scheduler.limiter is not None:
+            api.scheduler.limiter.interval = 0
+        return api
+    return make
+
+
+def frame(data_type: str, *contents: dict) -> str:
+    """
+    Returns a hub frame carrying one update of ``data_type`` per content.
+    """
+    updates = [{"A": [json.dumps({"DataType": data_type, "Content": json.dumps(c)})]}
+               for c in contents]
+    return json.dumps({"M": updates})
+
+
+def tick(symbol: str, total_vol: float, time: str = "09:15:00", **values) -> dict:
+    """
+    Returns a hub update of ``symbol`` with every member the tick models require.
+    """
+    msg = {"TradingDate": "09/09/2024", "Time": time, "symbol": symbol, "Ceiling": 27.0,
+           "Floor": 23.0, "RefPrice": 25.0, "LastPrice": 25.0, "LastVol": 100,
+           "TotalVol": total_vol, "TotalVal": 0}
+    msg.update(values)
+    return msg
+
+
+class FakeSocket:
+    """
+    Stands in for a websocket: ``recv`` returns ``frames`` in order, then raises
+    ``error`` if given, else stays silent forever (a half-open connection). ``drained``
+    tells that every frame was handled.
+    """
+    def __init__(self, frames=(), error: Exception = None) -> None:
+        self.frames: list = list(frames)
+        self.error: Exception = error
+        self.sent: list = []
+        self.closed: bool = False
+        self.drained: bool = False
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+    async def recv(self) -> str:
+        await asyncio.sleep(0)
+        if self.frames:
+            return self.frames.pop(0)
+        if self.error is not None:
+            raise self.error
+        self.drained = True
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def run_until(coroutine, done, timeout: float = 2.0):
+    """
+    Runs ``coroutine`` until ``done()`` holds (or ``timeout``), then cancels it.
+    """
+    task = asyncio.ensure_future(coroutine)
+    deadline = time.monotonic() + timeout
+    while not done() and not task.done() and time.monotonic() < deadline:
+        await asyncio.sleep(0.005)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.fixture
+def make_hub(monkeypatch):
+    """
+    Builds hubs whose connections are the given ``FakeSocket``s, used in turn (then
+    silent ones).
+    Negotiation is answered locally; ``api`` fields override the fake API.
+    """
+    def make(sockets: list, **api) -> SSIDatafeedHUB:
+        sockets = list(sockets)
+
+        async def connect(self, url, headers):
+            return sockets.pop(0) if sockets else FakeSocket()
+
+        monkeypatch.setattr("vdatafeed.ssi.hub.SocketListener.connect_socket_server", connect)
+        monkeypatch.setattr(
+            "vdatafeed.ssi.hub.request_handler.post",
+            lambda url, headers=None: {"ConnectionToken": "t", "ProtocolVersion": "1.5"},
+        )
+        api = SimpleNamespace(**dict({"get_token": lambda: "Bearer t", "calendar": None}, **api))
+        hub = SSIDatafeedHUB(api)
+        hub.base_delay = 0
+        return hub
+    return make
@@ -0,0 +1,65 @@
+""" Columnar bars and corporate-action adjustment (offline). """
+from types import SimpleNamespace
+
+import numpy as np
+
+from vdatafeed.ssi import AdjustmentEngine, BarColumns
+from vdatafeed.ssi.columnar import grow_rows, parse_dates, parse_floats, parse_times
+
+DATES = ["02/01/2024", "03/01/2024", "04/01/2024", "05/01/2024"]
+
+
+def daily(symbol, dates, close, close_adj, ref=None):
+    ref = ref or close
+    return [
+        SimpleNamespace(
+            instrument=symbol, trading_date=d, close=str(c), close_adj=str(a), ref=str(r)
+        )
+        for d, c, a, r in zip(dates, close, close_adj, ref)
+    ]
+
+
+def test_parsers():
+    assert parse_dates(["02/01/2024", "2024-01-03", None]).astype(str).tolist() == [
+        "2024-01-02", "2024-01-03", "NaT"
+    ]
+    assert parse_times(["09:15:30", ""]).tolist() == [33330, 0]
+    assert np.isnan(parse_floats(["1.5", "", None])[1:]).all()
+    assert grow_rows(np.ones((1, 2)), 3, fill=7).tolist() == [[1, 1], [7, 7], [7, 7]]
+
+
+def test_bars_sort_take_concat():
+    bars = BarColumns(symbol=["VCB", "SSI", "SSI"], date=["2024-01-02"] * 3, time=[0, 60, 0],
+                      close=[3, 2, 1])
+    ordered = bars.sort()
+    assert ordered.close.tolist() == [1, 2, 3]
+    assert len(BarColumns.concat([ordered.take([0]), ordered.take(ordered.close > 1)])) == 3
+
+
+def test_split_factors_learned_from_one_response():
+    engine = AdjustmentEngine()
+    # 2:1 split on the third day: close halves, close_adj is already back-adjusted
+    engine.update(daily("SSI", DATES, [20, 20, 10, 10], [10, 10, 10, 10]))
+    factors = engine.factors("SSI", parse_dates(DATES))
+    assert np.allclose(factors, [0.5, 0.5, 1, 1])
+    assert np.allclose(engine.factors("VCB", parse_dates(DATES)), 1)
+
+
+def test_adjust_bars_of_several_symbols():
+    engine = AdjustmentEngine()
+    engine.update(daily("SSI", DATES, [20, 20, 10, 10], [10, 10, 10, 10]))
+    bars = BarColumns(symbol=["SSI", "SSI", "VCB"], date=parse_dates(DATES[1:3] + DATES[:1]),
+                      close=[20, 10, 90], vol=[100, 200, 5])
+    adjusted = engine.adjust(bars)
+    assert adjusted.close.tolist() == [10, 10, 90]
+    assert adjusted.vol.tolist() == [200, 200, 5]
+    assert bars.close.tolist() == [20, 10, 90]  # input untouched
+
+
+def test_incremental_update_rescales_cached_history():
+    engine = AdjustmentEngine()
+    engine.update(daily("SSI", DATES[:2], [20, 20], [20, 20]))
+    assert np.allclose(engine.factors("SSI", parse_dates(DATES[:2])), 1)
+    # the split is only visible in newer rows: ref of the ex-date over the last close
+    engine.update(daily("SSI", DATES[2:], [10, 10], [10, 10], ref=[10, 10]))
+    assert np.allclose(engine.factors("SSI", parse_dates(DATES)), [0.5, 0.5, 1, 1])
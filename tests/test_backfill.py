@@ -0,0 +1,68 @@
+""" Process-pool backfill and raw page parsing (offline). """
+import json
+
+import numpy as np
+import pytest
+
+from vdatafeed.ssi import ProcessBackfill
+from vdatafeed.ssi.backfill import parse_page
+
+
+def bar(symbol, day, time, close):
+    return {"Symbol": symbol, "TradingDate": day, "Time": time, "Open": str(close),
+            "High": str(close), "Low": str(close), "Close": str(close), "Volume": "100",
+            "Value": None}
+
+
+def test_parse_page_builds_columns():
+    body = json.dumps({"data": [bar("SSI", "09/09/2024", "09:15:00", 25.5)]}).encode()
+    columns = parse_page("intraday", body)
+    assert columns["symbol"].tolist() == ["SSI"]
+    assert columns["date"].astype(str).tolist() == ["2024-09-09"]
+    assert columns["time"].tolist() == [33300] and columns["close"].tolist() == [25.5]
+    assert np.isnan(columns["val"][0])
+    empty = parse_page("eod", b'{"data": null}')
+    assert "time" not in empty and all(len(v) == 0 for v in empty.values())
+
+
+def test_windows():
+    backfill = ProcessBackfill(api=None)
+    assert backfill.windows("2024-09-01", "2024-09-07", 3) == [
+        ("2024-09-01", "2024-09-03"), ("2024-09-04", "2024-09-06"), ("2024-09-07", "2024-09-07")
+    ]
+
+
+def test_run_pages_and_sorts(make_api, http, monkeypatch):
+    monkeypatch.setattr("vdatafeed.ssi.backfill.PAGE_ROWS", 2)
+    rows = {
+        "SSI": [bar("SSI", "09/09/2024", f"09:1{n}:00", 25 + n) for n in range(3)],
+        "VCB": [bar("VCB", "09/09/2024", "09:15:00", 90)],
+    }
+
+    def responder(url, params, headers):
+        page = rows[params["Symbol"]][2 * params["PageIndex"] - 2:][:2]
+        return {"data": page, "totalRecord": len(rows[params["Symbol"]])}
+
+    http.responder = responder
+    api = make_api()
+    bars = ProcessBackfill(api, processes=2).run("intraday", ["VCB", "SSI"], "2024-09-09",
+                                                 "2024-09-09")
+    assert bars.symbol.tolist() == ["SSI", "SSI", "SSI", "VCB"]
+    assert bars.close.tolist() == [25, 26, 27, 90]
+    assert [c[2]["PageIndex"] for c in http.gets("IntradayOHLC")].count(2) == 1
+    with pytest.raises(ValueError):
+        ProcessBackfill(api).run("ticks", ["SSI"], "2024-09-09", "2024-09-09")
+
+
+def test_parsers_are_spawned_not_forked(make_api, monkeypatch):
+    from vdatafeed.ssi import backfill
+    methods = []
+
+    class Recorded(backfill.ProcessPoolExecutor):
+        def __init__(self, *args, mp_context=None, **kwargs):
+            methods.append(mp_context and mp_context.get_start_method())
+            super().__init__(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(backfill, "ProcessPoolExecutor", Recorded)
+    ProcessBackfill(make_api(), processes=1).run("eod", [], "2024-09-09", "2024-09-09")
+    assert methods == ["spawn"]
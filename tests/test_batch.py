@@ -0,0 +1,75 @@
+""" Columnar batches and batched hub delivery (offline). """
+import asyncio
+import json
+
+import numpy as np
+
+from vdatafeed.ssi.batch import QuoteBatch, TradeBatch
+
+from .conftest import FakeSocket, frame, run_until, tick
+
+
+def test_trade_batch_columns():
+    batch = TradeBatch.from_messages([
+        tick("SSI", 100, LastPrice=25.5), tick("VCB", 200, time="09:15:01", LastPrice=""),
+    ])
+    assert len(batch) == 2 and batch.symbol.tolist() == ["SSI", "VCB"]
+    assert batch.price[0] == 25.5 and np.isnan(batch.price[1])
+    assert batch.timestamp.tolist()[1].isoformat() == "2024-09-09T09:15:01"
+    assert set(batch.to_dict()) == set(TradeBatch.fields)
+
+
+def test_quote_batch_levels_best_first():
+    batch = QuoteBatch.from_messages([tick("SSI", 100, BidPrice1=25.4, BidPrice2=25.3, AskVol1=7)])
+    assert batch.bid_price.shape == (1, 10)
+    assert batch.bid_price[0, :2].tolist() == [25.4, 25.3] and np.isnan(batch.bid_price[0, 2])
+    assert batch.ask_vol[0, 0] == 7
+
+
+def test_one_batch_per_frame_and_stores(make_hub):
+    class Batched:
+        def __init__(self):
+            self.batches = []
+
+        def on_trades(self, batch):
+            self.batches.append(len(batch))
+
+        def on_trade(self, tick):
+            raise AssertionError("batched stores take batches only")
+
+    class PerTick:
+        def __init__(self):
+            self.ticks = []
+
+        def on_trade(self, tick):
+            self.ticks.append(tick.symbol)
+
+    trades = [tick(s, 100) for s in ("SSI", "VCB", "FPT")]
+    socket = FakeSocket([frame("X-TRADE", *trades), frame("X-TRADE", tick("SSI", 200))])
+    hub, batched, per_tick = make_hub([socket]), Batched(), PerTick()
+    hub.attach(batched)
+    hub.attach(per_tick)
+    got = []
+    asyncio.run(run_until(hub.subscribe({"X-TRADE": "SSI,VCB,FPT"}, on_trades=got.append),
+                          lambda: socket.drained))
+    assert [len(b) for b in got] == batched.batches == [3, 1]
+    assert per_tick.ticks == ["SSI", "VCB", "FPT", "SSI"]
+
+
+def test_batch_window_spans_frames(make_hub):
+    socket = FakeSocket([frame("X-TRADE", tick("SSI", n)) for n in (100, 200, 300)])
+    hub, got = make_hub([socket]), []
+
+    asyncio.run(run_until(
+        hub.subscribe({"X-TRADE": "SSI"}, on_trades=got.append, batch_window=0.05),
+        lambda: bool(got),
+    ))
+    assert [b.total_vol.tolist() for b in got] == [[100, 200, 300]]
+
+
+def test_frames_without_updates_are_ignored(make_hub):
+    socket = FakeSocket([json.dumps({}), json.dumps({"M": [{"A": []}]}), frame("X-TRADE")])
+    hub, got = make_hub([socket]), []
+    asyncio.run(run_until(hub.subscribe({"X-TRADE": "SSI"}, on_trades=got.append),
+                          lambda: socket.drained))
+    assert got == []
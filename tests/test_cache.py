@@ -0,0 +1,88 @@
+""" Response cache lifetimes, copies and tiers (offline). """
+from datetime import datetime, timedelta
+
+import pytest
+
+from vdatafeed.utils import ResponseCache, normalize_key
+from vdatafeed.utils.cache_handler import VN_TZ
+
+URL = "https://example.invalid/api"
+
+
+def day(offset: int) -> str:
+    return (datetime.now(VN_TZ).date() + timedelta(days=offset)).strftime("%d/%m/%Y")
+
+
+def test_ttl_by_date_range():
+    cache = ResponseCache(today_ttl=30, reference_ttl=3600)
+    assert cache.ttl({"fromDate": day(-30), "toDate": day(-1)}) is None
+    assert cache.ttl({"FromDate": day(-30), "ToDate": day(0)}) == 30
+    assert cache.ttl({"indexCode": "VN30"}) == 3600
+
+
+def test_open_ended_range_is_not_historical():
+    cache = ResponseCache(today_ttl=30)
+    assert cache.ttl({"fromDate": day(-30), "toDate": None}) == 30
+    assert cache.ttl({"fromDate": day(-30)}) == 30
+    assert cache.ttl({"fromDate": None, "toDate": None}) == 30
+
+
+def test_hits_are_copies():
+    cache = ResponseCache()
+    params = {"fromDate": day(-3), "toDate": day(-2)}
+    cache.put(URL, params, {"data": [{"Symbol": "SSI"}]})
+    first = cache.get(URL, params)
+    first["data"][0]["Symbol"] = "changed"
+    first["data"].append({})
+    assert cache.get(URL, params) == {"data": [{"Symbol": "SSI"}]}
+
+
+def test_expiry_and_lru(monkeypatch):
+    cache = ResponseCache(maxsize=2, today_ttl=30)
+    now = [1000.0]
+    monkeypatch.setattr("vdatafeed.utils.cache_handler.time.time", lambda: now[0])
+    cache.put(URL, {"toDate": day(0)}, {"data": [1]})
+    now[0] += 31
+    assert cache.get(URL, {"toDate": day(0)}) is None
+    for n in range(3):
+        cache.put(URL, {"page": n}, {"data": [n]})
+    assert cache.get(URL, {"page": 0}) is None
+    assert cache.get(URL, {"page": 2}) == {"data": [2]}
+    assert cache.stats["size"] == 2
+
+
+def test_disk_tier_survives_instances(tmp_path):
+    params = {"fromDate": day(-3), "toDate": day(-2)}
+    ResponseCache(directory=str(tmp_path)).put(URL, params, {"data": [1]})
+    cache = ResponseCache(directory=str(tmp_path))
+    assert cache.get(URL, params) == {"data": [1]}
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_key_ignores_case_order_and_unset():
+    key = normalize_key(URL, {"B": 1, "a": 2, "c": None})
+    assert key == normalize_key(URL + "/", {"A": 2, "b": 1})
+
+
+def test_api_serves_repeated_get_from_cache(make_api, http):
+    http.responder = lambda url, params, headers: {"data": [{"IndexCode": params["Exchange"]}]}
+    api = make_api(cache_size=16, output="raw")
+    first = api.get_indices()
+    first[0]["IndexCode"] = "changed"
+    assert api.get_indices() == [{"IndexCode": e} for e in ("HOSE", "HNX", "UPCOM")]
+    assert len(http.gets("IndexList")) == 3  # one per exchange, then served from the cache
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_hits_take_no_credential_nor_token(make_api, http, monkeypatch, workers):
+    http.responder = lambda url, params, headers: {"data": [{"IndexCode": params["Exchange"]}]}
+    api = make_api(cache_size=16, output="raw", scheduler_workers=workers)
+    api.get_indices()
+    sent = len(http.calls)
+
+    def refused(*args):
+        pytest.fail("a cache hit used a credential")
+
+    monkeypatch.setattr(api, "get_token", refused)
+    monkeypatch.setattr(api.pool, "acquire", refused)
+    assert len(api.get_indices()) == 3 and len(http.calls) == sent
@@ -0,0 +1,71 @@
+""" Channel-selective hub subscriptions (offline). """
+import asyncio
+import json
+
+import pytest
+
+from vdatafeed.ssi.model import BarTick, ForeignRoomTick, IndexTick
+
+from .conftest import FakeSocket, frame, run_until, tick
+
+INDEX = {"IndexId": "VN30", "IndexValue": 1300.5, "TradingDate": "09/09/2024", "Time": "10:00:00"}
+BAR = {"Symbol": "SSI", "TradingTime": "09:15:00", "Close": 25.5, "Volume": 1000}
+ROOM = {"Symbol": "SSI", "TotalRoom": 10, "CurrentRoom": 5, "TradingDate": "09/09/2024"}
+
+
+def test_channels_are_subscribed_and_decoded(make_hub):
+    socket = FakeSocket([frame("MI", INDEX), frame("B", BAR), frame("R", ROOM),
+                         frame("X-TRADE", tick("SSI", 100))])
+    hub = make_hub([socket])
+    got = []
+    asyncio.run(run_until(
+        hub.subscribe({"MI": "VN30", "B": ["SSI", "VCB"], "R": "SSI", "X-TRADE": "SSI"},
+                      on_index_message=got.append, on_bar_message=got.append,
+                      on_foreign_room_message=got.append, on_trade_message=got.append),
+        lambda: socket.drained,
+    ))
+    assert socket.sent[0]["A"] == ["MI:VN30", "B:SSI-VCB", "R:SSI", "X-TRADE:SSI"]
+    assert [type(i) for i in got[:3]] == [IndexTick, BarTick, ForeignRoomTick]
+    assert (got[0].index, got[0].value, got[1].close, got[2].current_room) == (
+        "VN30", 1300.5, 25.5, 5
+    )
+    assert got[3].price == 25.0 and got[3].total_vol == 100
+
+
+def test_single_channel_takes_updates_without_data_type(make_hub):
+    untyped = json.dumps({"M": [{"A": [json.dumps({"Content": json.dumps(INDEX)})]}]})
+    socket = FakeSocket([untyped])
+    got = []
+    asyncio.run(run_until(
+        make_hub([socket]).subscribe({"MI": "VN30"}, on_index_message=got.append),
+        lambda: socket.drained,
+    ))
+    assert [i.index for i in got] == ["VN30"]
+
+
+def test_channels_need_a_consumer(make_hub):
+    hub = make_hub([])
+    with pytest.raises(ValueError, match="Unknown channel"):
+        asyncio.run(hub.subscribe({"Z": "SSI"}, on_trade_message=print))
+    with pytest.raises(ValueError, match="on_quote_message"):
+        asyncio.run(hub.subscribe({"X-QUOTE": "SSI"}, on_trade_message=print))
+
+
+def test_attached_stores_come_before_callbacks(make_hub):
+    order = []
+
+    class Store:
+        def on_index(self, tick):
+            order.append(("store", tick.index))
+
+    socket = FakeSocket([frame("MI", INDEX)])
+    hub, store = make_hub([socket]), Store()
+    hub.attach(store)
+    asyncio.run(run_until(
+        hub.subscribe({"MI": "VN30"}, on_index_message=lambda t: order.append(("user", t.index))),
+        lambda: socket.drained,
+    ))
+    assert order == [("store", "VN30"), ("user", "VN30")]
+    hub.detach(store)
+    with pytest.raises(ValueError):
+        asyncio.run(hub.subscribe({"MI": "VN30"}))  # no consumer left
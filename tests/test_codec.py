@@ -0,0 +1,89 @@
+""" Compact price encoding and stores sharing a codec (offline). """
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from vdatafeed.ssi import IndicatorEngine, MarketTable, OrderBookStore, TickCodec, TickTape
+
+from .conftest import FakeSocket, frame, run_until, tick
+
+
+def security(symbol, *increments):
+    values = dict(zip(("tick_increment_1", "tick_increment_2", "tick_increment_3"),
+                      [str(i) for i in increments]))
+    return SimpleNamespace(instrument=symbol, **values)
+
+
+def test_units_from_tick_increments():
+    codec = TickCodec([security("SSI", 10, 50, 100), security("VN30F", 0.1)], unit=1, scale=1000)
+    sids = np.array([codec.id("SSI"), codec.id("VN30F"), codec.id("BOND")])
+    assert codec.units(sids).tolist() == [0.01, 0.0001, 1]
+    ticks = codec.encode_prices(sids, [25.35, 1300.1, np.nan])
+    assert ticks.dtype == np.int32 and ticks.tolist() == [2535, 13001000, 0]
+    assert np.allclose(codec.decode_prices(sids, ticks), [25.35, 1300.1, 0])
+    assert codec.encode_volumes([1.6, -3, None]).tolist() == [2, 0, 0]
+    seconds = codec.encode_times(["2024-09-10T10:15:30", "NaT"])
+    assert codec.decode_times(seconds).astype(str).tolist() == ["2024-09-10T10:15:30", "NaT"]
+    assert codec.intern("SSI") is codec.intern("".join(["S", "SI"]))
+
+
+def test_tape_and_books_encode_and_decode():
+    codec = TickCodec(unit=0.05)
+    tape, books = TickTape(4, codec=codec), OrderBookStore(1, codec=codec)
+    tape.update("SSI", 25.35, 100, 100, "2024-09-10T10:15:30")
+    assert tape.last("SSI")["price"].tolist() == [507]
+    assert tape.last("SSI", decode=True)["price"].tolist() == [25.35]
+    books.update("SSI", [25.3] * 10, [100] * 10, [25.4] * 10, [200] * 10)
+    assert books.book.dtype == np.int32 and books.book[0, 0, 0] == 506
+    assert books.top("SSI") == pytest.approx((25.3, 100, 25.4, 200))
+    assert round(books.spread("SSI"), 6) == 0.1
+
+
+def test_stores_sharing_a_codec_query_foreign_ids():
+    codec = TickCodec(unit=0.05)
+    tape, books = TickTape(4, codec=codec), OrderBookStore(1, codec=codec)
+    table, engine = MarketTable(1, codec=codec), IndicatorEngine(capacity=1, codec=codec)
+    books.update("SSI", [25.3] * 10, [100] * 10, [25.4] * 10, [200] * 10)
+    for n in range(3):  # interned by the tape only, past the rows of every other store
+        tape.update(f"S{n}", 10.0, 100, 100, "2024-09-10T10:15:30")
+    table.update("VCB", 90.0, 88.0)
+    engine.update("FPT", 130.0, 10.0)
+    names = codec.symbols.names
+    assert names == ["SSI", "S0", "S1", "S2", "VCB", "FPT"]
+    assert books.book.shape == (6, 4, 10) and np.isnan(books.spread()[1:]).all()
+    assert round(books.spread()[0], 6) == 0.1 and np.isnan(books.spread("S2"))
+    assert books.top("FPT") == (0, 0, 0, 0)
+    assert tape.count("FPT") == 0 and len(tape.last("FPT")["price"]) == 0
+    assert table.get("SSI") is None and table.get("VCB")["change"] == 2.0
+    assert table.gainers() == [("VCB", 2.0 / 88 * 100)]
+    assert table.snapshot()["symbol"].tolist() == names
+    assert engine.get("SSI")["trades"] == 0 and engine.snapshot()["price"][-1] == 130.0
+
+
+def test_hub_interns_with_the_codec(make_hub):
+    codec = TickCodec(unit=0.05)
+    socket = FakeSocket([frame("X-TRADE", tick("SSI", 100))])
+    hub, tape = make_hub([socket]), TickTape(4, codec=codec)
+    hub.attach(tape)
+    got = []
+    asyncio.run(run_until(
+        hub.subscribe({"X-TRADE": "SSI"}, on_trade_message=got.append, codec=codec),
+        lambda: socket.drained,
+    ))
+    assert got[0].symbol is codec.symbols.name(0)
+    assert tape.last("SSI", decode=True)["price"].tolist() == [25.0]
+
+
+def test_batches_keep_float_columns_with_a_codec(make_hub):
+    codec = TickCodec(unit=0.05)
+    socket = FakeSocket([frame("X-TRADE", tick("SSI", 100), tick("VCB", 50))])
+    hub, got = make_hub([socket]), []
+    asyncio.run(run_until(
+        hub.subscribe({"X-TRADE": "SSI,VCB"}, on_trades=got.append, codec=codec),
+        lambda: socket.drained,
+    ))
+    batch = got[0]
+    assert batch.price.dtype == np.float64 and batch.total_vol.tolist() == [100, 50]
+    assert [codec.symbols.get(s) for s in batch.symbol] == [0, 1]
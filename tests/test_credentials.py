@@ -0,0 +1,81 @@
+""" Credential pool: load spreading, cooldown and 429 failover (offline). """
+import time
+
+import jwt
+import pytest
+
+from vdatafeed.utils import Credential, CredentialPool, RateLimiter, TokenStore
+
+from .conftest import FakeResponse
+
+
+def credentials(tmp_path, *ids) -> list:
+    return [Credential(i, "secret", TokenStore(str(tmp_path / i)), RateLimiter(interval=0))
+            for i in ids]
+
+
+def consumer(headers: dict) -> str:
+    token = headers["Authorization"].split(" ", 1)[1]
+    return jwt.decode(token, options={"verify_signature": False})["sub"]
+
+
+def test_strategies(tmp_path):
+    pool = CredentialPool(credentials(tmp_path, "a", "b"))
+    with pool.acquire() as first:
+        with pool.acquire() as second:
+            assert {first.consumer_id, second.consumer_id} == {"a", "b"}  # least loaded
+    turns = CredentialPool(credentials(tmp_path, "a", "b", "c"), strategy="round_robin")
+    picked = []
+    for _ in range(4):
+        with turns.acquire() as credential:
+            picked.append(credential.consumer_id)
+    assert picked == ["a", "b", "c", "a"]
+    with pytest.raises(ValueError):
+        CredentialPool([])
+    with pytest.raises(ValueError):
+        CredentialPool(credentials(tmp_path, "a"), strategy="random")
+
+
+def test_cooldown(tmp_path):
+    pool = CredentialPool(credentials(tmp_path, "a", "b"), strategy="round_robin", cooldown=60)
+    pool.throttle(pool.credentials[0])
+    for _ in range(3):
+        with pool.acquire() as credential:
+            assert credential.consumer_id == "b"
+    pool.throttle(pool.credentials[1], seconds=0.05)
+    started = time.monotonic()
+    with pool.acquire() as credential:  # every credential cools down: wait for the first
+        assert credential.consumer_id == "b" and time.monotonic() - started >= 0.04
+    single = CredentialPool(credentials(tmp_path, "a"))
+    single.throttle(single.credentials[0])
+    assert single.stats[0]["cooldown"] == 0 and single.stats[0]["throttled"] == 1
+
+
+def test_refused_requests_fail_over(make_api, http):
+    def responder(url, params, headers):
+        if consumer(headers) == "id":
+            return FakeResponse({}, status=429, headers={"Retry-After": "30"})
+        return {"data": [{"IndexCode": "VN30"}]}
+
+    http.responder = responder
+    api = make_api(credentials=[("extra", "secret")], output="raw")
+    assert api.get_indices("HOSE") == [{"IndexCode": "VN30"}]
+    assert api.get_indices("HNX") == [{"IndexCode": "VN30"}]
+    stats = {s["consumer_id"]: s for s in api.pool.stats}
+    assert stats["id"]["throttled"] == 1 and 25 < stats["id"]["cooldown"] <= 30
+    assert stats["extra"]["requests"] == 2
+
+
+def test_every_credential_refused_raises(make_api, http):
+    http.responder = lambda url, params, headers: FakeResponse({}, status=429)
+    api = make_api(credentials=[("extra", "secret")])
+    with pytest.raises(Exception, match="429"):
+        api.get_indices("HOSE")
+    assert [s["throttled"] for s in api.pool.stats] == [1, 1]
+
+
+def test_scheduler_uses_the_limiter_of_the_remaining_credential(make_api):
+    api = make_api(ssi_datafeed_id=None, credentials=[("extra", "secret")], scheduler_workers=1)
+    assert [c.consumer_id for c in api.pool.credentials] == ["extra"]
+    assert api.limiter is api.pool.credentials[0].limiter
+    assert api.scheduler.limiter is api.limiter
@@ -0,0 +1,108 @@
+""" Bulk export planning, writing and resuming (offline). """
+import csv
+import json
+import os
+
+import pytest
+
+from vdatafeed.export import ExportUnit, columns, export_unit, plan, run, split_dates, write_rows
+from vdatafeed.ssi import TradingCalendar
+from vdatafeed.ssi.model import EndOfDayOHLC, IndexInfo, SecuritiesInfo
+
+from .conftest import api_row
+from .test_trading_calendar import index_history
+
+
+def reference_lists(url, params, headers):
+    if "SecuritiesDetails" in url:
+        rows = [api_row(SecuritiesInfo, Symbol=f"{params['Market']}1"), api_row(SecuritiesInfo)]
+        return {"data": [{"RepeatedInfo": rows}], "totalRecord": len(rows)}
+    if "IndexList" in url:
+        return {"data": [api_row(IndexInfo, IndexCode="VN30", Exchange="HOSE")]}
+    if "DailyOHLC" in url:
+        return {"data": [api_row(EndOfDayOHLC, Symbol=params["Symbol"], Open="1", Close="2")]}
+    return {"data": []}
+
+
+def test_split_dates_is_inclusive():
+    assert list(split_dates("2024-01-01", "2024-01-05", 2)) == [
+        ("2024-01-01", "2024-01-02"), ("2024-01-03", "2024-01-04"), ("2024-01-05", "2024-01-05")
+    ]
+
+
+@pytest.mark.parametrize("output", ["model", "typed", "raw"])
+def test_plan_reads_symbols_in_every_output(make_api, http, output):
+    http.responder = reference_lists
+    api = make_api(output=output)
+    units = plan(api, ["eod", "index"], "2024-01-01", "2024-01-31", window_days=31)
+    assert [(u.dataset, u.symbol) for u in units] == [
+        ("eod", "HNX1"), ("eod", "HOSE1"), ("eod", "UPCOM1"), ("index", "VN30")
+    ]
+
+
+def test_window_days_are_capped_without_calendar(make_api, http):
+    units = plan(make_api(), ["intraday", "eod"], "2024-01-01", "2024-01-10", symbols=["SSI"],
+                 window_days=10)
+    assert [(u.dataset, u.from_date) for u in units] == [
+        ("intraday", "2024-01-01"), ("intraday", "2024-01-04"), ("intraday", "2024-01-07"),
+        ("intraday", "2024-01-10"), ("eod", "2024-01-01")
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_rows_with_different_keys_share_columns(tmp_path, fmt):
+    path = str(tmp_path / f"rows.{fmt}")
+    fields = columns("eod", raw=True)
+    write_rows([{"Symbol": "SSI"}, {"Close": "2", "Symbol": "VCB", "Extra": "x"}], path, fmt,
+               fields)
+    if fmt == "csv":
+        with open(path) as file:
+            rows = list(csv.DictReader(file))
+        assert list(rows[0]) == fields + ["Extra"]
+    else:
+        rows = pytest.importorskip("pyarrow.parquet").read_table(path).to_pylist()
+    assert (rows[0]["Close"] or "", rows[1]["Close"], rows[1]["Extra"]) == ("", "2", "x")
+    assert columns("eod")[:3] == ["instrument", "exchange", "trading_date"]
+
+
+def test_export_unit_writes_raw_rows(make_api, http, tmp_path):
+    http.responder = reference_lists
+    api = make_api(output="raw")
+    rows, path = export_unit(
+        api, ExportUnit("eod", "SSI", "2024-01-01", "2024-01-31"), str(tmp_path), "csv"
+    )
+    assert rows == 1
+    assert path == os.path.join(tmp_path, "eod", "symbol=SSI", "2024-01-01_2024-01-31.csv")
+    with open(path) as file:
+        row = next(csv.DictReader(file))
+    assert (row["Symbol"], row["Open"], row["Close"]) == ("SSI", "1", "2")
+
+
+def test_run_resumes_from_manifest(make_api, http, tmp_path):
+    http.responder = reference_lists
+    api = make_api()
+    units = [ExportUnit("eod", s, "2024-01-01", "2024-01-31") for s in ("SSI", "VCB")]
+    assert run(api, units[:1], str(tmp_path), workers=1) == 0
+    sent = len(http.gets("DailyOHLC"))
+    assert run(api, units, str(tmp_path), workers=1) == 0
+    assert len(http.gets("DailyOHLC")) == sent + 1  # only VCB was fetched again
+    with open(tmp_path / "manifest.jsonl") as file:
+        assert [json.loads(i)["unit"] for i in file] == [u.key for u in units]
+
+
+def test_expected_rows_are_planned_once_per_window(make_api, http, tmp_path):
+    http.responder = reference_lists
+    api = make_api()
+    calendar = TradingCalendar(index_history()[0])
+    counted = []
+    expected_bars = calendar.expected_bars
+    calendar.expected_bars = lambda *args: counted.append(args) or expected_bars(*args)
+    units = plan(api, ["eod"], "2024-08-29", "2024-09-06", symbols=["SSI", "VCB"],
+                 window_days=2, calendar=calendar)
+    assert [(u.symbol, u.from_date, u.expected) for u in units[:3]] == [
+        ("SSI", "2024-08-29", 2), ("SSI", "2024-09-04", 2), ("SSI", "2024-09-06", 1)
+    ]
+    assert len(counted) == 3  # not once per symbol
+    assert run(api, units[:1], str(tmp_path), workers=1) == 0
+    with open(tmp_path / "manifest.jsonl") as file:
+        assert json.loads(file.readline())["expected"] == 2
@@ -0,0 +1,103 @@
+""" Backfill of intraday bars after a hub outage (offline). """
+import asyncio
+from datetime import datetime
+
+from vdatafeed.ssi.constant import TIMEZONE
+from vdatafeed.ssi.model import IntradayOHLC
+
+from .conftest import FakeSocket, api_row, frame, run_until, tick
+
+
+class Frozen(datetime):
+    """
+    Exchange time of the tests: the last frame at 10:00:00, reconnected at 10:00:30.
+    """
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2024, 9, 9, 10, 0, 30, tzinfo=TIMEZONE)
+
+    @classmethod
+    def fromtimestamp(cls, timestamp, tz=None):
+        return datetime(2024, 9, 9, 10, 0, 0, tzinfo=TIMEZONE)
+
+
+class Gated(FakeSocket):
+    """
+    Returns ``frames``, then ``later`` once ``gate()`` holds.
+    """
+    def __init__(self, frames, later, gate) -> None:
+        super().__init__(frames)
+        self.later, self.gate = list(later), gate
+
+    async def recv(self) -> str:
+        if not self.frames and self.later:
+            while not self.gate():
+                await asyncio.sleep(0.005)
+            self.frames, self.later = self.later, []
+        return await super().recv()
+
+
+def intraday(symbol, day, _):
+    if symbol == "HPG":
+        raise ConnectionError("timeout")
+    return [api_row(IntradayOHLC, Symbol=symbol, TradingDate="09/09/2024", Time=t, Close="25",
+                    Volume="100") for t in ("09:58:00", "09:59:00", "10:00:00", "10:01:00")]
+
+
+def outage(make_hub, monkeypatch, before: list, after: list, early: list = ()) -> tuple:
+    """
+    Runs ``X:SSI`` (and HPG) over a connection dropped after ``before``; the next one
+    sends ``early`` at once and ``after`` once the gap is filled.
+    Returns:
+        tuple: The gap fills and the kinds delivered after the outage.
+    """
+    monkeypatch.setattr("vdatafeed.ssi.hub.datetime", Frozen)
+    fills, kinds = [], []
+    replacement = Gated(early, after, lambda: bool(fills))
+    hub = make_hub([FakeSocket(before, error=ConnectionError("reset")), replacement],
+                   get_intraday_ohlcv=intraday)
+    asyncio.run(run_until(
+        hub.subscribe({"X": "SSI,HPG"}, on_trade_message=lambda t: kinds.append("trade"),
+                      on_quote_message=lambda t: kinds.append("quote"), on_gap_fill=fills.append),
+        lambda: replacement.drained,
+    ))
+    return fills, kinds[len(before):]
+
+
+def test_bars_of_the_silent_window_are_delivered(make_hub, monkeypatch):
+    fills, _ = outage(make_hub, monkeypatch, [frame("X", tick("SSI", 100))], [])
+    assert len(fills) == 1
+    event = fills[0]
+    assert (event.start.time().isoformat(), event.end.time().isoformat()) == (
+        "10:00:00", "10:00:30"
+    )
+    assert event.bars.symbol.tolist() == ["SSI"] and event.bars.time.tolist() == [36000]
+    assert event.failed == ["HPG"] and len(event) == 1
+
+
+def test_next_update_sets_the_volume_baseline(make_hub, monkeypatch):
+    # the bars add up to 400 shares: the first update after the outage is not compared
+    # with that total but sets the baseline (a trade, as at startup)
+    before = [frame("X", tick("SSI", 100))]
+    after = [frame("X", tick("SSI", 400)), frame("X", tick("SSI", 400))]
+    _, kinds = outage(make_hub, monkeypatch, before, after)
+    assert kinds == ["trade", "quote"]
+
+
+def test_updates_during_the_fill_keep_their_baseline(make_hub, monkeypatch):
+    before = [frame("X", tick("SSI", 100))]
+    early, after = [frame("X", tick("SSI", 300))], [frame("X", tick("SSI", 300))]
+    _, kinds = outage(make_hub, monkeypatch, before, after, early)
+    assert kinds == ["trade", "quote"]
+
+
+def test_outages_outside_the_sessions_are_not_filled(make_hub, monkeypatch):
+    def at(hour, minute):
+        return classmethod(lambda cls, *args, **kwargs: datetime(
+            2024, 9, 9, hour, minute, tzinfo=TIMEZONE
+        ))
+
+    monkeypatch.setattr(Frozen, "fromtimestamp", at(11, 40))
+    monkeypatch.setattr(Frozen, "now", at(12, 0))
+    fills, _ = outage(make_hub, monkeypatch, [frame("X", tick("SSI", 100))], [])
+    assert fills == []  # lunch break
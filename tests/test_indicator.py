@@ -0,0 +1,53 @@
+""" Incremental indicators and the symbol table (offline). """
+import numpy as np
+import pytest
+
+from vdatafeed.ssi import IndicatorEngine
+from vdatafeed.ssi.model import TradeTick
+from vdatafeed.utils import SymbolTable
+
+
+def test_symbol_table_ids_are_dense_and_stable():
+    table = SymbolTable(["SSI", "VCB"])
+    assert table.id("FPT") == 2 and table.id(np.str_("SSI")) == 0
+    assert table.get("HPG") is None and "HPG" not in table
+    assert table.names == ["SSI", "VCB", "FPT"] and table.name(1) == "VCB" and len(table) == 3
+
+
+def test_indicators_match_full_recomputation():
+    engine = IndicatorEngine(ema_spans=(3,), window=2)
+    prices, vols = [10.0, 12.0, 11.0, 13.0], [100.0, 50.0, 0.0, 150.0]
+    for price, vol in zip(prices, vols):
+        engine.update("SSI", price, vol)
+    ema = prices[0]
+    for price in prices[1:]:
+        ema += 0.5 * (price - ema)
+    got = engine.get("SSI")
+    assert got["vwap"] == pytest.approx(np.dot(prices, vols) / sum(vols))
+    assert got["ema_3"] == pytest.approx(ema)
+    assert (got["high"], got["low"], got["price"]) == (13.0, 10.0, 13.0)
+    assert (got["rolling_vol"], got["volume"], got["trades"]) == (150.0, 300.0, 4)
+    assert engine.get("VCB") is None
+
+
+def test_growth_and_snapshot_alignment():
+    engine = IndicatorEngine(capacity=1)
+    symbols = [f"S{n}" for n in range(5)]
+    for n, symbol in enumerate(symbols):
+        engine.update(symbol, float(n + 1), 10.0)
+    engine.update("S9", None, None)  # a tick without a price registers the symbol only
+    snapshot = engine.snapshot()
+    assert snapshot["symbol"].tolist() == symbols + ["S9"]
+    assert snapshot["price"][:5].tolist() == [1, 2, 3, 4, 5]
+    assert np.isnan(snapshot["vwap"][5]) and snapshot["trades"][5] == 0
+
+
+def test_on_trade_reads_a_tick():
+    engine = IndicatorEngine()
+    tick = TradeTick.model_validate({
+        "TradingDate": "02/01/2024", "Time": "09:15:00", "Symbol": "SSI", "Ceiling": 1,
+        "Floor": 1, "RefPrice": 1, "LastPrice": 25.5, "LastVol": 100, "TotalVol": 100,
+        "TotalVal": 2550,
+    })
+    engine.on_trade(tick)
+    assert engine.get("SSI")["vwap"] == 25.5
@@ -0,0 +1,64 @@
+""" Arrow IPC export of bars (offline). """
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from vdatafeed.ssi.columnar import BarColumns
+from vdatafeed.ssi.model import IntradayOHLC
+
+from .conftest import api_row
+
+pa = pytest.importorskip("pyarrow")
+
+from vdatafeed.ssi.ipc import (  # noqa: E402
+    from_table, read_ipc, read_shared, to_table, write_ipc, write_shared
+)
+
+BARS = BarColumns(symbol=["SSI", "SSI", "VCB"], date=["2024-09-09"] * 3, time=[33300, 33360, 0],
+                  open=[25, 25.5, 90], close=[25.5, 26, 91], vol=[100, 200, np.nan])
+
+
+def same(a: BarColumns, b: BarColumns) -> bool:
+    return all(np.array_equal(getattr(a, f), getattr(b, f), equal_nan=f not in ("symbol",))
+               for f in BarColumns.fields)
+
+
+def test_table_schema_and_round_trip():
+    table = to_table(BARS)
+    assert pa.types.is_dictionary(table.schema.field("symbol").type)
+    assert table.schema.field("date").type == pa.date32()
+    assert table.schema.field("time").type == pa.int32()
+    assert same(from_table(table), BARS)
+    rows = [IntradayOHLC(**api_row(IntradayOHLC, Symbol="SSI", TradingDate="09/09/2024",
+                                   Time="09:15:00", Close="25.5"))]
+    assert to_table(rows).column("close").to_pylist() == [25.5]
+
+
+def test_memory_mapped_file(tmp_path):
+    path = write_ipc(BARS, str(tmp_path / "bars.arrow"))
+    table = read_ipc(path)
+    assert same(from_table(table), BARS)
+    assert list(tmp_path.iterdir()) == [tmp_path / "bars.arrow"]  # no temporary file left
+
+
+def read_close_in_child(name: str) -> list:
+    table, block = read_shared(name)
+    close = table.column("close").to_pylist()
+    del table
+    block.close()
+    return close
+
+
+def test_shared_memory_between_processes():
+    block = write_shared(BARS)
+    try:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            assert pool.apply(read_close_in_child, (block.name,)) == [25.5, 26, 91]
+        table, attached = read_shared(block.name)
+        assert same(from_table(table), BARS)
+        del table
+        attached.close()
+    finally:
+        block.close()
+        block.unlink()
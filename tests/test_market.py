@@ -0,0 +1,48 @@
+""" Market-wide live table and ranking queries (offline). """
+import numpy as np
+import pytest
+
+from vdatafeed.ssi import MarketTable
+from vdatafeed.ssi.batch import TradeBatch
+from vdatafeed.ssi.model import TradeTick
+
+from .conftest import tick
+
+
+def test_rankings_follow_updates():
+    table = MarketTable(capacity=2)
+    for symbol, price in (("SSI", 26), ("VCB", 24), ("FPT", 25.5)):
+        table.update(symbol, price, ref_price=25, total_val=price * 10)
+    assert [s for s, _ in table.gainers(2)] == ["SSI", "FPT"]
+    assert table.losers(1) == [("VCB", -4.0)]
+    table.update("VCB", 27)  # the stale heap entry of VCB is skipped
+    assert table.gainers(1) == [("VCB", 8.0)] and table.losers(1) == [("FPT", 2.0)]
+    assert [s for s, _ in table.top("total_val", 5)] == ["SSI", "FPT", "VCB"]
+    with pytest.raises(ValueError):
+        table.top("volume")
+
+
+def test_heaps_match_a_full_sort():
+    rng = np.random.default_rng(0)
+    table = MarketTable(capacity=4)
+    table.gainers(1)  # heaps exist from the start, then are maintained and compacted
+    for _ in range(5000):
+        table.update(f"S{rng.integers(0, 50)}", rng.uniform(20, 30), ref_price=25)
+    snapshot = table.snapshot()
+    expected = snapshot["symbol"][np.argsort(-snapshot["change_pct"], kind="stable")[:10]]
+    assert [s for s, _ in table.gainers(10)] == expected.tolist()
+
+
+def test_limits_and_ticks():
+    table = MarketTable()
+    table.on_trade(TradeTick(**tick("SSI", 100, LastPrice=27.0)))
+    assert table.at_ceiling == {"SSI"} and not table.at_floor
+    assert table.get("SSI")["change_pct"] == pytest.approx(8.0)
+    table.on_trades(TradeBatch.from_messages([
+        tick("SSI", 200, LastPrice=23.0),
+        tick("VCB", 100, LastPrice=90.0, RefPrice="", Ceiling=95, Floor=85),
+        tick("SSI", 300, LastPrice=25.5),
+    ]))
+    assert table.get("SSI")["price"] == 25.5 and table.get("SSI")["total_vol"] == 300
+    assert not table.at_ceiling and not table.at_floor
+    assert np.isnan(table.get("VCB")["change_pct"]) and table.get("HPG") is None
@@ -0,0 +1,46 @@
+""" Preallocated order books (offline). """
+import numpy as np
+
+from vdatafeed.ssi import OrderBookStore
+from vdatafeed.ssi.batch import QuoteBatch
+from vdatafeed.ssi.model import QuoteTick
+
+from .conftest import tick
+
+BIDS, ASKS = [25.4, 25.3] + [0] * 8, [25.6, 25.7] + [0] * 8
+VOLS = [100, 200] + [0] * 8
+
+
+def test_update_diff_and_queries():
+    books = OrderBookStore(capacity=1)
+    assert books.update("SSI", BIDS, VOLS, ASKS, VOLS)
+    assert books.top("SSI") == (25.4, 100, 25.6, 100)
+    assert np.isclose(books.spread("SSI"), 0.2) and books.depth("SSI", 1) == (100, 100)
+    assert not books.update("SSI", BIDS, VOLS, ASKS, VOLS)  # nothing changed
+    books.update("SSI", BIDS, [150, 200] + [0] * 8, ASKS, VOLS)
+    assert np.flatnonzero(books.diff("SSI")["bid_vol"]).tolist() == [0]
+    assert not books.diff("SSI")["ask_price"].any()
+    books.update("VCB", [90] + [0] * 9, VOLS, [0] * 10, [0] * 10)  # grows, no ask
+    assert books.book.shape == (2, 4, 10) and np.isnan(books.spread("VCB"))
+    assert books.snapshot("HPG") is None and books.top("HPG") is None
+
+
+def test_quote_tick_levels_best_first():
+    books = OrderBookStore()
+    books.on_quote(QuoteTick(**tick("SSI", 100, BidPrice1=25.4, BidPrice2=25.3, BidVol1=7,
+                                    AskPrice1=25.6, AskVol1=9)))
+    book = books.snapshot("SSI")
+    assert book["bid_price"][:3].tolist() == [25.4, 25.3, 0] and book["bid_vol"][0] == 7
+    assert (book["ask_price"][0], book["ask_vol"][0]) == (25.6, 9)
+
+
+def test_batch_keeps_the_last_update_of_each_symbol():
+    books = OrderBookStore()
+    batch = QuoteBatch.from_messages([
+        tick("SSI", 100, BidPrice1=25.4), tick("VCB", 100, BidPrice1=90.1),
+        tick("SSI", 100, BidPrice1=25.5, AskPrice1=25.6),
+    ])
+    books.on_quotes(batch)
+    assert books.top("SSI")[0] == 25.5 and books.top("VCB")[0] == 90.1
+    assert np.allclose(books.spread(), [0.1, np.nan], equal_nan=True)
+    assert books.symbols.names == ["SSI", "VCB"]
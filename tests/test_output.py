@@ -0,0 +1,44 @@
+""" Model, typed and raw outputs of API rows (offline). """
+from datetime import date, time
+
+import pytest
+
+from vdatafeed.ssi.model import EndOfDayOHLC, EndOfDayOHLCTyped, IntradayOHLC, IntradayOHLCTyped
+from vdatafeed.utils import list_adapter
+
+from .conftest import api_row
+
+EOD = [api_row(EndOfDayOHLC, Symbol="SSI", Market="HOSE", TradingDate="09/09/2024",
+               Open="25.5", Close="26", Volume="1000"),
+       api_row(EndOfDayOHLC, Symbol="SSI", Market="HOSE", TradingDate="10/09/2024")]
+
+
+def ohlc(url, params, headers):
+    if "IntradayOHLC" in url:
+        return {"data": [api_row(IntradayOHLC, Symbol="SSI", TradingDate="09/09/2024",
+                                 Time="09:15:00", Close="25.5")]}
+    return {"data": EOD}
+
+
+def test_list_adapter_is_cached_and_matches_per_row():
+    assert list_adapter(EndOfDayOHLC) is list_adapter(EndOfDayOHLC)
+    assert list_adapter(EndOfDayOHLC).validate_python(EOD) == [EndOfDayOHLC(**i) for i in EOD]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_outputs(make_api, http, stream):
+    http.responder = ohlc
+    rows = make_api(output="model", stream=stream).get_endofday_ohlcv("SSI")
+    assert isinstance(rows[0], EndOfDayOHLC) and rows[0].open == "25.5"
+    assert make_api(output="raw", stream=stream).get_endofday_ohlcv("SSI") == EOD
+    typed = make_api(output="typed", stream=stream).get_endofday_ohlcv("SSI")
+    assert isinstance(typed[0], EndOfDayOHLCTyped) and isinstance(typed[0], EndOfDayOHLC)
+    assert (typed[0].trading_date, typed[0].open, typed[0].vol) == (date(2024, 9, 9), 25.5, 1000)
+    assert typed[1].open is None and typed[1].instrument == "SSI"  # blanks become None
+
+
+def test_typed_intraday_times(make_api, http):
+    http.responder = ohlc
+    bar = make_api(output="typed").get_intraday_ohlcv("SSI")[0]
+    assert isinstance(bar, IntradayOHLCTyped)
+    assert (bar.trading_time, bar.close) == (time(9, 15), 25.5)
@@ -0,0 +1,41 @@
+""" Page iterators of the daily endpoints (offline). """
+
+
+def daily_pages(rows_per_page: dict):
+    """
+    Answers daily stock price queries: ``rows_per_page`` maps (market or symbol,
+    page index) to the number of rows of that page.
+    """
+    def respond(url, params, headers):
+        key = params.get("market") or params.get("symbol")
+        total = sum(n for (k, _), n in rows_per_page.items() if k == key)
+        rows = [
+            {"Symbol": f"{key}{params['pageIndex']}-{i}"}
+            for i in range(rows_per_page.get((key, params["pageIndex"]), 0))
+        ]
+        return {"data": rows, "totalRecord": total}
+    return respond
+
+
+def test_iter_walks_pages_then_exchanges(make_api, http):
+    http.responder = daily_pages({("HOSE", 1): 2, ("HOSE", 2): 1, ("HNX", 1): 1})
+    api = make_api(output="raw")
+    pages = list(api.iter_daily_instruments_info(from_date="2024-09-09", to_date="2024-09-09"))
+    assert [len(p) for p in pages] == [2, 1, 1]
+    assert [(c[2].get("market"), c[2]["pageIndex"]) for c in http.gets("DailyStockPrice")] == [
+        ("HOSE", 1), ("HOSE", 2), ("HNX", 1), ("UPCOM", 1)
+    ]
+    assert http.gets()[0][2]["fromDate"] == "09/09/2024"
+
+
+def test_get_concatenates_pages_of_one_symbol(make_api, http):
+    http.responder = daily_pages({("SSI", 1): 3, ("SSI", 2): 2})
+    api = make_api(output="raw")
+    rows = api.get_daily_instruments_info("SSI", "2024-09-01", "2024-09-09")
+    assert [r["Symbol"] for r in rows] == ["SSI1-0", "SSI1-1", "SSI1-2", "SSI2-0", "SSI2-1"]
+
+
+def test_empty_range_returns_none(make_api, http):
+    api = make_api(output="raw")
+    assert api.get_daily_indices_info("VN30", "2024-09-01", "2024-09-09") is None
+    assert list(api.iter_daily_indices_info("VN30", "2024-09-01", "2024-09-09")) == []
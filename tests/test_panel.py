@@ -0,0 +1,99 @@
+""" Symbol x date panels and their fetch plans (offline). """
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from vdatafeed.ssi import PanelBuilder
+from vdatafeed.ssi.model import InstrumentInfo
+
+from .conftest import api_row
+
+LISTINGS = {"HOSE": ["SSI", "VCB"], "HNX": ["SHS"], "UPCOM": ["BSR"]}
+BASES = {"SSI": 25, "VCB": 90, "SHS": 15, "BSR": 20}
+
+
+def row(symbol: str, day, close: float) -> dict:
+    return api_row(InstrumentInfo, Symbol=symbol, TradingDate=day.strftime("%d/%m/%Y"),
+                   ClosePrice=str(close), TotalMatchVol="100")
+
+
+def daily_prices(url, params, headers):
+    first = datetime.strptime(params["fromDate"], "%d/%m/%Y").date()
+    last = datetime.strptime(params["toDate"], "%d/%m/%Y").date()
+    days = np.arange(np.datetime64(first), np.datetime64(last) + 1)
+    days = [d.astype(object) for d in days if np.is_busday(d)]
+    symbols = [params["symbol"]] if "symbol" in params else LISTINGS[params["market"]]
+    rows = [row(s, d, BASES[s] + d.day / 100) for s in symbols for d in days]
+    return {"data": rows, "totalRecord": len(rows)}
+
+
+def test_plan_picks_the_cheaper_mode():
+    builder = PanelBuilder(api=None)
+    assert builder.plan(["SSI", "VCB"], "2024-01-01", "2024-12-31") == ("symbol", 2)
+    mode, pages = builder.plan(None, "2024-09-09", "2024-09-09")
+    assert (mode, pages) == ("date", 3)
+    assert builder.plan([f"S{n}" for n in range(50)], "2024-09-09", "2024-09-13")[0] == "date"
+
+
+def test_assemble_scatters_rows():
+    rows = [row("VCB", datetime(2024, 9, 10), 90), row("SSI", datetime(2024, 9, 9), 25),
+            InstrumentInfo(**row("FPT", datetime(2024, 9, 9), 130))]
+    panel = PanelBuilder.assemble(rows, ["SSI", "VCB"], fields=("close",))
+    assert panel.shape == (2, 2) and panel.symbols.tolist() == ["SSI", "VCB"]
+    assert np.array_equal(panel["close"], [[25, np.nan], [np.nan, 90]], equal_nan=True)
+    assert PanelBuilder.assemble(rows, fields=("close",)).symbols.tolist() == ["FPT", "SSI", "VCB"]
+
+
+@pytest.mark.parametrize("mode", ["symbol", "date"])
+def test_both_plans_build_the_same_panel(make_api, http, mode):
+    http.responder = daily_prices
+    api = make_api(output="raw", scheduler_workers=2)
+    panel = PanelBuilder(api, workers=2).build(["VCB", "SSI"], "2024-09-02", "2024-09-13",
+                                               mode=mode)
+    assert panel.mode == mode and panel.shape == (2, 10)
+    assert panel.symbols.tolist() == ["VCB", "SSI"]
+    assert panel["close"][1, 0] == 25.02 and panel["close"][0, -1] == 90.13
+    assert not np.isnan(panel["total_vol"]).any()
+    markets = {c[2].get("market") for c in http.gets("DailyStockPrice")}
+    assert markets == ({None} if mode == "symbol" else set(LISTINGS))
+    with pytest.raises(ValueError):
+        PanelBuilder(api).build(None, "2024-09-02", "2024-09-13", mode="symbol")
+
+
+class PagedAPI:
+    """ Yields the whole-exchange rows page by page and records what was requested. """
+    scheduler = None
+
+    def __init__(self, page_rows: int = 3) -> None:
+        self.page_rows = page_rows
+        self.pages = 0
+
+    def iter_daily_instruments_info(self, instrument=None, from_date=None, to_date=None,
+                                    exchange=None):
+        params = {"fromDate": datetime.strptime(from_date, "%Y-%m-%d").strftime("%d/%m/%Y"),
+                  "toDate": datetime.strptime(to_date, "%Y-%m-%d").strftime("%d/%m/%Y")}
+        params.update({"symbol": instrument} if instrument else {"market": exchange})
+        rows = daily_prices(None, params, None)["data"]
+        for i in range(0, len(rows), self.page_rows):
+            self.pages += 1
+            yield rows[i:i + self.page_rows]
+
+    def get_instruments(self, exchange=None):
+        return LISTINGS.get(exchange)
+
+
+def test_build_scatters_pages_and_drops_unrequested_symbols():
+    api = PagedAPI()
+    panel = PanelBuilder(api, workers=3).build(["BSR", "SSI"], "2024-09-02", "2024-09-06",
+                                               fields=("close",), mode="date")
+    assert api.pages > len(LISTINGS) and panel.shape == (2, 5)
+    assert panel.symbols.tolist() == ["BSR", "SSI"]
+    assert panel["close"][0].tolist() == [20.02, 20.03, 20.04, 20.05, 20.06]
+    panel = PanelBuilder(api).build(None, "2024-09-02", "2024-09-06", fields=("close",))
+    assert panel.symbols.tolist() == ["BSR", "SHS", "SSI", "VCB"]
+    assert not np.isnan(panel["close"]).any()
+
+
+def test_count_listings():
+    assert PanelBuilder.count_listings(PagedAPI()) == {"HOSE": 2, "HNX": 1, "UPCOM": 1}
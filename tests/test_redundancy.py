@@ -0,0 +1,64 @@
+""" De-duplication across redundant hub connections (offline). """
+import asyncio
+
+from vdatafeed.utils import DedupWindow, OccurrenceCounter
+
+from .conftest import FakeSocket, frame, run_until, tick
+
+
+def listen(hub, channels: dict, sockets: list, redundancy: int) -> dict:
+    got = {"trade": [], "quote": []}
+    asyncio.run(run_until(
+        hub.subscribe(channels, on_trade_message=got["trade"].append,
+                      on_quote_message=got["quote"].append, redundancy=redundancy),
+        lambda: all(s.drained for s in sockets),
+    ))
+    return got
+
+
+def test_windows_are_bounded():
+    window, counter = DedupWindow(2), OccurrenceCounter(2)
+    assert window.add("a") and not window.add("a") and window.add("b") and window.add("c")
+    assert "a" not in window and len(window) == 2
+    assert [counter.add("a"), counter.add("a"), counter.add("b"), counter.add("c")] == [1, 2, 1, 1]
+    assert counter.add("a") == 1 and len(counter) == 2
+
+
+def test_repeated_update_on_one_connection_is_delivered(make_hub):
+    quote = frame("X-QUOTE", tick("SSI", 100, BidPrice1=24.9))
+    for redundancy in (1, 2):
+        sockets = [FakeSocket([quote, quote]) for _ in range(redundancy)]
+        got = listen(make_hub(sockets), {"X-QUOTE": "SSI"}, sockets, redundancy)
+        assert len(got["quote"]) == 2
+
+
+def test_copies_from_other_connections_are_dropped(make_hub):
+    first, lagging = tick("SSI", 100), tick("SSI", 100, TotalVal=2500)  # same trade
+    sockets = [FakeSocket([frame("X-TRADE", first)]),
+               FakeSocket([frame("X-TRADE", lagging), frame("X-TRADE", tick("SSI", 200))])]
+    got = listen(make_hub(sockets), {"X-TRADE": "SSI"}, sockets, 2)
+    assert [t.total_vol for t in got["trade"]] == [100, 200]
+
+
+def test_combined_channel_keeps_repeated_quotes(make_hub):
+    updates = [frame("X", tick("SSI", 100)), frame("X", tick("SSI", 200)),
+               frame("X", tick("SSI", 200))]
+    sockets = [FakeSocket(updates), FakeSocket(updates)]
+    got = listen(make_hub(sockets), {"X": "SSI"}, sockets, 2)
+    assert [t.total_vol for t in got["trade"]] == [100, 200]
+    assert len(got["quote"]) == 1
+
+
+def test_combined_channel_late_copy_of_a_trade_is_not_a_quote(make_hub):
+    sockets = [FakeSocket([frame("X", tick("SSI", 100))]),
+               FakeSocket([frame("X", tick("SSI", 100, TotalVal=2500))])]
+    got = listen(make_hub(sockets), {"X": "SSI"}, sockets, 2)
+    assert [t.total_vol for t in got["trade"]] == [100] and got["quote"] == []
+
+
+def test_combined_channel_connection_missing_a_trade(make_hub):
+    quote = frame("X", tick("SSI", 200, time="09:15:05", BidPrice1=24.9))
+    sockets = [FakeSocket([frame("X", tick("SSI", 100)), frame("X", tick("SSI", 200)), quote]),
+               FakeSocket([frame("X", tick("SSI", 100)), quote])]
+    got = listen(make_hub(sockets), {"X": "SSI"}, sockets, 2)
+    assert [t.total_vol for t in got["trade"]] == [100, 200] and len(got["quote"]) == 1
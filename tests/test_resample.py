@@ -0,0 +1,106 @@
+""" Session-aware resampling and the incremental resampler (offline). """
+import numpy as np
+import pytest
+
+from vdatafeed.ssi import Resampler
+from vdatafeed.ssi.columnar import BarColumns
+from vdatafeed.ssi.resample import bucket_times, resample
+
+MINUTES = np.r_[np.arange(9 * 3600, 11 * 3600 + 1800, 60), np.arange(13 * 3600, 15 * 3600, 60)]
+
+
+def day(date: str, symbols=("SSI", "VCB"), seed: int = 0) -> BarColumns:
+    rng = np.random.default_rng(seed)
+    n = len(MINUTES) * len(symbols)
+    close = 20 + rng.random(n)
+    return BarColumns(
+        symbol=np.repeat(symbols, len(MINUTES)), date=np.full(n, date),
+        time=np.tile(MINUTES, len(symbols)), open=close - 0.1, high=close + 0.2,
+        low=close - 0.2, close=close, vol=rng.integers(1, 100, n), val=rng.random(n),
+    )
+
+
+def same(a: BarColumns, b: BarColumns) -> bool:
+    return all(np.allclose(getattr(a, f), getattr(b, f)) if f in BarColumns.fields[3:]
+               else np.array_equal(getattr(a, f), getattr(b, f)) for f in BarColumns.fields)
+
+
+def test_buckets_stay_inside_sessions():
+    times = np.array([8 * 3600 + 2700, 10 * 3600 + 5, 11 * 3600 + 1740, 13 * 3600,
+                      14 * 3600 + 2700, 15 * 3600], dtype=np.int32)
+    assert (bucket_times(times, "1h") // 60).tolist() == [540, 600, 660, 780, 840, 840]
+    assert (bucket_times(times, "session") // 3600).tolist() == [9, 9, 9, 13, 13, 13]
+    assert not bucket_times(times, "1d").any()
+    with pytest.raises(ValueError):
+        bucket_times(times, "2m")
+
+
+def test_resample_aggregates():
+    bars = BarColumns(symbol=["SSI"] * 3, date=["2024-09-09"] * 3, time=[32400, 32460, 32700],
+                      open=[1, 2, 3], high=[5, 6, 4], low=[1, 0, 2], close=[2, 3, 4],
+                      vol=[10, np.nan, 5], val=[1, 1, 1])
+    bar = resample(bars, "5m")
+    assert (bar.open.tolist(), bar.high.tolist(), bar.low.tolist()) == ([1, 3], [6, 4], [0, 2])
+    assert (bar.close.tolist(), bar.vol.tolist(), bar.time.tolist()) == ([3, 4], [10, 5],
+                                                                       [32400, 32700])
+
+
+def test_minute_by_minute_updates_match_one_pass():
+    bars = BarColumns.concat([day("2024-09-09"), day("2024-09-10", seed=1)])
+    resampler = Resampler(("5m", "1h", "session"))
+    for minute in np.unique(np.stack([bars.date.astype(np.int64), bars.time]), axis=1).T:
+        resampler.update(bars.take((bars.date.astype(np.int64) == minute[0])
+                                   & (bars.time == minute[1])))
+    for frequency in ("5m", "1h", "session", "1d"):
+        assert same(resampler.get(frequency), resample(bars, frequency))
+
+
+def test_older_bars_re_aggregate_the_history():
+    first, second = day("2024-09-09"), day("2024-09-10", symbols=("SSI", "FPT"), seed=1)
+    resampler = Resampler(("15m",))
+    resampler.update(second)
+    resampler.update(first)
+    assert same(resampler.get("15m"), resample(BarColumns.concat([first, second]), "15m"))
+
+
+def test_views_are_cached_and_base_is_optional():
+    resampler = Resampler(("5m",))
+    resampler.update(day("2024-09-09"))
+    view = resampler.get("5m")
+    assert resampler.get("5m") is view and resampler.frequencies == ["5m"]
+    assert same(resampler.get("30m"), resample(day("2024-09-09"), "30m"))
+    resampler.update(day("2024-09-10"))
+    both = BarColumns.concat([day("2024-09-09"), day("2024-09-10")])
+    assert resampler.get("5m") is not view and same(resampler.get("30m"), resample(both, "30m"))
+    bounded = Resampler(("5m",), keep_base=False)
+    bounded.update(day("2024-09-09"))
+    with pytest.raises(ValueError, match="keep_base"):
+        bounded.get("1h")
+
+
+@pytest.mark.parametrize("keep_base", [True, False])
+def test_repeated_minutes_are_not_counted_twice(keep_base):
+    bars = day("2024-09-09")
+    resampler = Resampler(("5m", "session"), keep_base=keep_base)
+    resampler.update(bars)
+    resampler.update(BarColumns.concat([bars.take(slice(0, 10)), bars.take(slice(0, 10))]))
+    for frequency in ("5m", "session"):
+        assert same(resampler.get(frequency), resample(bars, frequency))
+    assert resampler.ignored == (0 if keep_base else 10)
+
+
+def test_revised_and_late_minutes_replace_with_base():
+    bars = day("2024-09-09")
+    late = (bars.symbol == "SSI") & (bars.time == MINUTES[0])
+    resampler = Resampler(("5m",))
+    resampler.update(bars.take(~late))
+    resampler.update(bars.take(late))  # the open of the first bucket arrives last
+    row = np.flatnonzero(bars.symbol == "VCB")[:1]
+    revised = bars.take(row)
+    revised.vol[:] = 1000
+    resampler.update(revised)
+    expected = bars.take(np.arange(len(bars)))
+    expected.vol[row] = 1000
+    got = resampler.get("5m")
+    assert same(got, resample(expected, "5m"))
+    assert got.open[0] == bars.open[late][0]
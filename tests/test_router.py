@@ -0,0 +1,99 @@
+""" Per-symbol, basket and wildcard routing of hub updates (offline). """
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from vdatafeed.ssi import TickCodec, TickRouter
+
+from .conftest import FakeSocket, frame, run_until, tick
+
+
+def trade(symbol):
+    return SimpleNamespace(symbol=symbol)
+
+
+def test_symbol_and_wildcard_routes():
+    router, seen = TickRouter(), []
+    router.route(lambda t: seen.append(("ssi", t.symbol)), "SSI, VCB")
+    router.route(lambda t: seen.append(("all", t.symbol)))
+    for symbol in ("SSI", "FPT"):
+        router.on_trade(trade(symbol))
+    assert seen == [("all", "SSI"), ("ssi", "SSI"), ("all", "FPT")]
+
+
+def test_kinds_are_separate():
+    router, seen = TickRouter(), []
+    router.route(seen.append, ["SSI"], kinds=("quote",))
+    router.on_trade(trade("SSI"))
+    assert seen == []
+    router.on_quote(trade("SSI"))
+    router.on_index(SimpleNamespace(index="VN30"))
+    assert len(seen) == 1
+    with pytest.raises(ValueError):
+        router.route(seen.append, "SSI", kinds=("depth",))
+    with pytest.raises(ValueError):
+        router.route(seen.append, "SSI", basket="VN30")
+
+
+def test_basket_members_change_under_live_routes():
+    router, seen = TickRouter(), []
+    router.set_basket("VN30", "SSI,VCB")
+    router.route(lambda t: seen.append(t.symbol), basket="VN30")
+    router.set_basket("VN30", ["VCB", "FPT"])
+    assert router.basket("VN30") == {"VCB", "FPT"}
+    for symbol in ("SSI", "VCB", "FPT"):
+        router.on_trade(trade(symbol))
+    assert seen == ["VCB", "FPT"]
+
+
+def test_route_before_basket_is_defined():
+    router, seen = TickRouter(), []
+    router.route(lambda t: seen.append(t.symbol), basket="VN30")
+    router.on_trade(trade("SSI"))
+    router.set_basket("VN30", "SSI")
+    router.on_trade(trade("SSI"))
+    assert seen == ["SSI"]
+
+
+def test_unroute():
+    router, seen = TickRouter(), []
+    tokens = [
+        router.route(lambda t: seen.append("symbol"), "SSI"),
+        router.route(lambda t: seen.append("wildcard")),
+    ]
+    router.set_basket("B", "SSI")
+    tokens.append(router.route(lambda t: seen.append("basket"), basket="B"))
+    kept = router.route(lambda t: seen.append("kept"), "SSI")
+    for token in tokens + [12345]:
+        router.unroute(token)
+    router.on_trade(trade("SSI"))
+    assert seen == ["kept"]
+    router.unroute(kept)
+    router.on_trade(trade("SSI"))
+    assert seen == ["kept"]
+
+
+def test_attached_to_the_hub(make_hub):
+    socket = FakeSocket([frame("X-TRADE", tick("SSI", 100), tick("VCB", 50))])
+    hub, router, seen = make_hub([socket]), TickRouter(), []
+    router.route(lambda t: seen.append((t.symbol, t.total_vol)), "VCB")
+    hub.attach(router)
+    asyncio.run(run_until(hub.subscribe({"X-TRADE": "SSI,VCB"}), lambda: socket.drained))
+    assert seen == [("VCB", 50)]
+
+
+def test_shares_the_codec_symbol_ids(make_hub):
+    codec = TickCodec()
+    codec.id("FPT")
+    router, seen = TickRouter(codec=codec), []
+    router.route(lambda t: seen.append(t.symbol), "VCB")
+    assert router.symbols is codec.symbols and codec.symbols.get("VCB") == 1
+    codec.id("ACB")  # interned elsewhere, after the tables were sized
+    router.on_trade(trade("ACB"))
+    socket = FakeSocket([frame("X-TRADE", tick("SSI", 100), tick("VCB", 50))])
+    hub = make_hub([socket])
+    hub.attach(router)
+    asyncio.run(run_until(hub.subscribe({"X-TRADE": "SSI,VCB"}, codec=codec),
+                          lambda: socket.drained))
+    assert seen == ["VCB"] and codec.symbols.get("SSI") is not None
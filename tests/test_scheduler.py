@@ -0,0 +1,79 @@
+""" Request scheduler: single-flight merging and priorities (offline). """
+import threading
+import time
+
+import pytest
+
+from vdatafeed.utils import RequestScheduler
+
+from .conftest import FakeResponse
+
+
+def busy(scheduler: RequestScheduler) -> threading.Event:
+    """
+    Occupies the single worker of ``scheduler`` until the returned event is set.
+    """
+    started, release = threading.Event(), threading.Event()
+    scheduler.submit("busy", lambda: started.set() or release.wait())
+    assert started.wait(2)
+    return release
+
+
+def test_identical_requests_are_merged():
+    scheduler = RequestScheduler(workers=1)
+    release = busy(scheduler)
+    calls = []
+    futures = [scheduler.submit("key", lambda: calls.append(1) or "page") for _ in range(3)]
+    release.set()
+    assert {f.result(2) for f in futures} == {"page"} and calls == [1]
+    assert len({id(f) for f in futures}) == 1
+    assert (scheduler.stats["submitted"], scheduler.stats["merged"]) == (4, 2)
+
+
+def test_higher_priority_first_without_starving_batches():
+    scheduler = RequestScheduler(workers=1, starvation=1)
+    release = busy(scheduler)
+    order = []
+    futures = [scheduler.submit(f"b{n}", lambda n=n: order.append(f"b{n}"), priority=10)
+               for n in range(2)]
+    with scheduler.priority(RequestScheduler.INTERACTIVE):
+        futures += [scheduler.submit(f"i{n}", lambda n=n: order.append(f"i{n}"))
+                    for n in range(3)]
+    release.set()
+    for future in futures:
+        future.result(2)
+    assert order == ["i0", "b0", "i1", "b1", "i2"]
+    assert set(scheduler.stats["wait"]) == {0, 5, 10}
+
+
+def test_promoted_duplicate_and_errors():
+    scheduler = RequestScheduler(workers=1)
+    release = busy(scheduler)
+    order = []
+    scheduler.submit("a", lambda: order.append("a"), priority=5)
+    scheduler.submit("b", lambda: order.append("b"), priority=5)
+    promoted = scheduler.submit("b", None, priority=0)
+    failed = scheduler.submit("c", lambda: 1 / 0)
+    release.set()
+    promoted.result(2)
+    with pytest.raises(ZeroDivisionError):
+        failed.result(2)
+    assert order[0] == "b" and sorted(order) == ["a", "b"]
+
+
+def test_api_merges_concurrent_identical_gets(make_api, http):
+    def slow(url, params, headers):
+        time.sleep(0.1)
+        return FakeResponse({"data": [{"IndexCode": "VN30"}]})
+
+    http.responder = slow
+    api = make_api(scheduler_workers=2, output="raw")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(api.get_indices("HOSE")))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [[{"IndexCode": "VN30"}]] * 2
+    assert len(http.gets("IndexList")) == 1
@@ -0,0 +1,65 @@
+""" Incremental JSON parsing and streamed pages (offline). """
+import json
+
+import pytest
+
+from vdatafeed.utils import JSONStream, select
+
+from .conftest import FakeResponse
+
+DOCUMENT = {
+    "message": "Success",
+    "data": [{"RepeatedInfo": [{"Symbol": "A", "Price": 1.5}, {"Symbol": "B"}]},
+             {"RepeatedInfo": []}, {"RepeatedInfo": [{"Symbol": "C", "Note": "a,]}\"b"}]}],
+    "totalRecord": 3,
+}
+
+
+def chunks(document, size: int):
+    body = json.dumps(document).encode()
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1 << 16])
+def test_stream_matches_select(size):
+    path = ("data", "RepeatedInfo")
+    stream = JSONStream(chunks(DOCUMENT, size), path)
+    assert list(stream) == list(select(DOCUMENT, path))
+    assert stream.meta == {"message": "Success", "totalRecord": 3}
+
+
+def test_number_split_across_chunks():
+    body = b'{"data": [12345.678, 9], "totalRecord": 2}'
+    stream = JSONStream([body[:14], body[14:]])
+    assert list(stream) == [12345.678, 9]
+
+
+def test_multibyte_split_across_chunks_and_close():
+    closed = []
+    body = json.dumps({"data": ["Chứng khoán"]}, ensure_ascii=False).encode()
+    stream = JSONStream([body[:15], body[15:]], on_close=lambda: closed.append(True))
+    assert list(stream) == ["Chứng khoán"] and closed == [True]
+
+
+def test_truncated_document_raises():
+    with pytest.raises(ValueError):
+        list(JSONStream([b'{"data": [1, 2']))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_streamed_page_holds_its_credential(make_api, http, workers):
+    api = make_api(stream=True, output="raw", scheduler_workers=workers)
+    load = []
+
+    class Tracked(FakeResponse):
+        def iter_content(self, chunk_size=1):
+            load.append(api.pool.stats[0]["in_flight"])
+            yield from super().iter_content(3)
+
+    rows = [{"Symbol": "SSI"}, {"Symbol": "VCB"}]
+    http.responder = lambda url, params, headers: Tracked({"data": rows, "totalRecord": 2})
+    assert api.get_daily_instruments_info("SSI", "2024-09-01", "2024-09-09") == rows
+    assert load == [1]  # consumed while the credential was held
+    assert api.pool.stats[0]["in_flight"] == 0
+    if workers:
+        assert api.scheduler.stats["completed"] == 1
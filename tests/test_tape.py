@@ -0,0 +1,50 @@
+""" Per-symbol ring-buffer tick tape (offline). """
+import numpy as np
+
+from vdatafeed.ssi import TickTape
+from vdatafeed.ssi.model import TradeTick
+
+from .conftest import tick
+
+
+def fill(tape: TickTape, symbol: str, trades: int) -> None:
+    for n in range(trades):
+        tape.update(symbol, 10.0 + n, 100, 100 * (n + 1), f"2024-09-09T09:15:{n:02d}")
+
+
+def test_ring_keeps_the_latest_trades_contiguous():
+    tape = TickTape(capacity=4)
+    fill(tape, "SSI", 6)
+    window = tape.last("SSI")
+    assert window["price"].tolist() == [12, 13, 14, 15] and tape.count("SSI") == 4
+    assert window["price"].base is not None  # a view, no copy
+    assert tape.last("SSI", 2)["total_vol"].tolist() == [500, 600]
+    assert tape.last("SSI", 10)["price"].size == 4 and tape.last("SSI", 0)["price"].size == 0
+
+
+def test_time_queries():
+    tape = TickTape(capacity=8)
+    fill(tape, "SSI", 6)
+    assert tape.since("SSI", "2024-09-09T09:15:04")["price"].tolist() == [14, 15]
+    assert tape.recent("SSI", 2, now="2024-09-09T09:15:05")["price"].tolist() == [14, 15]
+    assert tape.recent("SSI", 60, now="2024-09-09T11:00:00")["price"].size == 0  # illiquid
+    assert tape.recent("SSI", 10)["price"].size == 0  # anchored at the current time
+    assert tape.since("VCB", "2024-09-09")["price"].size == 0 and tape.count("VCB") == 0
+
+
+def test_symbols_grow_and_memory_is_fixed():
+    tape = TickTape(capacity=4, symbols=["SSI"])
+    before = tape.nbytes
+    for symbol in ("VCB", "FPT", "HPG"):
+        fill(tape, symbol, 9)
+    assert tape.nbytes == 4 * before
+    assert tape.last("HPG")["price"].tolist() == [15, 16, 17, 18]
+    assert tape.last("HPG")["timestamp"][-1] == np.datetime64("2024-09-09T09:15:08")
+
+
+def test_on_trade_uses_the_tick_time():
+    tape = TickTape()
+    tape.on_trade(TradeTick(**tick("SSI", 300, time="10:01:02", LastPrice=26.5, LastVol=300)))
+    window = tape.last("SSI")
+    assert (window["price"][0], window["vol"][0]) == (26.5, 300)
+    assert window["timestamp"][0] == np.datetime64("2024-09-09T10:01:02")
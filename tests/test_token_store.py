@@ -0,0 +1,55 @@
+""" Access token shared across threads and processes (offline). """
+import multiprocessing
+import threading
+import time
+
+from vdatafeed.utils import TokenStore
+
+
+def expired(token) -> bool:
+    return token is None or token == "old"
+
+
+def refresh_once(path: str, log: str) -> str:
+    def refresh():
+        with open(log, "a") as file:
+            file.write("refresh\n")
+        time.sleep(0.05)
+        return "new"
+    return TokenStore(path).get(expired, refresh)
+
+
+def test_refresh_only_when_expired(tmp_path):
+    store = TokenStore(str(tmp_path / "nested" / "session"))
+    assert store.read() is None
+    assert store.get(expired, lambda: "new") == "new" and store.read() == "new"
+    assert store.get(expired, lambda: 1 / 0) == "new"
+    store.write("old")
+    assert store.get(expired, lambda: None) is None and store.read() == "old"
+
+
+def test_threads_refresh_once(tmp_path):
+    path, log = str(tmp_path / "session"), str(tmp_path / "log")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(refresh_once(path, log)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["new"] * 4
+    assert open(log).read().count("refresh") == 1
+
+
+def test_processes_refresh_once(tmp_path):
+    path, log = str(tmp_path / "session"), str(tmp_path / "log")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(3) as pool:
+        assert pool.starmap(refresh_once, [(path, log)] * 3) == ["new"] * 3
+    assert open(log).read().count("refresh") == 1
+
+
+def test_apis_share_the_session_file(make_api, http):
+    first, second = make_api(), make_api()
+    assert first.get_token() == second.get_token()
+    assert len([c for c in http.calls if c[0] == "POST"]) == 1
@@ -0,0 +1,125 @@
+""" Trading calendar and calendar-aware planning (offline). """
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from vdatafeed.ssi.constant import TIMEZONE
+from vdatafeed.ssi.trading_calendar import TradingCalendar, session_minutes
+
+HOLIDAYS = {"2024-09-02", "2024-09-03"}  # National Day
+
+
+def index_history():
+    """
+    Returns a fake API serving the daily VNINDEX rows of every weekday but ``HOLIDAYS``.
+    """
+    calls = []
+
+    def iter_daily_indices_info(index, first, last):
+        calls.append((index, first, last))
+        days = np.arange(np.datetime64(first), np.datetime64(last) + 1)
+        days = [d for d in days if np.is_busday(d) and str(d) not in HOLIDAYS]
+        yield [{"TradingDate": d.astype(object).strftime("%d/%m/%Y")} for d in days]
+
+    return SimpleNamespace(iter_daily_indices_info=iter_daily_indices_info), calls
+
+
+class Clock(datetime):
+    """
+    Exchange time of the tests, moved by setting ``Clock.at``.
+    """
+    at = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.at
+
+
+def at(day: str, hour: int, minute: int = 0) -> datetime:
+    return datetime.fromisoformat(day).replace(hour=hour, minute=minute, tzinfo=TIMEZONE)
+
+
+def test_trading_days_skip_weekends_and_holidays():
+    api, calls = index_history()
+    calendar = TradingCalendar(api)
+    days = calendar.trading_days("2024-08-29", "2024-09-05")
+    assert days.astype(str).tolist() == ["2024-08-29", "2024-08-30", "2024-09-04", "2024-09-05"]
+    assert not calendar.is_trading_day("2024-09-02") and calendar.is_trading_day("2024-09-04")
+    assert calendar.missing(["30/08/2024"], "2024-08-29", "2024-08-30").astype(str).tolist() == [
+        "2024-08-29"
+    ]
+    assert {c[0] for c in calls} == {"VNINDEX"}
+    sent = len(calls)
+    calendar.trading_days("2024-08-30", "2024-09-04")
+    assert len(calls) == sent  # past chunks are loaded once
+
+
+def test_is_closed_without_requests():
+    api, calls = index_history()
+    calendar = TradingCalendar(api)
+    assert calendar.is_closed("2024-08-31", "2024-09-01")  # weekend
+    assert not calendar.is_closed("2024-09-02", "2024-09-03") and not calls  # not loaded yet
+    calendar.load("2024-09-02", "2024-09-03")
+    assert calendar.is_closed("2024-09-02", "2024-09-03")
+    assert not calendar.is_closed("2024-09-02", None)
+
+
+def test_split_and_expected_bars():
+    calendar = TradingCalendar(index_history()[0])
+    assert list(calendar.split("2024-08-29", "2024-09-06", days=2)) == [
+        ("2024-08-29", "2024-08-30"), ("2024-09-04", "2024-09-05"), ("2024-09-06", "2024-09-06")
+    ]
+    minutes = session_minutes()
+    assert minutes == TradingCalendar.bars_per_day("intraday") == 270
+    windows = calendar.split("2024-08-29", "2024-09-06", days=5, max_bars=3 * minutes,
+                             bars_per_day=minutes)
+    assert [w[0] for w in windows] == ["2024-08-29", "2024-09-05"]
+    assert calendar.expected_bars("2024-08-29", "2024-09-06", minutes) == 5 * minutes
+
+
+def test_calendar_survives_restarts(tmp_path):
+    path = str(tmp_path / "calendar.json")
+    api, calls = index_history()
+    TradingCalendar(api, path=path).load("2024-08-01", "2024-08-31")
+    sent = len(calls)
+    calendar = TradingCalendar(api, path=path)
+    assert len(calendar.trading_days("2024-08-01", "2024-08-31")) == 22
+    assert len(calls) == sent
+
+
+def test_api_skips_closed_ranges(make_api, http):
+    api = make_api()
+    api.calendar = TradingCalendar(index_history()[0])
+    assert api.get_endofday_ohlcv("SSI", "2024-08-31", "2024-09-01") is None
+    assert not http.gets("DailyOHLC")
+
+
+def test_chunk_holding_today_is_kept_until_the_close(monkeypatch):
+    monkeypatch.setattr("vdatafeed.ssi.trading_calendar.datetime", Clock)
+    api, calls = index_history()
+    calendar = TradingCalendar(api)
+
+    def requests_at(day, hour, minute=0):
+        Clock.at = at(day, hour, minute)
+        sent = len(calls)
+        calendar.trading_days("2024-09-01", day)
+        return len(calls) - sent
+
+    assert requests_at("2024-09-09", 10) == 1
+    assert requests_at("2024-09-09", 14, 59) == 0
+    assert requests_at("2024-09-09", 15, 5) == 1  # today's row may have appeared
+    assert requests_at("2024-09-09", 20) == 0  # and it did
+    assert calendar.is_closed("2024-09-02", "2024-09-03")  # known from the open chunk
+    assert requests_at("2024-09-10", 9) == 1  # a new day
+
+
+def test_missing_row_of_today_is_polled_after_the_close(monkeypatch):
+    monkeypatch.setattr("vdatafeed.ssi.trading_calendar.datetime", Clock)
+    api, calls = index_history()  # 2024-09-02 is a weekday without index rows
+    calendar = TradingCalendar(api, open_ttl=600)
+    for minute, sent in ((5, 1), (10, 0), (16, 1)):
+        Clock.at = at("2024-09-02", 15, minute)
+        before = len(calls)
+        assert not calendar.is_trading_day("2024-09-02")
+        assert len(calls) - before == sent
@@ -0,0 +1,63 @@
+""" Hub watchdog and reconnection over fake websockets (offline). """
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from vdatafeed.ssi.constant import HUB, TIMEZONE
+
+from .conftest import FakeSocket, frame, run_until
+
+QUOTE = {"symbol": "SSI", "TotalVol": 100}
+
+
+def test_stale_timeout_follows_sessions(make_hub):
+    hub = make_hub([])
+    monday = datetime(2024, 9, 9, 10, 0, tzinfo=TIMEZONE)
+    assert hub.stale_timeout(monday) == 15
+    assert hub.stale_timeout(monday.replace(hour=12)) == 40
+    assert hub.stale_timeout(datetime(2024, 9, 14, 10, 0, tzinfo=TIMEZONE)) == 40
+    hub.keepalive_timeout = 20
+    assert hub.stale_timeout(monday) == 15 and hub.stale_timeout(monday.replace(hour=16)) == 20
+
+
+def test_backoff_is_bounded(make_hub):
+    hub = make_hub([])
+    hub.base_delay = 1
+    assert all(0 <= hub.calculate_backoff_delay(n) <= hub.max_delay for n in range(100))
+
+
+def test_stale_connection_is_replaced_before_it_is_closed(make_hub):
+    stale, fresh = FakeSocket([frame("X", QUOTE)]), FakeSocket([frame("X", QUOTE)])
+    hub = make_hub([stale, fresh])
+    hub.stale_timeout = lambda now=None: 0.05
+    frames, reconnects = [], []
+    asyncio.run(run_until(
+        hub.run(["X:SSI"], frames.append, lambda: reconnects.append(stale.closed)),
+        lambda: len(frames) == 2,
+    ))
+    assert len(frames) == 2 and reconnects == [False] and stale.closed
+    subscription = {"H": HUB, "M": "SwitchChannels", "I": 0, "A": ["X:SSI"]}
+    assert fresh.sent == stale.sent == [subscription]
+
+
+def test_broken_connection_reconnects_and_callback_errors_are_contained(make_hub):
+    broken = FakeSocket([frame("X", QUOTE)], error=ConnectionError("reset"))
+    hub = make_hub([broken, FakeSocket([frame("X", QUOTE), frame("X", QUOTE)])])
+    frames, reconnects = [], []
+
+    def on_frame(message):
+        frames.append(message)
+        raise RuntimeError("callback failed")
+
+    asyncio.run(run_until(
+        hub.run(["X:SSI"], on_frame, lambda: reconnects.append(True)), lambda: len(frames) == 3
+    ))
+    assert len(frames) == 3 and reconnects == [True] and broken.closed
+
+
+def test_reconnect_attempts_can_be_bounded(make_hub):
+    hub = make_hub([FakeSocket(error=ConnectionError("refused")) for _ in range(2)])
+    hub.max_reconnect_attempts = 1
+    with pytest.raises(ConnectionError):
+        asyncio.run(hub.run(["X:SSI"], print))
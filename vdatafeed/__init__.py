@@ -1,4 +1,5 @@
 """ Datafeed module. """
 from .enum_datafeed import EnumDatafeed  # noqa: F401
+from .enum_output import EnumOutput  # noqa: F401
 from .datafeed import Datafeed  # noqa: F401
 from .config import Config  # noqa: F401
@@ -1,7 +1,8 @@
 """ Configuration module for the datafeed. """
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from .utils import BaseModel
+from .enum_output import EnumOutput
 
 
 class Config(BaseModel):
@@ -11,7 +12,41 @@ class Config(BaseModel):
     Attributes:
         ssi_datafeed_id (Optional[str]): The SSI datafeed ID.
         ssi_datafeed_secret (Optional[str]): The SSI datafeed secret.
+        cache_size (int): The number of responses kept in the in-memory cache.
+                          0 disables caching unless ``cache_dir`` is set.
+        cache_dir (Optional[str]): The directory of the persistent response cache.
+        stream (bool): Parse paginated responses incrementally while they are received,
+                       building each row as soon as it is decoded.
+        output (EnumOutput): How API rows are returned: string models (default),
+                             typed models or raw dicts.
+        scheduler_workers (int): The number of requests the scheduler keeps in flight.
+                                 0 (default) sends requests directly, without scheduler.
+        session_file (str): The access token file, shared by every process using it.
+        credentials (List[Tuple[str, str]]): Extra (consumer ID, consumer secret) pairs.
+                                             Requests are spread across them and the
+                                             main credential, each with its own token
+                                             (``<session_file>.<consumer ID>``) and
+                                             rate budget.
+        credential_strategy (str): How a credential is chosen for each request:
+                                   "least_loaded" (default) or "round_robin".
+        credential_cooldown (float): Seconds a credential refused with HTTP 429 is
+                                     skipped, unless the response says otherwise.
     """
     # SSI datafeed information
     ssi_datafeed_id: Optional[str] = None
     ssi_datafeed_secret: Optional[str] = None
+    # Response cache
+    cache_size: int = 0
+    cache_dir: Optional[str] = None
+    # Incremental parsing of paginated responses
+    stream: bool = False
+    # Row output
+    output: EnumOutput = EnumOutput.MODEL.value
+    # Request scheduler
+    scheduler_workers: int = 0
+    # Access token shared across processes
+    session_file: str = "vdatafeed.session"
+    # Credential pool
+    credentials: List[Tuple[str, str]] = []
+    credential_strategy: str = "least_loaded"
+    credential_cooldown: float = 60
@@ -0,0 +1,17 @@
+"""
+This module contains the EnumOutput class which selects how API rows are returned.
+"""
+from .utils import EnumHandler
+
+
+class EnumOutput(EnumHandler):
+    """
+    This module contains the EnumOutput class which selects how API rows are returned.
+    Attributes:
+        MODEL (str): Models with the raw string fields of the API.
+        TYPED (str): Models with numeric, date and time fields.
+        RAW (str): The decoded dicts, without validation.
+    """
+    MODEL = 'model'
+    TYPED = 'typed'
+    RAW = 'raw'
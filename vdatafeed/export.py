@@ -0,0 +1,326 @@
+""" Resumable bulk export of historical data to partitioned files. """
+import os
+import csv
+import json
+import argparse
+import threading
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, NamedTuple, Optional
+
+from .config import Config
+from .datafeed import Datafeed
+from .enum_datafeed import EnumDatafeed
+from .interface_datafeed_api import IDatafeedAPI
+from .ssi import TradingCalendar
+from .ssi.model import EndOfDayOHLC, IndicesInfo, InstrumentInfo, IntradayOHLC
+
+# dataset name -> (API method, keyword of the symbol argument, default window in days,
+#                  model of the rows)
+DATASETS: dict = {
+    "daily": ("get_daily_instruments_info", "instrument", 30, InstrumentInfo),
+    "eod": ("get_endofday_ohlcv", "instrument", 30, EndOfDayOHLC),
+    "intraday": ("get_intraday_ohlcv", "instrument", 3, IntradayOHLC),
+    "index": ("get_daily_indices_info", "index", 30, IndicesInfo),
+}
+# dataset name -> expected rows per symbol and trading day, when not 1
+BARS_PER_DAY: dict = {"intraday": TradingCalendar.bars_per_day("intraday")}
+# rows of a single response: windows of the unpaginated OHLC endpoints must fit in it
+PAGE_ROWS: int = 1000
+
+
+class ExportUnit(NamedTuple):
+    """
+    The smallest resumable piece of an export: one dataset, one symbol, one date window.
+    Attributes:
+        dataset (str): The dataset name, one of ``DATASETS``.
+        symbol (str): The instrument or index code.
+        from_date (str): The first date (YYYY-MM-DD) of the window.
+        to_date (str): The last date (YYYY-MM-DD) of the window.
+        expected (int): The rows the window should hold, when planned with a calendar.
+    """
+    dataset: str
+    symbol: str
+    from_date: str
+    to_date: str
+    expected: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        """
+        Returns the identifier of the unit in the manifest.
+        """
+        return "/".join([self.dataset, self.symbol, self.from_date, self.to_date])
+
+
+class Manifest:
+    """
+    Append-only checkpoint of completed export units.
+    Each completed unit is written as one JSON line and flushed to disk before the
+    next one, so an interrupted run loses at most the units that were in flight.
+    Args:
+        path (str): The manifest file.
+    """
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.__lock = threading.Lock()
+        self.__done: set = set()
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                for line in file:
+                    try:
+                        self.__done.add(json.loads(line)["unit"])
+                    except (ValueError, KeyError):
+                        continue  # torn last line of a killed run
+
+    def is_done(self, unit: ExportUnit) -> bool:
+        return unit.key in self.__done
+
+    def mark(
+        self, unit: ExportUnit, rows: int, file: Optional[str], expected: int = None
+    ) -> None:
+        entry = {"unit": unit.key, "rows": rows, "file": file}
+        if expected is not None:
+            entry["expected"] = expected
+        line = json.dumps(entry)
+        with self.__lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.__done.add(unit.key)
+
+
+def split_dates(from_date: str, to_date: str, days: int) -> Iterator[tuple]:
+    """
+    Splits an inclusive YYYY-MM-DD range into consecutive windows of at most ``days`` days.
+    """
+    start = datetime.strptime(from_date, "%Y-%m-%d")
+    end = datetime.strptime(to_date, "%Y-%m-%d")
+    while start <= end:
+        stop = min(end, start + timedelta(days=days - 1))
+        yield start.strftime("%Y-%m-%d"), stop.strftime("%Y-%m-%d")
+        start = stop + timedelta(days=1)
+
+
+def plan(
+    api: IDatafeedAPI, datasets: List[str], from_date: str, to_date: str,
+    symbols: List[str] = None, indices: List[str] = None, window_days: int = None,
+    calendar: TradingCalendar = None
+) -> List[ExportUnit]:
+    """
+    Plans the units of an export.
+    Args:
+        api (IDatafeedAPI): The datafeed API.
+        datasets (list): The dataset names to export.
+        from_date (str): The start date (YYYY-MM-DD).
+        to_date (str): The end date (YYYY-MM-DD).
+        symbols (list, optional): The instruments. Defaults to every listed instrument.
+        indices (list, optional): The indices. Defaults to every listed index.
+        window_days (int, optional): Overrides the default window of every dataset.
+                                     Without a calendar, it is capped so that a window
+                                     of calendar days cannot exceed ``PAGE_ROWS`` rows.
+        calendar (TradingCalendar, optional): When set, windows count trading days, are
+                                              capped to ``PAGE_ROWS`` expected rows, skip
+                                              weekends and holidays entirely and carry
+                                              their expected row count.
+    Returns:
+        list: The export units.
+    """
+    if symbols is None and any(DATASETS[d][1] == "instrument" for d in datasets):
+        symbols = sorted({
+            i.get("Symbol") if isinstance(i, dict) else i.instrument
+            for i in api.get_instruments() or []
+        } - {None, ""})
+    if indices is None and "index" in datasets:
+        indices = sorted({
+            i.get("IndexCode") if isinstance(i, dict) else i.index_code
+            for i in api.get_indices() or []
+        } - {None, ""})
+    units: list = []
+    for dataset in datasets:
+        _, kind, days, _ = DATASETS[dataset]
+        if calendar is not None:
+            bars = BARS_PER_DAY.get(dataset, 1)
+            # expected counts once per window, shared by every symbol
+            windows = [
+                (first, last, calendar.expected_bars(first, last, bars))
+                for first, last in calendar.split(
+                    from_date, to_date, window_days or days, max_bars=PAGE_ROWS,
+                    bars_per_day=bars
+                )
+            ]
+        else:
+            # every calendar day may be a trading day: bound the window by that
+            limit = max(1, PAGE_ROWS // BARS_PER_DAY.get(dataset, 1))
+            if window_days and window_days > limit:
+                print(f"[vDatafeed] Export {dataset}: window capped to {limit} days")
+            windows = list(split_dates(from_date, to_date, min(window_days or days, limit)))
+        for symbol in (indices if kind == "index" else symbols) or []:
+            units += [ExportUnit(dataset, symbol, *window) for window in windows]
+    return units
+
+
+def columns(dataset: str, raw: bool = False) -> List[str]:
+    """
+    Returns the columns of a dataset: the fields of its model, or the response members
+    they are read from when ``raw``.
+    """
+    fields = DATASETS[dataset][3].model_fields
+    if not raw:
+        return list(fields)
+    return [
+        name if f.validation_alias is None else f.validation_alias.choices[-1]
+        for name, f in fields.items()
+    ]
+
+
+def write_rows(rows: list, path: str, fmt: str, fields: List[str] = ()) -> None:
+    """
+    Writes rows to ``path`` atomically, through a temporary file and a rename.
+    Args:
+        rows (list): The rows as dicts.
+        path (str): The destination file.
+        fmt (str): "csv", "parquet" or "arrow" (Arrow IPC file, memory-mappable).
+        fields (list): The leading columns, e.g. ``columns(dataset)``; keys of any row
+                       not listed follow them. Missing values are left empty.
+    """
+    fields = list(dict.fromkeys([*fields, *(k for row in rows for k in row)]))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    if fmt in ("parquet", "arrow"):
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                f"{fmt.capitalize()} output requires pyarrow: pip install vdatafeed[arrow]"
+            ) from e
+        table = pa.Table.from_pydict({k: [row.get(k) for row in rows] for k in fields})
+        if fmt == "parquet":
+            pq.write_table(table, tmp)
+        else:
+            with pa.OSFile(tmp, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+    else:
+        with open(tmp, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def export_unit(api: IDatafeedAPI, unit: ExportUnit, out: str, fmt: str) -> tuple:
+    """
+    Fetches one unit and writes it under ``out/<dataset>/symbol=<symbol>/``. Rows are
+    written as the API returns them: model fields, or the response members with
+    ``output="raw"``.
+    Returns:
+        tuple: The number of rows and the written file (None when the unit is empty).
+    """
+    method, kind, _, _ = DATASETS[unit.dataset]
+    scheduler = getattr(api, "scheduler", None)
+    with scheduler.priority(scheduler.BATCH) if scheduler else nullcontext():
+        data = getattr(api, method)(
+            **{kind: unit.symbol}, from_date=unit.from_date, to_date=unit.to_date
+        ) or []
+    if not data:
+        return 0, None
+    path = os.path.join(
+        out, unit.dataset, f"symbol={unit.symbol}", f"{unit.from_date}_{unit.to_date}.{fmt}"
+    )
+    raw = isinstance(data[0], dict)
+    rows = [i if raw else i.model_dump() for i in data]
+    write_rows(rows, path, fmt, columns(unit.dataset, raw))
+    return len(data), path
+
+
+def run(
+    api: IDatafeedAPI, units: List[ExportUnit], out: str, fmt: str = "csv", workers: int = 4
+) -> int:
+    """
+    Runs an export, skipping the units already recorded in ``out/manifest.jsonl``.
+    Requests from every worker go through the API rate limiter. The expected row count
+    of units planned with a calendar is recorded next to the received one.
+    Returns:
+        int: The number of failed units.
+    """
+    os.makedirs(out, exist_ok=True)
+    manifest = Manifest(os.path.join(out, "manifest.jsonl"))
+    pending = [u for u in units if not manifest.is_done(u)]
+    print(f"[vDatafeed] Export: {len(units) - len(pending)}/{len(units)} units already done")
+    failed: int = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(export_unit, api, u, out, fmt): u for u in pending}
+        for n, future in enumerate(as_completed(futures), 1):
+            unit = futures[future]
+            try:
+                rows, path = future.result()
+                expected = unit.expected
+                manifest.mark(unit, rows, path, expected)
+                short = f" ({expected} expected)" if expected and rows < expected else ""
+                print(f"[vDatafeed] Export [{n}/{len(pending)}] {unit.key}: {rows} rows{short}")
+            except Exception as e:
+                failed += 1
+                print(f"[vDatafeed] Export [{n}/{len(pending)}] {unit.key} failed: {e}")
+    return failed
+
+
+def main(argv: list = None) -> int:
+    """
+    Console entry point: ``vdatafeed-export``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="vdatafeed-export",
+        description="Export historical data to partitioned files; re-run to resume."
+    )
+    parser.add_argument("--from", dest="from_date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="to_date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument(
+        "--datasets", default=",".join(DATASETS),
+        help=f"comma-separated list among {','.join(DATASETS)}"
+    )
+    parser.add_argument("--symbols", help="comma-separated instruments (default: all)")
+    parser.add_argument("--indices", help="comma-separated indices (default: all)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--window-days", type=int, help="override the window of every dataset")
+    parser.add_argument(
+        "--no-calendar", action="store_true",
+        help="plan calendar-day windows instead of trading-day windows"
+    )
+    parser.add_argument("--calendar-file", help="file keeping the trading calendar across runs")
+    parser.add_argument("--datafeed", choices=EnumDatafeed.values(), default=EnumDatafeed.SSI.value)
+    parser.add_argument("--id", default=os.environ.get("SSI_DATAFEED_ID"))
+    parser.add_argument("--secret", default=os.environ.get("SSI_DATAFEED_SECRET"))
+    args = parser.parse_args(argv)
+
+    datasets = [d for d in args.datasets.split(",") if d]
+    unknown = set(datasets) - set(DATASETS)
+    if unknown:
+        parser.error(f"unknown datasets: {','.join(sorted(unknown))}")
+    datafeed = Datafeed(
+        datafeed=args.datafeed,
+        config=Config(ssi_datafeed_id=args.id, ssi_datafeed_secret=args.secret)
+    )
+    calendar = None
+    if not args.no_calendar:
+        calendar = TradingCalendar(datafeed.api, path=args.calendar_file)
+    units = plan(
+        datafeed.api, datasets, args.from_date, args.to_date,
+        symbols=args.symbols.split(",") if args.symbols else None,
+        indices=args.indices.split(",") if args.indices else None,
+        window_days=args.window_days, calendar=calendar
+    )
+    failed = run(datafeed.api, units, args.out, fmt=args.format, workers=args.workers)
+    if failed:
+        print(f"[vDatafeed] Export: {failed} units failed, re-run to resume")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
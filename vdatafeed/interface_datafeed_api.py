@@ -1,5 +1,7 @@
 """ Interface for Datafeed API """
 from abc import ABC, abstractmethod
+from typing import Iterator
+
 from .config import Config
 
 
@@ -89,6 +91,24 @@ class IDatafeedAPI(ABC):
         """
         return NotImplemented
 
+    @abstractmethod
+    def iter_daily_instruments_info(
+        self, instrument: str = None, from_date: str = None, to_date: str = None
+    ) -> Iterator[list]:
+        """
+        Iterates over daily instruments information page by page.
+        Args:
+            instrument (str, optional): The instrument to retrieve information for.
+                                        Defaults to None.
+            from_date (str, optional): The starting date (YYYY-MM-DD) for retrieving information.
+                                       Defaults to None.
+            to_date (str, optional): The ending date (YYYY-MM-DD) for retrieving information.
+                                     Defaults to None.
+        Yields:
+            list: One page of daily instruments information.
+        """
+        return NotImplemented
+
     @abstractmethod
     def get_daily_indices_info(
         self, index: str, from_date: str = None, to_date: str = None
@@ -104,6 +124,21 @@ class IDatafeedAPI(ABC):
         """
         return NotImplemented
 
+    @abstractmethod
+    def iter_daily_indices_info(
+        self, index: str, from_date: str = None, to_date: str = None
+    ) -> Iterator[list]:
+        """
+        Iterates over daily indices information page by page.
+        Args:
+            index (str): The index code.
+            from_date (str, optional): The starting date (YYYY-MM-DD). Defaults to None.
+            to_date (str, optional): The ending date (YYYY-MM-DD). Defaults to None.
+        Yields:
+            list: One page of daily indices information.
+        """
+        return NotImplemented
+
     @abstractmethod
     def get_endofday_ohlcv(
         self, instrument: str = None, from_date: str = None, to_date: str = None
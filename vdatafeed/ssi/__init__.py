@@ -1,3 +1,16 @@
 """ SSI Datafeed Module """
 from .api import SSIDatafeedAPI  # noqa: F401
 from .hub import SSIDatafeedHUB  # noqa: F401
+from .columnar import BarColumns  # noqa: F401
+from .adjustment import AdjustmentEngine  # noqa: F401
+from .indicator import IndicatorEngine  # noqa: F401
+from .tape import TickTape  # noqa: F401
+from .trading_calendar import TradingCalendar  # noqa: F401
+from .batch import TradeBatch, QuoteBatch  # noqa: F401
+from .resample import Resampler  # noqa: F401
+from .orderbook import OrderBookStore  # noqa: F401
+from .market import MarketTable  # noqa: F401
+from .panel import Panel, PanelBuilder  # noqa: F401
+from .router import TickRouter  # noqa: F401
+from .backfill import ProcessBackfill  # noqa: F401
+from .codec import TickCodec  # noqa: F401
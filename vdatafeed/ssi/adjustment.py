@@ -0,0 +1,168 @@
+""" Price adjustment for corporate actions, derived from SSI daily stock prices """
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from .columnar import BarColumns, PRICE_FIELDS, parse_dates, parse_floats
+
+# Gap between two symbols in the composite (symbol, date) lookup key, in days
+_SPAN = np.int64(1 << 32)
+
+
+class AdjustmentEngine:
+    """
+    Back-adjusts raw OHLCV bars for splits, bonus issues and dividends.
+
+    The engine learns per-day event ratios from ``InstrumentInfo`` rows: within one
+    response, ``close_adj / close`` only changes across an ex-date, so the ratio of two
+    consecutive factors is the event ratio of the later day. The adjustment factor of
+    a day is the product of every event ratio after it, computed as a segmented
+    reverse cumulative product over all symbols at once.
+
+    Factors are cached per symbol and extended incrementally: feeding newer rows only
+    appends to the cache, and an event in the new rows rescales the cached history by
+    a single scalar instead of recomputing it. When newer rows do not overlap the cached
+    range, the boundary ratio falls back to ``ref`` over the previous ``close``.
+
+    Args:
+        tolerance (float): Ratios closer to 1 than this are treated as rounding noise.
+    """
+    def __init__(self, tolerance: float = 5e-4) -> None:
+        self.tolerance: float = tolerance
+        # symbol -> [dates (datetime64[D]), factors (float64), last close (float)]
+        self.__cache: Dict[str, list] = {}
+        self.__lock = threading.Lock()
+        self.__table = None
+
+    @property
+    def symbols(self) -> list:
+        return sorted(self.__cache)
+
+    def update(self, rows: List) -> None:
+        """
+        Learns event ratios from ``InstrumentInfo`` rows of one or many symbols.
+        Args:
+            rows (list): Daily stock price rows, in any order.
+        """
+        if not rows:
+            return
+        symbol = np.asarray([r.instrument for r in rows], dtype=str)
+        date = parse_dates(r.trading_date for r in rows)
+        close = parse_floats(r.close for r in rows)
+        close_adj = parse_floats(r.close_adj for r in rows)
+        ref = parse_floats(r.ref for r in rows)
+        keep = (close > 0) & (close_adj > 0) & ~np.isnat(date)
+        order = np.lexsort((date[keep], symbol[keep]))
+        symbol, date = symbol[keep][order], date[keep][order]
+        close, ref = close[keep][order], ref[keep][order]
+        factor = close_adj[keep][order] / close
+        if not len(symbol):
+            return
+        start = np.flatnonzero(np.r_[True, symbol[1:] != symbol[:-1]])
+        duplicate = np.r_[False, (symbol[1:] == symbol[:-1]) & (date[1:] == date[:-1])]
+
+        with self.__lock:
+            # event ratio of each day relative to the previous day of the same response
+            ratio = np.ones(len(symbol))
+            ratio[1:] = factor[:-1] / factor[1:]
+            ratio[start] = 1.0
+            ratio[duplicate] = 1.0
+            fresh = ~duplicate
+            for s in start:
+                cached = self.__cache.get(symbol[s])
+                if cached is None:
+                    continue
+                stop = self.__segment_end(start, s, len(symbol))
+                old = date[s:stop] <= cached[0][-1]
+                fresh[s:stop] &= ~old
+                first = s + int(np.argmax(~old)) if not old.all() else stop
+                if first == stop:
+                    continue
+                if first > s and date[first - 1] == cached[0][-1]:
+                    pass  # overlap with the cache: the in-response ratio is exact
+                elif ref[first] > 0 and cached[2] > 0:
+                    ratio[first] = ref[first] / cached[2]
+                else:
+                    ratio[first] = 1.0
+            ratio[np.abs(ratio - 1.0) < self.tolerance] = 1.0
+
+            # segmented reverse cumulative product: product of the ratios after each day
+            log = np.where(fresh, np.log(ratio), 0.0)
+            csum = np.cumsum(log)
+            seg_id = np.cumsum(np.r_[True, symbol[1:] != symbol[:-1]]) - 1
+            seg_total = np.add.reduceat(log, start)
+            seg_before = csum[start] - log[start]
+            after = seg_total[seg_id] - (csum - seg_before[seg_id])
+            for n, s in enumerate(start):
+                stop = self.__segment_end(start, s, len(symbol))
+                mask = fresh[s:stop]
+                if not mask.any():
+                    continue
+                dates = date[s:stop][mask]
+                factors = np.exp(after[s:stop][mask])
+                cached = self.__cache.get(symbol[s])
+                if cached is None:
+                    self.__cache[symbol[s]] = [dates, factors, close[s:stop][mask][-1]]
+                else:
+                    cached[1] = np.concatenate([cached[1] * np.exp(seg_total[n]), factors])
+                    cached[0] = np.concatenate([cached[0], dates])
+                    cached[2] = close[s:stop][mask][-1]
+            self.__table = None
+
+    def factors(self, symbol: str, dates) -> np.ndarray:
+        """
+        Returns the adjustment factor of ``symbol`` on each of ``dates``.
+        Days after the last known day get 1; days before the first known day get
+        the factor of the first known day.
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        return self.__lookup(np.full(len(dates), str(symbol)), dates)
+
+    def adjust(self, bars: BarColumns) -> BarColumns:
+        """
+        Returns adjusted copies of bars of any number of symbols: prices are
+        multiplied by the factor of their day and volumes divided by it.
+        Symbols without known events are returned unchanged.
+        """
+        factor = self.__lookup(bars.symbol, bars.date)
+        columns = bars.to_dict()
+        for name in PRICE_FIELDS:
+            columns[name] = columns[name] * factor
+        columns["vol"] = columns["vol"] / factor
+        return BarColumns(**columns)
+
+    @staticmethod
+    def __segment_end(start: np.ndarray, s: int, size: int) -> int:
+        n = int(np.searchsorted(start, s, side="right"))
+        return int(start[n]) if n < len(start) else size
+
+    def __lookup(self, symbol: np.ndarray, date: np.ndarray) -> np.ndarray:
+        with self.__lock:
+            if self.__table is None:
+                names = np.asarray(sorted(self.__cache), dtype=str)
+                keys, factors, first = [], [], []
+                offset = 0
+                for code, name in enumerate(names):
+                    dates, values, _ = self.__cache[name]
+                    keys.append(np.int64(code) * _SPAN + dates.astype(np.int64))
+                    factors.append(values)
+                    first.append(offset)
+                    offset += len(values)
+                self.__table = (
+                    names,
+                    np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64),
+                    np.concatenate(factors) if factors else np.zeros(0),
+                    np.asarray(first, dtype=np.int64),
+                )
+            names, keys, factors, first = self.__table
+        result = np.ones(len(symbol))
+        if not len(names) or not len(symbol):
+            return result
+        code = np.searchsorted(names, symbol)
+        known = (code < len(names)) & (names[np.minimum(code, len(names) - 1)] == symbol)
+        known &= ~np.isnat(date)
+        code = code[known]
+        pos = np.searchsorted(keys, code * _SPAN + date[known].astype(np.int64), side="right") - 1
+        result[known] = factors[np.maximum(pos, first[code])]
+        return result
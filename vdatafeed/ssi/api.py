@@ -1,11 +1,18 @@
 """ SSI Datafeed API """
-import os
+import contextvars
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Iterator
 
 from ..interface_datafeed_api import IDatafeedAPI
 
 from ..config import Config
-from ..utils import jwt_handler, request_handler
+from ..enum_output import EnumOutput
+from ..utils import (
+    jwt_handler, request_handler, list_adapter, normalize_key, select, Credential,
+    CredentialPool, RateLimiter, RequestScheduler, ResponseCache, TokenStore, ValidationError
+)
 
 from .constant import (
     API_URL,
@@ -25,7 +32,9 @@ from .model import (
     InstrumentInfo,
     IndicesInfo,
     EndOfDayOHLC,
-    IntradayOHLC
+    IntradayOHLC,
+    TYPED_MODELS,
+    blank_to_none
 )
 
 
@@ -44,9 +53,19 @@ class SSIDatafeedAPI(IDatafeedAPI):
         url_index_component (str): The URL for retrieving the components of an index.
         url_daily_stock_price (str): The URL for retrieving daily stock price data.
         __headers (dict): The headers for the API requests.
-        __token (str): The access token for authentication.
-        wait (int): The wait time in seconds before sending a request.
+        wait (int): The minimum time in seconds between two requests.
+        limiter (RateLimiter): The limiter of the main credential (the first of the
+                               pool), shared by every request sent with it, including
+                               from worker threads.
+        pool (CredentialPool): The credentials requests are spread across; holds only
+                               the main credential unless ``Config.credentials`` is set.
+        cache (ResponseCache): The response cache, None unless enabled in the config.
+        scheduler (RequestScheduler): The request scheduler (priorities, merging of
+                                      identical in-flight requests), None unless
+                                      enabled in the config.
         exchange (list): The list of exchanges.
+        calendar (TradingCalendar): When set, history requests over ranges known to hold
+                                    no trading day return None without being sent.
     Methods:
         get_token: Retrieves the access token for authentication.
         get_instruments: Retrieves the list of instruments.
@@ -68,42 +87,84 @@ class SSIDatafeedAPI(IDatafeedAPI):
         self.url_daily_index: str = "/".join([API_URL, ENDPOINT_DAILY_INDEX])
         self.__headers: dict = {
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate"
         }
-        self.__token: str = None
-        self.__session_file: str = "vdatafeed.session"
-        self.wait: int = 1  # wait 1 second before sending request
+        self.wait: int = 1  # wait 1 second between requests per credential
+        self.limiter: RateLimiter = RateLimiter(interval=self.wait)
+        credentials = [Credential(
+            config.ssi_datafeed_id, config.ssi_datafeed_secret,
+            TokenStore(config.session_file), self.limiter
+        )]
+        for consumer_id, consumer_secret in config.credentials:
+            if consumer_id == config.ssi_datafeed_id:
+                continue
+            credentials.append(Credential(
+                consumer_id, consumer_secret, TokenStore(f"{config.session_file}.{consumer_id}"),
+                RateLimiter(interval=self.wait)
+            ))
+        if config.ssi_datafeed_id is None and len(credentials) > 1:
+            credentials.pop(0)
+        self.pool: CredentialPool = CredentialPool(
+            credentials, strategy=config.credential_strategy, cooldown=config.credential_cooldown
+        )
+        # the first credential of the pool is the main one, even when it came from
+        # ``Config.credentials`` because ``ssi_datafeed_id`` is unset
+        self.limiter = self.pool.credentials[0].limiter
+        self.cache: ResponseCache = None
+        if config.cache_size or config.cache_dir:
+            self.cache = ResponseCache(
+                maxsize=config.cache_size or 1024, directory=config.cache_dir
+            )
+        self.scheduler: RequestScheduler = None
+        if config.scheduler_workers:
+            # with several credentials each request waits for the budget of its own
+            self.scheduler = RequestScheduler(
+                limiter=self.limiter if len(self.pool) == 1 else None,
+                workers=config.scheduler_workers
+            )
         self.exchange: list = ["HOSE", "HNX", "UPCOM"]
+        self.calendar = None
 
-    def get_token(self) -> str:
+    def get_token(self, credential: Credential = None) -> str:
         """
         Retrieves the access token for authentication.
+        Args:
+            credential (Credential, optional): The credential of the token. Defaults to
+                                               the main credential.
         Returns:
             str: The access token.
         """
-        if os.path.exists(self.__session_file):
-            with open(self.__session_file, "r") as file:
-                self.__token = file.read().strip()
+        credential = credential or self.pool.credentials[0]
+        if not jwt_handler.is_expired(bearer_token=credential.token):
+            return credential.token
+        credential.token = credential.store.get(
+            lambda token: jwt_handler.is_expired(bearer_token=token),
+            lambda: self.__refresh_token(credential)
+        )
+        return credential.token
 
-        if jwt_handler.is_expired(bearer_token=self.__token):
-            data: dict = {}
-            data.update(
-                consumerID=self.config.ssi_datafeed_id,
-                consumerSecret=self.config.ssi_datafeed_secret
-            )
-            res = request_handler.post(
-                url=self.url_auth, headers=self.__headers, data=data, limit=self.wait
-            )
-            if res.get("status") == 200:
-                access_token = " ".join(["Bearer", res.get("data").get("accessToken")])
-                print(access_token)
-                with open(self.__session_file, "w") as file:
-                    file.write(access_token)
-            else:
-                access_token = None
-                print(f"[vDatafeed] Failed to get access token.: {res}")
-            self.__token = access_token
-        return self.__token
+    def __refresh_token(self, credential: Credential) -> str:
+        """
+        Requests a new access token; called by one process at a time.
+        Returns:
+            str: The access token, None on failure.
+        """
+        data: dict = {}
+        data.update(
+            consumerID=credential.consumer_id,
+            consumerSecret=credential.consumer_secret
+        )
+        res = request_handler.post(
+            url=self.url_auth, headers=self.__headers, data=data, limiter=credential.limiter
+        )
+        if res.get("status") == 200:
+            access_token = " ".join(["Bearer", res.get("data").get("accessToken")])
+            print(access_token)
+        else:
+            access_token = None
+            print(f"[vDatafeed] Failed to get access token.: {res}")
+        return access_token
 
     def get_instruments(self, exchange: str = None) -> dict:
         """
@@ -113,28 +174,13 @@ class SSIDatafeedAPI(IDatafeedAPI):
         Returns:
             dict: The list of instruments.
         """
-        exchange = [exchange] or self.exchange
-        self.__headers.update({"Authorization": self.get_token()})
-        data: list = []
-        for e in exchange:
-            total_element: int = 0
-            params: dict = {
-                "Market": e,
-                "PageIndex": 1,
-                "PageSize": 1000
-            }
-            while True:
-                res = request_handler.get(
-                    url=self.url_securities_detail, headers=self.__headers,
-                    params=params, limit=self.wait
-                )
-                if res.get("data"):
-                    data += res.get("data")[0].get("RepeatedInfo")
-                    total_element += len(res.get("data")[0].get("RepeatedInfo"))
-                params.update(PageIndex=params.get("PageIndex") + 1)
-                if total_element == res.get("totalRecord"):
-                    break
-        return [SecuritiesInfo(**i) for i in data]
+        exchange = [exchange] if exchange else self.exchange
+        queries = [{"Market": e, "PageIndex": 1, "PageSize": 1000} for e in exchange]
+        pages = self.__iter_pages(
+            self.url_securities_detail, queries, SecuritiesInfo,
+            page_key="PageIndex", path=("data", "RepeatedInfo")
+        )
+        return [i for page in pages for i in page]
 
     def get_instrument_details(self, instrument: str = None) -> dict:
         """
@@ -144,15 +190,12 @@ class SSIDatafeedAPI(IDatafeedAPI):
         Returns:
             dict: The details of the instrument.
         """
-        self.__headers.update({"Authorization": self.get_token()})
         params: dict = {
             "Symbol": instrument
         }
-        res = request_handler.get(
-            url=self.url_securities_detail, headers=self.__headers, params=params, limit=self.wait
-        )
+        res = self.__get(self.url_securities_detail, params)
         if res.get("data"):
-            return SecuritiesInfo(**res.get("data")[0].get("RepeatedInfo")[0])
+            return self.__build(SecuritiesInfo, res.get("data")[0].get("RepeatedInfo")[:1])[0]
         return None
 
     def get_indices(self, exchange: str = None) -> list:
@@ -164,8 +207,7 @@ class SSIDatafeedAPI(IDatafeedAPI):
             dict: The list of indices.
         """
         # ENDPOINT_INDEX
-        self.__headers.update({"Authorization": self.get_token()})
-        exchange = [exchange] or self.exchange
+        exchange = [exchange] if exchange else self.exchange
         list_index: list = []
         for e in exchange:
             params: dict = {
@@ -173,12 +215,10 @@ class SSIDatafeedAPI(IDatafeedAPI):
                 "PageIndex": 1,
                 "PageSize": 1000
             }
-            res = request_handler.get(
-                url=self.url_index_list, headers=self.__headers, params=params, limit=self.wait
-            )
+            res = self.__get(self.url_index_list, params)
             if res.get("data"):
                 list_index += res.get("data")
-        return [IndexInfo(**i) for i in list_index] or None
+        return self.__build(IndexInfo, list_index) or None
 
     def get_indices_instruments(self, index: str = None) -> list:
         """
@@ -188,80 +228,70 @@ class SSIDatafeedAPI(IDatafeedAPI):
         Returns:
             dict: The list of instruments.
         """
-        self.__headers.update({"Authorization": self.get_token()})
         instruments: list = []
         params: dict = {
             "indexCode": index,
             "pageIndex": 1,
             "pageSize": 1000
         }
-        res = request_handler.get(
-            url=self.url_index_component, headers=self.__headers, params=params, limit=self.wait
-        )
+        res = self.__get(self.url_index_component, params)
         if res.get("data"):
             instruments = [i.get("Isin") for i in res.get("data")[0].get("IndexComponent")]
             return instruments
         return None
 
     def get_daily_instruments_info(
-        self, instrument: str = None, from_date: str = None, to_date: str = None
-    ) -> dict:
+        self, instrument: str = None, from_date: str = None, to_date: str = None,
+        exchange: str = None
+    ) -> list:
         """
         Retrieves the daily information for a specific instrument.
         Args:
             instrument (str, optional): The instrument symbol. Defaults to None.
             from_date (str, optional): The start date. Defaults to None.
             to_date (str, optional): The end date. Defaults to None.
+            exchange (str, optional): Without instrument, the only exchange to walk.
+                                      Defaults to None (every exchange).
         Returns:
-            dict: The daily information.
+            list: The daily information.
         """
-        if from_date:
-            from_date = datetime.strptime(from_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-        if to_date:
-            to_date = datetime.strptime(to_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-        self.__headers.update({"Authorization": self.get_token()})
+        return [
+            i for page in self.iter_daily_instruments_info(
+                instrument, from_date, to_date, exchange
+            )
+            for i in page
+        ] or None
+
+    def iter_daily_instruments_info(
+        self, instrument: str = None, from_date: str = None, to_date: str = None,
+        exchange: str = None
+    ) -> Iterator[list]:
+        """
+        Iterates over the daily information page by page, prefetching the next page.
+        Args:
+            instrument (str, optional): The instrument symbol. Defaults to None,
+                                        which walks every symbol of every exchange.
+            from_date (str, optional): The start date. Defaults to None.
+            to_date (str, optional): The end date. Defaults to None.
+            exchange (str, optional): Without instrument, the only exchange to walk.
+                                      Defaults to None (every exchange).
+        Yields:
+            list: One page (at most 1000 rows) of daily information.
+        """
+        if self.__closed(from_date, to_date):
+            return
         params: dict = {
-            "fromDate": from_date,
-            "toDate": to_date,
+            "fromDate": self.__format_date(from_date),
+            "toDate": self.__format_date(to_date),
             "pageSize": 1000,
             "pageIndex": 1
         }
-        data: list = []
         if instrument:
-            total_element: int = 0
-            params.update(symbol=instrument)
-            while True:
-                print(params)
-                res = request_handler.get(
-                    url=self.url_daily_stock_price, headers=self.__headers,
-                    params=params, limit=self.wait
-                )
-                if res.get("data"):
-                    data += res.get("data")
-                    total_element += len(res.get("data"))
-                params.update(pageIndex=params.get("pageIndex") + 1)
-                if total_element == res.get("totalRecord"):
-                    break
+            queries = [dict(params, symbol=instrument)]
         else:
-            for exchange in self.exchange:
-                total_element: int = 0
-                params.update(
-                    pageIndex=1,
-                    market=exchange
-                )
-                while True:
-                    print(params)
-                    res = request_handler.get(
-                        url=self.url_daily_stock_price, headers=self.__headers,
-                        params=params, limit=self.wait
-                    )
-                    if res.get("data"):
-                        data += res.get("data")
-                        total_element += len(res.get("data"))
-                    params.update(pageIndex=params.get("pageIndex") + 1)
-                    if total_element == res.get("totalRecord"):
-                        break
-        return [InstrumentInfo(**i) for i in data] or None
+            exchanges = [exchange] if exchange else self.exchange
+            queries = [dict(params, market=e) for e in exchanges]
+        yield from self.__iter_pages(self.url_daily_stock_price, queries, InstrumentInfo)
 
     def get_daily_indices_info(
         self, index: str, from_date: str = None, to_date: str = None
@@ -269,38 +299,40 @@ class SSIDatafeedAPI(IDatafeedAPI):
         """
         Retrieves the daily information for a specific index.
         Args:
-            exchange (str, optional): The exchange name. Defaults to None.
+            index (str): The index code.
             from_date (str, optional): The start date. Defaults to None.
             to_date (str, optional): The end date. Defaults to None.
         Returns:
-            dict: The daily information.
+            list: The daily information.
         """
-        if from_date:
-            from_date = datetime.strptime(from_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-        if to_date:
-            to_date = datetime.strptime(to_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-        self.__headers.update({"Authorization": self.get_token()})
+        return [
+            i for page in self.iter_daily_indices_info(index, from_date, to_date)
+            for i in page
+        ] or None
+
+    def iter_daily_indices_info(
+        self, index: str, from_date: str = None, to_date: str = None
+    ) -> Iterator[list]:
+        """
+        Iterates over the daily information of an index page by page,
+        prefetching the next page.
+        Args:
+            index (str): The index code.
+            from_date (str, optional): The start date. Defaults to None.
+            to_date (str, optional): The end date. Defaults to None.
+        Yields:
+            list: One page (at most 1000 rows) of daily index information.
+        """
+        if self.__closed(from_date, to_date):
+            return
         params: dict = {
             "IndexId": index,
-            "fromDate": from_date,
-            "toDate": to_date,
+            "fromDate": self.__format_date(from_date),
+            "toDate": self.__format_date(to_date),
             "pageSize": 1000,
             "pageIndex": 1
         }
-        data: list = []
-        total_element: int = 0
-        while True:
-            res = request_handler.get(
-                url=self.url_daily_index, headers=self.__headers,
-                params=params, limit=self.wait
-            )
-            if res.get("data"):
-                data += res.get("data")
-                total_element += len(res.get("data"))
-            params.update(pageIndex=params.get("pageIndex") + 1)
-            if total_element == res.get("totalRecord"):
-                break
-        return [IndicesInfo(**i) for i in data] or None
+        yield from self.__iter_pages(self.url_daily_index, [params], IndicesInfo)
 
     def get_endofday_ohlcv(
         self, instrument: str = None, from_date: str = None, to_date: str = None
@@ -314,11 +346,12 @@ class SSIDatafeedAPI(IDatafeedAPI):
         Returns:
             dict: The end-of-day OHLC data.
         """
+        if self.__closed(from_date, to_date):
+            return None
         if from_date:
             from_date = datetime.strptime(from_date, "%Y-%m-%d").strftime("%d/%m/%Y")
         if to_date:
             to_date = datetime.strptime(to_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-        self.__headers.update({"Authorization": self.get_token()})
         params: dict = {
             "Symbol": instrument,
             "FromDate": from_date,
@@ -326,13 +359,11 @@ class SSIDatafeedAPI(IDatafeedAPI):
             "PageSize": 1000,
             "PageIndex": 1
         }
-        res = request_handler.get(
-            url=self.url_endofday_ohlc, headers=self.__headers, params=params, limit=self.wait
-        )
+        res = self.__get(self.url_endofday_ohlc, params)
         data: list = []
         if res.get("data"):
             data = res.get("data")
-        return [EndOfDayOHLC(**i) for i in data] or None
+        return self.__build(EndOfDayOHLC, data) or None
 
     def get_intraday_ohlcv(
         self, instrument: str = None, from_date: str = None, to_date: str = None
@@ -346,11 +377,12 @@ class SSIDatafeedAPI(IDatafeedAPI):
         Returns:
             dict: The intraday OHLC data.
         """
+        if self.__closed(from_date, to_date):
+            return None
         if from_date:
             from_date = datetime.strptime(from_date, "%Y-%m-%d").strftime("%d/%m/%Y")
         if to_date:
             to_date = datetime.strptime(to_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-        self.__headers.update({"Authorization": self.get_token()})
         params: dict = {
             "Symbol": instrument,
             "FromDate": from_date,
@@ -358,10 +390,191 @@ class SSIDatafeedAPI(IDatafeedAPI):
             "PageSize": 1000,
             "PageIndex": 1
         }
-        res = request_handler.get(
-            url=self.url_intraday_ohlc, headers=self.__headers, params=params, limit=self.wait
-        )
+        res = self.__get(self.url_intraday_ohlc, params)
         data: list = []
         if res.get("data"):
             data = res.get("data")
-        return [IntradayOHLC(**i) for i in data] or None
+        return self.__build(IntradayOHLC, data) or None
+
+    def __format_date(self, date: str) -> str:
+        """
+        Converts a YYYY-MM-DD date into the DD/MM/YYYY format expected by the API.
+        """
+        if date:
+            return datetime.strptime(date, "%Y-%m-%d").strftime("%d/%m/%Y")
+        return date
+
+    def __get(self, url: str, params: dict) -> dict:
+        """
+        Sends an authenticated GET request to the API.
+        Args:
+            url (str): The endpoint URL.
+            params (dict): The query parameters.
+        Returns:
+            dict: The decoded response.
+        """
+        # before choosing a credential: a hit costs no token and no rate budget
+        if self.cache:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                return cached
+
+        def send():
+            return self.__send(
+                lambda headers, limiter: request_handler.get(
+                    url=url, headers=headers, params=params, limiter=limiter
+                ),
+                limited=self.scheduler is None or self.scheduler.limiter is None
+            )
+        if not self.scheduler:
+            res = send()
+        else:
+            res = self.scheduler.submit(normalize_key(url, params), send).result()
+        if self.cache and res.get("data"):
+            self.cache.put(url, params, res)
+        return res
+
+    def __send(self, send, limited: bool = True):
+        """
+        Sends a request with a credential of the pool. A credential refused with
+        HTTP 429 is put on cooldown and the request is sent again with another one,
+        until every credential has been tried.
+        Args:
+            send (callable): Sends the request, given the headers and the rate limiter.
+            limited (bool): Whether the request waits for the budget of its credential
+                            (False when the scheduler already did).
+        """
+        for attempt in range(len(self.pool)):
+            with self.pool.acquire() as credential:
+                headers = dict(self.__headers, Authorization=self.get_token(credential))
+                try:
+                    return send(headers, credential.limiter if limited else None)
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 429:
+                        raise
+                    retry_after = e.response.headers.get("Retry-After", "")
+                    self.pool.throttle(
+                        credential, float(retry_after) if retry_after.isdigit() else None
+                    )
+                    if attempt == len(self.pool) - 1:
+                        raise
+
+    def fetch_raw(self, url: str, params: dict) -> bytes:
+        """
+        Sends an authenticated GET request and returns the undecoded body, e.g. to
+        parse it in another process. Raw responses bypass the response cache.
+        Args:
+            url (str): The endpoint URL.
+            params (dict): The query parameters.
+        Returns:
+            bytes: The response body.
+        """
+        def send():
+            return self.__send(
+                lambda headers, limiter: request_handler.get_bytes(
+                    url=url, headers=headers, params=params, limiter=limiter
+                ),
+                limited=self.scheduler is None or self.scheduler.limiter is None
+            )
+        if not self.scheduler:
+            return send()
+        return self.scheduler.submit(("raw", normalize_key(url, params)), send).result()
+
+    def __closed(self, from_date: str, to_date: str) -> bool:
+        """
+        Tells whether the calendar (if any) knows the range has no trading day.
+        """
+        return self.calendar is not None and self.calendar.is_closed(from_date, to_date)
+
+    def __iter_pages(
+        self, url: str, queries: list, model,
+        page_key: str = "pageIndex", path: tuple = ("data",)
+    ) -> Iterator[list]:
+        """
+        Walks the pages of every query in order. The next page (or the first page of
+        the next query) is fetched and built in the background while the current page
+        is being consumed, so at most two pages are held in memory at once.
+        Args:
+            url (str): The endpoint URL.
+            queries (list): The query parameters, one dict per paginated query.
+            model: The model used to build each row.
+            page_key (str, optional): The page index parameter. Defaults to "pageIndex".
+            path (tuple, optional): The members leading to the rows in the response.
+                                    Defaults to ("data",).
+        Yields:
+            list: The rows of one page, built with ``model``.
+        """
+        queries = iter(queries)
+        params = next(queries, None)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = None
+            if params:
+                # the copied context carries the scheduler priority of the caller
+                future = executor.submit(
+                    contextvars.copy_context().run,
+                    self.__fetch_page, url, dict(params), model, path
+                )
+            total_element: int = 0
+            while future:
+                page, total_record = future.result()
+                total_element += len(page)
+                if page and total_element < (total_record or 0):
+                    params.update({page_key: params.get(page_key) + 1})
+                else:
+                    params = next(queries, None)
+                    total_element = 0
+                future = None
+                if params:
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self.__fetch_page, url, dict(params), model, path
+                    )
+                if page:
+                    yield page
+
+    def __fetch_page(self, url: str, params: dict, model, path: tuple) -> tuple:
+        """
+        Fetches one page and builds its rows. With ``Config.stream`` the rows are built
+        one by one while the body is being received, instead of after the whole page
+        has been decoded. The body is consumed while its credential is held, so the
+        transfer counts towards the credential's load. Streamed pages go through the
+        scheduler but bypass the response cache, which stores whole decoded pages.
+        Returns:
+            tuple: The built rows and the total number of records reported by the API.
+        """
+        if self.config.stream:
+            def receive(headers: dict, limiter) -> tuple:
+                stream = request_handler.stream(
+                    url=url, headers=headers, params=params, path=path, limiter=limiter
+                )
+                return self.__build(model, stream, batch=False), stream.meta.get("totalRecord")
+            if not self.scheduler:
+                return self.__send(receive)
+            return self.scheduler.submit(
+                ("stream", normalize_key(url, params)),
+                lambda: self.__send(receive, limited=self.scheduler.limiter is None)
+            ).result()
+        res = self.__get(url, params)
+        return self.__build(model, list(select(res, path))), res.get("totalRecord")
+
+    def __build(self, model, rows, batch: bool = True) -> list:
+        """
+        Builds rows according to ``Config.output``: string models (default), typed models
+        or the raw dicts. Models of a page are validated in a single call through a cached
+        list adapter, unless ``batch`` is False (rows are then built one by one, as they
+        are streamed).
+        """
+        if self.config.output == EnumOutput.RAW.value:
+            return list(rows)
+        if self.config.output != EnumOutput.TYPED.value or model not in TYPED_MODELS:
+            if batch:
+                return list_adapter(model).validate_python(rows)
+            return [model.model_validate(i) for i in rows]
+        model = TYPED_MODELS[model]
+        if not batch:
+            return [model.model_validate(blank_to_none(i)) for i in rows]
+        try:
+            return list_adapter(model).validate_python(rows)
+        except ValidationError:
+            # empty strings in numeric fields: clean the page and validate again
+            return list_adapter(model).validate_python([blank_to_none(i) for i in rows])
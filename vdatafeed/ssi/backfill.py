@@ -0,0 +1,178 @@
+""" Historical backfill with response parsing spread over a process pool """
+import re
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import date, timedelta
+from typing import Iterable, List, NamedTuple, Union
+
+import numpy as np
+
+from .columnar import BarColumns, parse_dates, parse_floats, parse_times
+from .model import InstrumentInfo
+
+_TOTAL = re.compile(rb'"totalRecord"\s*:\s*(\d+)')
+
+
+class RawDataset(NamedTuple):
+    """
+    How to query one dataset and which members of its rows to keep.
+    Attributes:
+        url (str): The name of the API attribute holding the endpoint URL.
+        keys (tuple): The symbol, first date, last date, page index and page size parameters.
+        days (int): The default window, in days, of one query.
+        fields (dict): column -> member of the response rows, numbers only.
+        time (str): The member holding the bar time, None for daily rows.
+    """
+    url: str
+    keys: tuple
+    days: int
+    fields: dict
+    time: str = None
+
+
+_OHLC = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "vol": "Volume",
+         "val": "Value"}
+RAW_DATASETS: dict = {
+    "daily": RawDataset(
+        "url_daily_stock_price", ("symbol", "fromDate", "toDate", "pageIndex", "pageSize"), 30,
+        {
+            name: field.validation_alias.choices[-1]
+            for name, field in InstrumentInfo.model_fields.items()
+            if name not in ("instrument", "trading_date")
+        },
+    ),
+    "eod": RawDataset(
+        "url_endofday_ohlc", ("Symbol", "FromDate", "ToDate", "PageIndex", "PageSize"), 30, _OHLC
+    ),
+    "intraday": RawDataset(
+        "url_intraday_ohlc", ("Symbol", "FromDate", "ToDate", "PageIndex", "PageSize"), 3, _OHLC,
+        time="Time"
+    ),
+}
+PAGE_ROWS = 1000
+
+
+def parse_page(dataset: str, body: bytes) -> dict:
+    """
+    Decodes one raw response into compact columns: symbols, datetime64[D] dates, int32
+    times (bars) and float64 numbers. Runs in the worker processes; numpy arrays travel
+    back as flat buffers instead of one object per row.
+    """
+    spec = RAW_DATASETS[dataset]
+    rows = json.loads(body).get("data") or []
+    columns = {
+        "symbol": np.asarray([r.get("Symbol") or "" for r in rows], dtype=str),
+        "date": parse_dates(r.get("TradingDate") for r in rows),
+    }
+    if spec.time:
+        columns["time"] = parse_times(r.get(spec.time) for r in rows)
+    for name, key in spec.fields.items():
+        columns[name] = parse_floats(r.get(key) for r in rows)
+    return columns
+
+
+class ProcessBackfill:
+    """
+    Bulk download where threads only move bytes and processes parse them.
+
+    Queries (one per symbol and date window) are sent from a thread pool, which reads
+    the response bodies without decoding them. Each body goes straight to a process
+    pool that decodes the JSON and builds columns, so parsing runs on every core and
+    overlaps with the requests still in flight instead of holding the GIL between them.
+
+    Args:
+        api: The SSI datafeed API.
+        processes (int, optional): The parsing processes. Defaults to the CPU count.
+        threads (int): The queries in flight. Defaults to 4.
+        calendar (TradingCalendar, optional): Keeps windows on trading days.
+    """
+    def __init__(self, api, processes: int = None, threads: int = 4, calendar=None) -> None:
+        self.api = api
+        self.processes: int = processes
+        self.threads: int = threads
+        self.calendar = calendar
+
+    def windows(self, from_date: str, to_date: str, days: int) -> List[tuple]:
+        """
+        Splits an inclusive YYYY-MM-DD range into windows of at most ``days`` days.
+        """
+        if self.calendar is not None:
+            return list(self.calendar.split(from_date, to_date, days))
+        start, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+        windows = []
+        while start <= end:
+            last = min(start + timedelta(days=days - 1), end)
+            windows.append((start.isoformat(), last.isoformat()))
+            start = last + timedelta(days=1)
+        return windows
+
+    def __query(self, pool, dataset: str, symbol: str, from_date: str, to_date: str) -> list:
+        """
+        Fetches every page of one query, handing each body to the process pool.
+        Returns:
+            list: The parsing futures, one per page.
+        """
+        spec = RAW_DATASETS[dataset]
+        symbol_key, from_key, to_key, page_key, size_key = spec.keys
+        params = {
+            symbol_key: symbol,
+            from_key: date.fromisoformat(from_date).strftime("%d/%m/%Y"),
+            to_key: date.fromisoformat(to_date).strftime("%d/%m/%Y"),
+            page_key: 1,
+            size_key: PAGE_ROWS,
+        }
+        url = getattr(self.api, spec.url)
+        scheduler = getattr(self.api, "scheduler", None)
+        with scheduler.priority(scheduler.BATCH) if scheduler else nullcontext():
+            body = self.api.fetch_raw(url, params)
+            futures = [pool.submit(parse_page, dataset, body)]
+            # the record count is read from the bytes: no need to wait for the parse
+            total = _TOTAL.search(body)
+            pages = math.ceil(int(total.group(1)) / PAGE_ROWS) if total else 1
+            for page in range(2, pages + 1):
+                body = self.api.fetch_raw(url, dict(params, **{page_key: page}))
+                futures.append(pool.submit(parse_page, dataset, body))
+        return futures
+
+    def run(
+        self, dataset: str, symbols: Iterable[str], from_date: str, to_date: str,
+        days: int = None
+    ) -> Union[BarColumns, dict]:
+        """
+        Downloads a dataset for several symbols over a range.
+        Args:
+            dataset (str): "daily", "eod" or "intraday".
+            symbols (Iterable[str]): The symbols.
+            from_date (str): The first date (YYYY-MM-DD).
+            to_date (str): The last date (YYYY-MM-DD).
+            days (int, optional): The window of one query. Defaults to the dataset's.
+        Returns:
+            BarColumns for "eod" and "intraday"; for "daily", a dict of arrays keyed by
+            ``InstrumentInfo`` field, with "symbol" and "date".
+        """
+        if dataset not in RAW_DATASETS:
+            raise ValueError(f"Unknown dataset {dataset!r}, expected one of {list(RAW_DATASETS)}")
+        windows = self.windows(from_date, to_date, days or RAW_DATASETS[dataset].days)
+        queries = [(s, a, b) for s in symbols for a, b in windows]
+        parts: list = []
+        # spawn: forking now would copy the API's scheduler and prefetch threads
+        # mid-flight, which can deadlock the children
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.processes, mp_context=context) as pool, \
+                ThreadPoolExecutor(self.threads) as executor:
+            fetches = [executor.submit(self.__query, pool, dataset, *q) for q in queries]
+            pages = [page for fetch in as_completed(fetches) for page in fetch.result()]
+            for page in pages:
+                parts.append(page.result())
+        print(f"[vDatafeed] Backfill {dataset}: {len(queries)} queries, {len(pages)} pages")
+        if not parts:
+            columns = parse_page(dataset, b"{}")
+        else:
+            columns = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        if dataset == "daily":
+            order = np.lexsort((columns["date"], columns["symbol"]))
+            return {k: v[order] for k, v in columns.items()}
+        return BarColumns(**columns).sort()
@@ -0,0 +1,151 @@
+""" Columnar batches of live hub updates """
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+from .columnar import BarColumns, parse_dates, parse_floats, parse_times
+
+LEVELS = 10
+
+
+def _symbols(messages: List[dict]) -> np.ndarray:
+    return np.asarray([m.get("Symbol") or m.get("symbol") for m in messages], dtype=str)
+
+
+def _floats(messages: List[dict], key: str) -> np.ndarray:
+    values = [m.get(key) for m in messages]
+    try:
+        return np.array(values, dtype=np.float64)  # numbers and None (NaN)
+    except (TypeError, ValueError):
+        return parse_floats(values)  # empty strings
+
+
+def _timestamps(messages: List[dict]) -> np.ndarray:
+    # exchange time, datetime64[s]; NaT when the update has no date. The updates of a
+    # frame share a handful of (date, time) pairs, each converted once.
+    seen: dict = {}
+    keys = [(m.get("TradingDate"), m.get("Time")) for m in messages]
+    for key in keys:
+        if key not in seen:
+            seen[key] = len(seen)
+    unique = list(seen)
+    converted = parse_dates(k[0] for k in unique).astype("datetime64[s]") + parse_times(
+        k[1] for k in unique
+    ).astype("timedelta64[s]")
+    return converted[[seen[key] for key in keys]]
+
+
+def _levels(messages: List[dict], key: str) -> np.ndarray:
+    return np.array(
+        [[m.get(f"{key}{i}") for i in range(1, LEVELS + 1)] for m in messages],
+        dtype=np.float64
+    ).reshape(len(messages), LEVELS)
+
+
+class TradeBatch:
+    """
+    Trades received in one frame (or batching window), one array per field.
+    Attributes:
+        symbol (np.ndarray): The symbols (str).
+        timestamp (np.ndarray): The trade times, exchange time (datetime64[s]).
+        price (np.ndarray): The last prices (float64).
+        vol (np.ndarray): The last volumes (float64).
+        total_vol (np.ndarray): The cumulative volumes (float64).
+        total_val (np.ndarray): The cumulative values (float64).
+        ceiling (np.ndarray): The ceiling prices (float64).
+        floor (np.ndarray): The floor prices (float64).
+        ref_price (np.ndarray): The reference prices (float64).
+    """
+    fields = (
+        "symbol", "timestamp", "price", "vol", "total_vol", "total_val",
+        "ceiling", "floor", "ref_price"
+    )
+    keys = {
+        "price": "LastPrice", "vol": "LastVol", "total_vol": "TotalVol",
+        "total_val": "TotalVal", "ceiling": "Ceiling", "floor": "Floor", "ref_price": "RefPrice",
+    }
+
+    def __init__(self, **columns) -> None:
+        for name in self.fields:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def from_messages(cls, messages: List[dict]) -> "TradeBatch":
+        """
+        Builds the batch from decoded hub contents, without a model per update.
+        """
+        columns = {k: _floats(messages, key) for k, key in cls.keys.items()}
+        return cls(symbol=_symbols(messages), timestamp=_timestamps(messages), **columns)
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def to_dict(self) -> dict:
+        return {f: getattr(self, f) for f in self.fields}
+
+
+class QuoteBatch:
+    """
+    Quotes received in one frame (or batching window), one array per field.
+    Book levels are (n, 10) arrays, best level first.
+    Attributes:
+        symbol (np.ndarray): The symbols (str).
+        timestamp (np.ndarray): The quote times, exchange time (datetime64[s]).
+        ceiling (np.ndarray): The ceiling prices (float64).
+        floor (np.ndarray): The floor prices (float64).
+        ref_price (np.ndarray): The reference prices (float64).
+        bid_price (np.ndarray): The bid prices, BidPrice1 first (float64, n x 10).
+        bid_vol (np.ndarray): The bid volumes (float64, n x 10).
+        ask_price (np.ndarray): The ask prices, AskPrice1 first (float64, n x 10).
+        ask_vol (np.ndarray): The ask volumes (float64, n x 10).
+    """
+    fields = (
+        "symbol", "timestamp", "ceiling", "floor", "ref_price",
+        "bid_price", "bid_vol", "ask_price", "ask_vol"
+    )
+    keys = {"ceiling": "Ceiling", "floor": "Floor", "ref_price": "RefPrice"}
+    level_keys = {
+        "bid_price": "BidPrice", "bid_vol": "BidVol", "ask_price": "AskPrice", "ask_vol": "AskVol",
+    }
+
+    def __init__(self, **columns) -> None:
+        for name in self.fields:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def from_messages(cls, messages: List[dict]) -> "QuoteBatch":
+        """
+        Builds the batch from decoded hub contents, without a model per update.
+        """
+        columns = {k: _floats(messages, key) for k, key in cls.keys.items()}
+        columns.update({k: _levels(messages, key) for k, key in cls.level_keys.items()})
+        return cls(symbol=_symbols(messages), timestamp=_timestamps(messages), **columns)
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def to_dict(self) -> dict:
+        return {f: getattr(self, f) for f in self.fields}
+
+
+class GapFill:
+    """
+    Intraday bars recovered after a reconnection, covering the updates the hub sent
+    while no connection was up. Delivered once per outage, separately from live updates.
+    Attributes:
+        start (datetime): The time of the last frame received before the outage.
+        end (datetime): The time the hub was subscribed again.
+        bars (BarColumns): The 1-minute bars overlapping the outage, for every symbol.
+        failed (list): The symbols whose bars could not be fetched.
+    """
+    def __init__(
+        self, start: datetime, end: datetime, bars: BarColumns, failed: List[str] = ()
+    ) -> None:
+        self.start: datetime = start
+        self.end: datetime = end
+        self.bars: BarColumns = bars
+        self.failed: List[str] = list(failed)
+
+    def __len__(self) -> int:
+        return len(self.bars)
@@ -0,0 +1,170 @@
+""" Compact fixed-point encoding of live prices, volumes and symbols """
+import math
+from typing import Iterable
+
+import numpy as np
+
+from .columnar import grow_rows, parse_floats
+from ..utils import SymbolTable
+
+PRICE_DTYPE = np.int32  # price in ticks of the symbol; 0 means no price
+VOLUME_DTYPE = np.uint32
+TIME_DTYPE = np.uint32  # seconds since the epoch, exchange time
+_VOLUME_MAX = int(np.iinfo(VOLUME_DTYPE).max)
+
+
+class TickCodec:
+    """
+    Opt-in compact encoding of the tick stores, ``TickTape`` and ``OrderBookStore``.
+
+    * Symbols are interned once into dense ids (``symbols``): every store built with
+      the same codec indexes its arrays by the same ids, and the hub hands out one
+      shared string object per symbol instead of a new one per message. This is all
+      the hub, ``MarketTable``, ``IndicatorEngine`` and ``TickRouter`` use: ticks and
+      batches keep decimal (float64) prices and volumes, and so do those stores.
+    * In the tick stores, prices are integers counting the price unit of their symbol,
+      the greatest common divisor of its tick increments
+      (``SecuritiesInfo.tick_increment_*``), e.g. 10 on HOSE where the increments are
+      10, 50 and 100: exact, and 4 bytes instead of 8. Symbols without tick sizes use
+      ``unit``.
+    * Volumes are unsigned 32-bit integers, timestamps 32-bit epoch seconds.
+
+    This is a memory/speed trade-off, not a free saving: the tick stores take about half
+    the memory, but each update pays for the encoding and runs about 2 to 3x slower
+    than with float64 arrays (``benchmarks/bench_codec.py``). Prefer it when memory
+    bounds the number of symbols or the depth of history kept.
+
+    Args:
+        securities (Iterable, optional): ``SecuritiesInfo`` rows (string or typed models)
+                                         giving the tick increments of each symbol.
+        unit (float): The price unit of symbols without tick sizes. Defaults to 1.
+        scale (float): Divides the tick increments into the unit of the encoded prices,
+                       e.g. 1000 for increments in dong and prices in thousands of dong.
+                       Defaults to 1.
+    """
+    def __init__(self, securities: Iterable = (), unit: float = 1, scale: float = 1) -> None:
+        self.symbols: SymbolTable = SymbolTable()
+        self.unit: float = unit
+        self.scale: float = scale
+        self.__units = np.zeros(0)  # per symbol id; 0 means ``unit``
+        self.load(securities)
+
+    def load(self, securities: Iterable) -> None:
+        """
+        Sets the price unit of every security from its tick increments.
+        """
+        for security in securities or ():
+            increments = parse_floats(
+                getattr(security, f"tick_increment_{i}", None) for i in (1, 2, 3)
+            )
+            increments = increments[increments > 0] / self.scale
+            if len(increments) and security.instrument:
+                self.set_unit(security.instrument, self.__gcd(increments))
+
+    @staticmethod
+    def __gcd(values: np.ndarray) -> float:
+        # increments like 0.1 or 10: find the common divisor on an integer grid
+        scale = 1
+        while scale < 10 ** 6 and not np.allclose(values * scale, np.round(values * scale)):
+            scale *= 10
+        return math.gcd(*np.round(values * scale).astype(np.int64).tolist()) / scale
+
+    def set_unit(self, symbol: str, unit: float) -> None:
+        sid = self.id(symbol)
+        self.__units[sid] = unit
+
+    def __reserve(self) -> None:
+        # stores assign ids through ``symbols`` directly: catch up before any lookup
+        rows = len(self.symbols)
+        if rows > len(self.__units):
+            self.__units = grow_rows(self.__units, max(2 * len(self.__units), rows, 64))
+
+    def id(self, symbol: str) -> int:
+        """
+        Returns the id of ``symbol``, assigning one on first sight.
+        """
+        sid = self.symbols.id(symbol)
+        self.__reserve()
+        return sid
+
+    def intern(self, symbol: str) -> str:
+        """
+        Returns the shared string object of ``symbol``.
+        """
+        return self.symbols.name(self.id(symbol))
+
+    def units(self, sids) -> np.ndarray:
+        """
+        Returns the price unit of one symbol id or of an array of ids.
+        """
+        self.__reserve()
+        units = self.__units[sids]
+        return np.where(units > 0, units, self.unit)
+
+    def unit_of(self, sid: int) -> float:
+        self.__reserve()
+        unit = self.__units[sid]
+        return float(unit) if unit > 0 else self.unit
+
+    def encode_price(self, sid: int, price) -> int:
+        """
+        Scalar ``encode_prices``, for one update at a time.
+        """
+        if price is None or price != price:
+            return 0
+        return round(price / self.unit_of(sid))
+
+    def encode_prices(self, sids, prices) -> np.ndarray:
+        """
+        Converts prices into ticks of their symbols; missing prices (None, NaN) become 0.
+        ``sids`` is one id or an array broadcasting against ``prices``.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            ticks = np.rint(np.nan_to_num(prices) / self.units(sids))
+        return ticks.astype(PRICE_DTYPE)
+
+    def decode_prices(self, sids, ticks) -> np.ndarray:
+        """
+        Converts ticks back into decimal prices (float64); 0 stays 0.
+        """
+        return np.asarray(ticks, dtype=np.float64) * self.units(sids)
+
+    @staticmethod
+    def encode_volume(volume) -> int:
+        if volume is None or volume != volume:
+            return 0
+        return min(max(round(volume), 0), _VOLUME_MAX)
+
+    @staticmethod
+    def encode_volumes(volumes) -> np.ndarray:
+        """
+        Converts volumes into unsigned 32-bit integers; missing volumes become 0.
+        """
+        volumes = np.nan_to_num(np.asarray(volumes, dtype=np.float64))
+        return np.clip(np.rint(volumes), 0, _VOLUME_MAX).astype(VOLUME_DTYPE)
+
+    @staticmethod
+    def encode_time(timestamp: np.datetime64) -> int:
+        timestamp = np.datetime64(timestamp, "s")
+        return 0 if np.isnat(timestamp) else int(timestamp.astype(np.int64))
+
+    @staticmethod
+    def encode_times(timestamps) -> np.ndarray:
+        """
+        Converts datetime64 values (or anything ``np.datetime64`` accepts) into epoch
+        seconds; NaT becomes 0.
+        """
+        seconds = np.asarray(timestamps, dtype="datetime64[s]")
+        valid = ~np.isnat(seconds)
+        return np.where(valid, seconds.astype(np.int64), 0).astype(TIME_DTYPE)
+
+    @staticmethod
+    def decode_times(seconds) -> np.ndarray:
+        """
+        Converts epoch seconds back into datetime64[s]; 0 becomes NaT.
+        """
+        seconds = np.asarray(seconds, dtype=np.int64)
+        return np.where(
+            seconds > 0, seconds.astype("datetime64[s]"), np.datetime64("NaT", "s")
+        )
@@ -0,0 +1,142 @@
+""" Columnar containers for SSI bar data """
+from datetime import date, time
+from typing import Iterable, List
+
+import numpy as np
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+
+def parse_dates(values: Iterable[str]) -> np.ndarray:
+    """
+    Converts DD/MM/YYYY (API) or YYYY-MM-DD dates, or dates, into a datetime64[D] array.
+    """
+    iso = []
+    for v in values:
+        if not v:
+            iso.append("NaT")
+        elif isinstance(v, date):
+            iso.append(v.isoformat())
+        elif v[2] == "/":
+            iso.append("-".join([v[6:10], v[3:5], v[0:2]]))
+        else:
+            iso.append(v[:10])
+    return np.array(iso, dtype="datetime64[D]")
+
+
+def parse_times(values: Iterable[str]) -> np.ndarray:
+    """
+    Converts HH:MM:SS times, or times, into seconds since midnight (int32);
+    missing times are 0.
+    """
+    return np.array(
+        [
+            v.hour * 3600 + v.minute * 60 + v.second if isinstance(v, time)
+            else int(v[0:2]) * 3600 + int(v[3:5]) * 60 + int(v[6:8]) if v else 0
+            for v in values
+        ],
+        dtype=np.int32
+    )
+
+
+def parse_floats(values: Iterable) -> np.ndarray:
+    """
+    Converts numeric strings into a float64 array; missing values become NaN.
+    """
+    return np.array(
+        [float(v) if v not in (None, "") else np.nan for v in values], dtype=np.float64
+    )
+
+
+def grow_rows(array: np.ndarray, rows: int, fill=0) -> np.ndarray:
+    """
+    Returns ``array`` extended along its first axis to ``rows`` rows, new rows set to ``fill``.
+    """
+    if len(array) >= rows:
+        return array
+    grown = np.full((rows,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class BarColumns:
+    """
+    Bars of one or many symbols stored column by column.
+    Attributes:
+        symbol (np.ndarray): The symbols (str).
+        date (np.ndarray): The trading dates (datetime64[D]).
+        time (np.ndarray): The bar times in seconds since midnight (int32), 0 for daily bars.
+        open (np.ndarray): The opening prices (float64).
+        high (np.ndarray): The highest prices (float64).
+        low (np.ndarray): The lowest prices (float64).
+        close (np.ndarray): The closing prices (float64).
+        vol (np.ndarray): The volumes (float64).
+        val (np.ndarray): The values (float64).
+    """
+    fields = ("symbol", "date", "time", "open", "high", "low", "close", "vol", "val")
+
+    def __init__(self, symbol, date, time=None, open=None, high=None, low=None,
+                 close=None, vol=None, val=None) -> None:
+        self.symbol: np.ndarray = np.asarray(symbol, dtype=str)
+        self.date: np.ndarray = np.asarray(date, dtype="datetime64[D]")
+        n = len(self.symbol)
+        self.time: np.ndarray = (
+            np.zeros(n, dtype=np.int32) if time is None else np.asarray(time, dtype=np.int32)
+        )
+        for name, column in zip(self.fields[3:], (open, high, low, close, vol, val)):
+            setattr(
+                self, name,
+                np.full(n, np.nan) if column is None else np.asarray(column, dtype=np.float64)
+            )
+
+    @classmethod
+    def from_models(cls, bars: List) -> "BarColumns":
+        """
+        Builds the columns from ``EndOfDayOHLC``, ``IntradayOHLC`` or ``InstrumentInfo`` rows
+        (string or typed models).
+        """
+        bars = bars or []
+        first = bars[0] if bars else None
+        daily = first is not None and not hasattr(first, "trading_time")
+        stock_price = first is not None and hasattr(first, "total_vol")
+        return cls(
+            symbol=[b.instrument for b in bars],
+            date=parse_dates(b.trading_date for b in bars),
+            time=None if daily else parse_times(b.trading_time for b in bars),
+            open=parse_floats(b.open for b in bars),
+            high=parse_floats(b.high for b in bars),
+            low=parse_floats(b.low for b in bars),
+            close=parse_floats(b.close for b in bars),
+            vol=parse_floats((b.total_vol if stock_price else b.vol) for b in bars),
+            val=parse_floats((b.total_val if stock_price else b.val) for b in bars),
+        )
+
+    @classmethod
+    def concat(cls, parts: List["BarColumns"]) -> "BarColumns":
+        """
+        Concatenates several column sets into one.
+        """
+        if not parts:
+            return cls(symbol=[], date=[])
+        return cls(**{f: np.concatenate([getattr(p, f) for p in parts]) for f in cls.fields})
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def take(self, index) -> "BarColumns":
+        """
+        Returns the rows selected by an index array or a boolean mask.
+        """
+        return BarColumns(**{f: getattr(self, f)[index] for f in self.fields})
+
+    def sort(self) -> "BarColumns":
+        """
+        Returns the rows ordered by symbol, date and time.
+        """
+        return self.take(np.lexsort((self.time, self.date, self.symbol)))
+
+    def to_dict(self) -> dict:
+        """
+        Returns the columns as a dict of arrays.
+        """
+        return {f: getattr(self, f) for f in self.fields}
@@ -1,4 +1,6 @@
 """ Constant for SSI datafeed """
+from datetime import time, timedelta, timezone
+
 API_URL = "https://fc-data.ssi.com.vn"
 ENDPOINT_AUTH = "api/v2/Market/AccessToken"
 ENDPOINT_SECURITIES = "api/v2/Market/Securities"
@@ -12,3 +14,18 @@ ENDPOINT_DAILY_STOCK_PRICE = "api/v2/Market/DailyStockPrice"
 
 HUB_URL = "wss://fc-datahub.ssi.com.vn/v2.0/signalr"
 HUB = "FcMarketDataV2hub"
+
+# Exchange timezone and continuous trading sessions (lunch break in between)
+TIMEZONE = timezone(timedelta(hours=7))
+TRADING_SESSIONS = ((time(9, 0), time(11, 30)), (time(13, 0), time(15, 0)))
+# Main index of each exchange, whose daily rows define the trading days
+EXCHANGE_INDICES = {"HOSE": "VNINDEX", "HNX": "HNXIndex", "UPCOM": "HNXUpcomIndex"}
+
+# Hub channels, also the DataType of their messages: combined trades and quotes,
+# trades only, quotes only, indices, 1-minute bars and foreign room
+CHANNEL_ALL = "X"
+CHANNEL_TRADE = "X-TRADE"
+CHANNEL_QUOTE = "X-QUOTE"
+CHANNEL_INDEX = "MI"
+CHANNEL_BAR = "B"
+CHANNEL_FOREIGN_ROOM = "R"
@@ -1,13 +1,52 @@
 """ HUB datafeed for SSI with Reconnection """
 import json
+import time
 import asyncio
 import random
+from functools import partial
+from datetime import datetime
 from urllib.parse import urlencode
 
-from .constant import HUB_URL, HUB
-from .model import TradeTick, QuoteTick
+from .constant import (
+    HUB_URL,
+    HUB,
+    TIMEZONE,
+    TRADING_SESSIONS,
+    CHANNEL_ALL,
+    CHANNEL_TRADE,
+    CHANNEL_QUOTE,
+    CHANNEL_INDEX,
+    CHANNEL_BAR,
+    CHANNEL_FOREIGN_ROOM
+)
+from .model import TradeTick, QuoteTick, IndexTick, BarTick, ForeignRoomTick, IntradayOHLC
+from .batch import TradeBatch, QuoteBatch, GapFill
+from .columnar import BarColumns
 from ..interface_datafeed_hub import IDatafeedHUB
-from ..utils import SocketListener, request_handler
+from ..utils import SocketListener, DedupWindow, OccurrenceCounter, request_handler
+
+# single-kind channel -> (kind of its updates, model)
+CHANNEL_MODELS: dict = {
+    CHANNEL_TRADE: ("trade", TradeTick),
+    CHANNEL_QUOTE: ("quote", QuoteTick),
+    CHANNEL_INDEX: ("index", IndexTick),
+    CHANNEL_BAR: ("bar", BarTick),
+    CHANNEL_FOREIGN_ROOM: ("foreign_room", ForeignRoomTick),
+}
+KINDS: tuple = ("trade", "quote", "index", "bar", "foreign_room")
+KIND_MODELS: dict = dict(CHANNEL_MODELS.values())
+# kind -> columnar batch type, for batch callbacks (``on_trades`` / ``on_quotes``)
+BATCH_TYPES: dict = {"trade": TradeBatch, "quote": QuoteBatch}
+# channels whose symbols have intraday bars to backfill after an outage
+GAP_FILL_CHANNELS: tuple = (CHANNEL_ALL, CHANNEL_TRADE, CHANNEL_QUOTE, CHANNEL_BAR)
+# message members naming the symbol (or index) of an update, interned with a codec
+SYMBOL_KEYS: tuple = ("symbol", "Symbol", "IndexId")
+
+
+def _intern(msg: dict, codec) -> None:
+    for key in SYMBOL_KEYS:
+        if msg.get(key):
+            msg[key] = codec.intern(msg[key])
 
 
 class SSIDatafeedHUB(IDatafeedHUB):
@@ -23,6 +62,12 @@ class SSIDatafeedHUB(IDatafeedHUB):
         message_send_to_socket (dict): The message to send to the socket.
     Methods:
         generate_socket_url: Generates the socket URL for the connection.
+        stale_timeout: Returns the silence after which a connection is considered stale.
+        connect: Negotiates and subscribes a new connection.
+        run: Keeps a subscription alive, replacing stale or broken connections.
+        attach: Feeds the ticks received by ``listen`` to a store (indicators, tapes...).
+        detach: Stops feeding a store.
+        subscribe: Listens to selected channels (trades, quotes, indices, bars, room).
         listen: Listens for messages from the socket server with reconnection support.
     """
     def __init__(self, api):
@@ -39,9 +84,20 @@ class SSIDatafeedHUB(IDatafeedHUB):
             "I": 0,
         }
         # Reconnection settings
-        self.max_reconnect_attempts = 5
+        self.max_reconnect_attempts = None  # None retries forever
         self.base_delay = 1  # Base delay in seconds
-        self.max_delay = 60  # Maximum delay between reconnection attempts
+        self.max_delay = 30  # Maximum delay between reconnection attempts
+        # Watchdog: maximum silence before a connection is considered stale
+        self.stale_timeout_trading = 15  # seconds, during trading sessions
+        self.stale_timeout_idle = 40  # seconds, outside trading sessions
+        self.keepalive_timeout = None  # announced by the hub on negotiation
+        # Hot-standby connections carrying the same subscription
+        self.redundancy: int = 1
+        self.dedup_window: int = 8192  # recent updates remembered for de-duplication
+        # Backfill: silences shorter than this (seconds) are not treated as outages
+        self.gap_fill_min: float = 1
+        # Stores fed before the user callbacks: kind -> bound ``on_<kind>`` methods
+        self.__sinks: dict = {kind: [] for kind in KINDS + ("trades", "quotes", "gap_fill")}
 
     def generate_socket_url(self):
         """
@@ -56,6 +112,7 @@ class SSIDatafeedHUB(IDatafeedHUB):
         self.negotiate_query = urlencode(self.connection_data)
         self.url_negotiate = f"{self.url}/negotiate?{self.negotiate_query}"
         response = request_handler.post(self.url_negotiate, headers=self.headers)
+        self.keepalive_timeout = response.get("KeepAliveTimeout")
         query = urlencode({
             "transport": "webSockets",
             "connectionToken": response["ConnectionToken"],
@@ -65,6 +122,28 @@ class SSIDatafeedHUB(IDatafeedHUB):
         socket_url = f"{self.url_hub}/connect?{query}"
         return socket_url
 
+    def attach(self, store) -> None:
+        """
+        Feeds every tick received by ``listen`` to ``store`` before the user callbacks.
+        Args:
+            store: An object with an ``on_trade(tick)`` and/or ``on_quote(tick)`` method,
+                   such as an ``IndicatorEngine``; ``on_index``, ``on_bar`` and
+                   ``on_foreign_room`` receive the updates of the other channels,
+                   ``on_trades(batch)`` / ``on_quotes(batch)`` the batches of
+                   ``subscribe`` in batch mode and ``on_gap_fill(event)`` the bars
+                   recovered after an outage.
+        """
+        for kind in self.__sinks:
+            if hasattr(store, "on_" + kind):
+                self.__sinks[kind].append(getattr(store, "on_" + kind))
+
+    def detach(self, store) -> None:
+        """
+        Stops feeding ``store``.
+        """
+        for kind in self.__sinks:
+            self.__sinks[kind] = [i for i in self.__sinks[kind] if i.__self__ is not store]
+
     def calculate_backoff_delay(self, attempt):
         """
         Calculate exponential backoff delay with jitter.
@@ -74,63 +153,426 @@ class SSIDatafeedHUB(IDatafeedHUB):
             float: Delay in seconds before next reconnection attempt.
         """
         # Exponential backoff with full jitter
-        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = min(self.max_delay, self.base_delay * (2 ** min(attempt, 16)))
         jitter = random.uniform(0, delay)
         return jitter
 
-    async def listen(self, args, on_trade_message, on_quote_message):
+    def stale_timeout(self, now: datetime = None) -> float:
         """
-        Listens for messages from the socket server with automatic reconnection.
+        Returns how long the connection may stay silent before it is considered stale.
+        During trading sessions quotes and trades arrive every few seconds, so silence
+        is detected quickly; outside of them only hub keepalives arrive, and the
+        keepalive timeout announced on negotiation (if any) is used instead.
         Args:
-            args: Comma-separated list of symbols to subscribe to.
-            on_trade_message: Callback for trade tick messages.
-            on_quote_message: Callback for quote tick messages.
+            now (datetime, optional): The current time. Defaults to now (exchange time).
+        Returns:
+            float: The timeout in seconds.
         """
-        symbol_list: str = args.split(",")
-        arguments: list = []
-        arguments.append("X:" + "-".join(symbol_list))
-        last_vol: dict = {}
-        # Regenerate stream URL for each connection attempt
-        for attempt in range(self.max_reconnect_attempts):
+        now = now or datetime.now(TIMEZONE)
+        idle = self.keepalive_timeout or self.stale_timeout_idle
+        if now.weekday() < 5 and any(
+            start <= now.time() < end for start, end in TRADING_SESSIONS
+        ):
+            return min(self.stale_timeout_trading, idle)
+        return idle
+
+    async def connect(self, arguments: list):
+        """
+        Negotiates a fresh connection and subscribes it to ``arguments``.
+        Args:
+            arguments (list): The channels to subscribe to, e.g. ["X:SSI-VCB"].
+        Returns:
+            The connected websocket.
+        """
+        self.headers.update({"Authorization": self.api.get_token()})
+        # negotiation is a blocking HTTP call, keep it off the event loop
+        self.stream_url = await asyncio.to_thread(self.generate_socket_url)
+        socket = SocketListener()
+        websocket = await socket.connect_socket_server(self.stream_url, self.headers)
+        message = dict(self.message_send_to_socket, A=arguments)
+        await websocket.send(json.dumps(message))
+        print(f"[vDatafeed] WebSocket connected, subscribed to {message}")
+        return websocket
+
+    async def run(self, arguments: list, on_frame, on_reconnect=None) -> None:
+        """
+        Keeps a subscription alive and passes every received frame to ``on_frame``.
+        A watchdog treats a connection that stays silent longer than
+        ``stale_timeout()`` as half-open: a replacement is negotiated and subscribed
+        first, and only then is the stale connection closed. Failed connections are
+        retried with a bounded exponential backoff, indefinitely unless
+        ``max_reconnect_attempts`` is set.
+        Args:
+            arguments (list): The channels to subscribe to.
+            on_frame (callable): Called with every raw frame.
+            on_reconnect (callable, optional): Called without arguments each time a
+                                               replacement connection is subscribed.
+        """
+        attempt: int = 0
+        websocket = None
+        connected: bool = False
+        while True:
             try:
-                # Generate a fresh socket URL for each attempt
-                self.stream_url = self.generate_socket_url()
-                socket = SocketListener()
-                async with socket.connect_socket_server(self.stream_url, self.headers) as websocket:
-                    print(f"[vDatafeed] WebSocket connected (Attempt {attempt + 1})")
-                    # Prepare and send subscription message
-                    self.message_send_to_socket.update({"A": arguments})
-                    await websocket.send(json.dumps(self.message_send_to_socket))
-                    print(f"[vDatafeed] Subscribed to {self.message_send_to_socket}")
-                    # Create keepalive task
-                    async for msg in websocket:
+                if websocket is None:
+                    websocket = await self.connect(arguments)
+                    if connected and on_reconnect is not None:
+                        on_reconnect()
+                    connected = True
+                while True:
+                    try:
+                        frame = await asyncio.wait_for(
+                            websocket.recv(), timeout=self.stale_timeout()
+                        )
+                    except asyncio.TimeoutError:
+                        print("[vDatafeed] Connection is stale, switching to a new one")
+                        stale = websocket
                         try:
-                            msg = json.loads(msg)
-                            if "M" not in msg:
-                                continue
-                            for i in msg["M"]:
-                                if "A" not in i or not i["A"]:
-                                    continue
-                                msg = json.loads(json.loads(i["A"][0]).get("Content"))
-                                if msg.get("symbol") not in last_vol:
-                                    last_vol[msg.get("symbol")] = msg.get("TotalVol")
-                                else:
-                                    if last_vol[msg.get("symbol")] == msg.get("TotalVol"):
-                                        on_quote_message(QuoteTick(**msg))
-                                        continue
-                                    last_vol[msg.get("symbol")] = msg.get("TotalVol")
-                                on_trade_message(TradeTick(**msg))
-                            attempt = 0
-                        except Exception as e:
-                            print(f"[vDatafeed] Message processing error: {e}")
+                            websocket = await self.connect(arguments)
+                        finally:
+                            asyncio.ensure_future(stale.close())
+                        if on_reconnect is not None:
+                            on_reconnect()
+                        continue
+                    attempt = 0
+                    try:
+                        on_frame(frame)
+                    except Exception as e:
+                        print(f"[vDatafeed] Message processing error: {e}")
+            except asyncio.CancelledError:
+                if websocket is not None:
+                    asyncio.ensure_future(websocket.close())
+                raise
             except Exception as e:
                 print(f"[vDatafeed] Connection error: {e}")
-                # If this was the last attempt, raise the exception
-                if attempt == self.max_reconnect_attempts - 1:
+                if websocket is not None:
+                    asyncio.ensure_future(websocket.close())
+                    websocket = None
+                if self.max_reconnect_attempts and attempt >= self.max_reconnect_attempts:
                     raise
-                # Calculate backoff delay
                 delay = self.calculate_backoff_delay(attempt)
+                attempt += 1
                 print(f"[vDatafeed] Reconnecting in {delay:.2f} seconds...")
-                # Wait before trying to reconnect
                 await asyncio.sleep(delay)
-        print("[vDatafeed] Maximum reconnection attempts reached")
+
+    async def subscribe(
+        self, channels: dict, on_trade_message=None, on_quote_message=None,
+        on_index_message=None, on_bar_message=None, on_foreign_room_message=None,
+        redundancy: int = None, on_trades=None, on_quotes=None, batch_window: float = 0,
+        on_gap_fill=None, codec=None
+    ):
+        """
+        Listens to selected hub channels with automatic reconnection. Each channel has
+        its own decoder: trade-only consumers no longer receive nor decode quotes.
+        Args:
+            channels (dict): The symbols (comma-separated or list) per channel, e.g.
+                             ``{"X-TRADE": "SSI,VCB", "MI": "VN30,VNINDEX"}``. Channels:
+                             ``X-TRADE`` (``TradeTick``), ``X-QUOTE`` (``QuoteTick``),
+                             ``MI`` (``IndexTick``), ``B`` (``BarTick``), ``R``
+                             (``ForeignRoomTick``) and ``X`` (trades and quotes combined,
+                             told apart by their total volume).
+            on_trade_message: Callback for trade ticks (``X-TRADE`` and ``X``).
+            on_quote_message: Callback for quote ticks (``X-QUOTE`` and ``X``).
+            on_index_message: Callback for index ticks (``MI``).
+            on_bar_message: Callback for bar ticks (``B``).
+            on_foreign_room_message: Callback for foreign room ticks (``R``).
+                                     Callbacks may be omitted for channels whose
+                                     updates go to attached stores (e.g. a ``TickRouter``).
+            redundancy (int, optional): The number of concurrent connections carrying the
+                                        same subscription. Defaults to ``self.redundancy``.
+                                        With more than one, every update is delivered
+                                        once, from whichever connection is first; an
+                                        update repeated on one connection is not a
+                                        duplicate.
+            on_trades: Batch callback for trades, called with one ``TradeBatch`` per
+                       frame instead of ``on_trade_message`` per tick.
+            on_quotes: Batch callback for quotes, called with one ``QuoteBatch`` per frame.
+            batch_window (float, optional): With batch callbacks, collects the updates of
+                                            every frame received within this many seconds
+                                            into one batch. Defaults to 0 (one per frame).
+            on_gap_fill: Callback for the ``GapFill`` of each outage: once a replacement
+                         connection is up, the intraday bars of the silent window are
+                         fetched for the subscribed symbols (one request per symbol, run
+                         concurrently) and delivered. The volumes used to tell trades
+                         from quotes on ``X`` are then reset: the next update of each
+                         symbol sets its baseline and is delivered as a trade, as at
+                         startup.
+            codec (TickCodec, optional): Interns the symbol of every update, so ticks
+                                         and the stores built with the same codec
+                                         share one string object and one id per
+                                         symbol. Prices and volumes are not encoded:
+                                         ticks and batches keep float64 values.
+        """
+        callbacks: dict = {
+            "trade": on_trade_message,
+            "quote": on_quote_message,
+            "index": on_index_message,
+            "bar": on_bar_message,
+            "foreign_room": on_foreign_room_message,
+        }
+        batch_callbacks: dict = {
+            kind: callback for kind, callback in (("trade", on_trades), ("quote", on_quotes))
+            if callback is not None
+        }
+        arguments: list = []
+        handlers: dict = {}
+        gap_symbols: list = []
+        redundancy = redundancy or self.redundancy
+        # per connection: symbol -> last TotalVol on ``X``. Each connection tells trades
+        # from quotes on its own stream, so a copy arriving late is still a trade there.
+        # The last entry holds the TotalVol of the last trade delivered, any connection.
+        volumes: list = [{} for _ in range(redundancy + 1)]
+        window = DedupWindow(self.dedup_window) if redundancy > 1 else None
+        # per connection: how many times each payload arrived on it
+        occurrences: list = [OccurrenceCounter(self.dedup_window) for _ in range(redundancy)]
+        for channel, symbols in channels.items():
+            if channel == CHANNEL_ALL:
+                kinds = ("trade", "quote")
+            elif channel in CHANNEL_MODELS:
+                kinds = (CHANNEL_MODELS[channel][0],)
+            else:
+                raise ValueError(f"Unknown channel {channel!r}")
+            for kind in kinds:
+                if callbacks[kind] is None and kind not in batch_callbacks and not (
+                    self.__sinks[kind]
+                ):
+                    raise ValueError(
+                        f"Channel {channel!r} needs on_{kind}_message or an attached store"
+                    )
+            if isinstance(symbols, str):
+                symbols = symbols.split(",")
+            arguments.append(channel + ":" + "-".join(symbols))
+            if channel in GAP_FILL_CHANNELS:
+                gap_symbols += [i for i in symbols if i != "ALL" and i not in gap_symbols]
+            if channel == CHANNEL_ALL:
+                handlers[channel] = self.__combined_decoder(window, volumes, codec)
+            else:
+                handlers[channel] = self.__channel_decoder(
+                    CHANNEL_MODELS[channel][0], window, codec
+                )
+        # messages without a known DataType go to the channel, when there is only one
+        fallback = next(iter(handlers.values())) if len(handlers) == 1 else None
+        pending: dict = {kind: [] for kind in batch_callbacks}
+        timer: list = [None]
+        last_frame: list = [None]  # time of the last frame, from any connection
+        fills: set = set()
+
+        def flush():
+            timer[0] = None
+            for kind, messages in pending.items():
+                if not messages:
+                    continue
+                pending[kind] = []
+                batch = BATCH_TYPES[kind].from_messages(messages)
+                for sink in self.__sinks[kind + "s"]:
+                    sink(batch)
+                # stores without a batch method still get one tick at a time
+                batched = {sink.__self__ for sink in self.__sinks[kind + "s"]}
+                sinks = [i for i in self.__sinks[kind] if i.__self__ not in batched]
+                if sinks:
+                    for tick in (KIND_MODELS[kind](**m) for m in messages):
+                        for sink in sinks:
+                            sink(tick)
+                batch_callbacks[kind](batch)
+
+        def flush_window():
+            try:
+                flush()
+            except Exception as e:
+                print(f"[vDatafeed] Message processing error: {e}")
+
+        def deliver(kind: str, msg: dict):
+            if kind in pending:
+                pending[kind].append(msg)
+                if batch_window and timer[0] is None:
+                    timer[0] = asyncio.get_running_loop().call_later(batch_window, flush_window)
+                return
+            tick = KIND_MODELS[kind](**msg)
+            for sink in self.__sinks[kind]:
+                sink(tick)
+            if callbacks[kind] is not None:
+                callbacks[kind](tick)
+
+        def on_reconnect():
+            if last_frame[0] is None or not gap_symbols:
+                return
+            if on_gap_fill is None and not self.__sinks["gap_fill"]:
+                return
+            start = datetime.fromtimestamp(last_frame[0], TIMEZONE)
+            end = datetime.now(TIMEZONE)
+            if (end - start).total_seconds() < self.gap_fill_min:
+                return  # another connection kept delivering
+            task = asyncio.ensure_future(self.__fill_gap(
+                gap_symbols, start, end, on_gap_fill, volumes, [dict(i) for i in volumes]
+            ))
+            fills.add(task)
+            task.add_done_callback(fills.discard)
+
+        def on_frame(connection: int, frame):
+            last_frame[0] = time.time()
+            msg = json.loads(frame)
+            if "M" not in msg:
+                return
+            try:
+                for i in msg["M"]:
+                    if "A" not in i or not i["A"]:
+                        continue
+                    payload = json.loads(i["A"][0])
+                    handler = handlers.get(payload.get("DataType"), fallback)
+                    content = payload.get("Content")
+                    if handler is None or not content:
+                        continue
+                    fresh = True
+                    if window is not None:
+                        # the n-th copy of a payload on one connection is the n-th on
+                        # any other: a repeat on the same connection is a new update
+                        key = hash(content)
+                        # False: already delivered by another connection
+                        fresh = window.add(hash((key, occurrences[connection].add(key))))
+                    update = handler(content, connection, fresh)
+                    if update is not None:
+                        deliver(*update)
+            finally:
+                if pending and not batch_window:
+                    flush()
+
+        try:
+            await asyncio.gather(
+                *(self.run(arguments, partial(on_frame, n), on_reconnect)
+                  for n in range(redundancy))
+            )
+        finally:
+            if timer[0] is not None:
+                timer[0].cancel()
+            for task in fills:
+                task.cancel()
+
+    async def __fill_gap(
+        self, symbols: list, start: datetime, end: datetime, callback,
+        volumes: list, seen: list
+    ) -> None:
+        """
+        Fetches the intraday bars of ``symbols`` overlapping ``start``-``end`` and
+        delivers them as a ``GapFill``. The pre-outage volume of each symbol with bars
+        is dropped from the ``volumes`` of every connection, unless an update received
+        there since the reconnection already replaced it. Outages outside the trading
+        sessions are not backfilled.
+        """
+        day = end.strftime("%Y-%m-%d")
+        since = start.time() if start.date() == end.date() else datetime.min.time()
+        if end.weekday() >= 5 or not any(
+            s < end.time() and e > since for s, e in TRADING_SESSIONS
+        ):
+            return
+        if self.api.calendar is not None and self.api.calendar.is_closed(day, day):
+            return
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.api.get_intraday_ohlcv, i, day, day) for i in symbols),
+            return_exceptions=True
+        )
+        parts, failed = [], []
+        low = since.hour * 3600 + since.minute * 60 + since.second - 60
+        high = end.hour * 3600 + end.minute * 60 + end.second
+        for symbol, rows in zip(symbols, results):
+            if isinstance(rows, Exception):
+                print(f"[vDatafeed] Gap fill failed for {symbol}: {rows}")
+                failed.append(symbol)
+                continue
+            rows = [IntradayOHLC(**i) if isinstance(i, dict) else i for i in rows or []]
+            bars = BarColumns.from_models(rows)
+            if not len(bars):
+                continue
+            for last, before in zip(volumes, seen):
+                if symbol in last and last[symbol] == before.get(symbol):
+                    # bar volumes need not add up to the hub's TotalVol: leave the
+                    # symbol unseeded and let its next update set the baseline
+                    del last[symbol]
+            parts.append(bars.take((bars.time > low) & (bars.time <= high)))
+        event = GapFill(start, end, BarColumns.concat(parts).sort(), failed)
+        print(f"[vDatafeed] Gap fill {start:%H:%M:%S}-{end:%H:%M:%S}: {len(event)} bars")
+        try:
+            for sink in self.__sinks["gap_fill"]:
+                sink(event)
+            if callback is not None:
+                callback(event)
+        except Exception as e:
+            print(f"[vDatafeed] Message processing error: {e}")
+
+    @staticmethod
+    def __channel_decoder(kind: str, window, codec=None):
+        """
+        Returns the decoder of a single-kind channel: no inference, the kind is known.
+        Updates already delivered by another connection (not ``fresh``) are skipped.
+        """
+        def decode(content: str, connection: int, fresh: bool):
+            if not fresh:
+                return None
+            msg = json.loads(content)
+            if codec is not None:
+                _intern(msg, codec)
+            if window is not None:
+                # a trade is identified by (symbol, TotalVol, Time)
+                symbol = msg.get("Symbol", msg.get("symbol"))
+                if kind == "trade" and not window.add(
+                    hash((symbol, msg.get("TotalVol"), msg.get("Time")))
+                ):
+                    return None
+            return kind, msg
+        return decode
+
+    @staticmethod
+    def __combined_decoder(window, volumes: list, codec=None):
+        """
+        Returns the decoder of the combined ``X`` channel: an update whose total volume
+        changed is a trade, any other update is a quote. ``volumes`` holds the last
+        total volume of each symbol, per connection: every update of a connection,
+        ``fresh`` or not, is classified against the previous one of that connection.
+        A trade is then delivered once, whatever its payload on each connection, and an
+        update of a connection that missed a trade delivered by another is a quote.
+        ``volumes[-1]`` holds the total volume of the last trade delivered.
+        """
+
+        def decode(content: str, connection: int, fresh: bool):
+            msg = json.loads(content)
+            symbol, total_vol = msg.get("symbol"), msg.get("TotalVol")
+            last_vol = volumes[connection]
+            kind = "quote" if symbol in last_vol and last_vol[symbol] == total_vol else "trade"
+            last_vol[symbol] = total_vol
+            if not fresh:
+                return None
+            if window is not None and kind == "trade":
+                # a trade is identified by (symbol, TotalVol, Time)
+                if not window.add(hash((symbol, total_vol, msg.get("Time")))):
+                    return None
+                delivered = volumes[-1]
+                if symbol in delivered and delivered[symbol] == total_vol:
+                    kind = "quote"
+                else:
+                    delivered[symbol] = total_vol
+            if codec is not None:
+                _intern(msg, codec)
+            return kind, msg
+        return decode
+
+    async def listen(
+        self, args, on_trade_message, on_quote_message, redundancy: int = None, on_gap_fill=None,
+        codec=None
+    ):
+        """
+        Listens for messages from the socket server with automatic reconnection.
+        Args:
+            args: Comma-separated list of symbols to subscribe to.
+            on_trade_message: Callback for trade tick messages.
+            on_quote_message: Callback for quote tick messages.
+            redundancy (int, optional): The number of concurrent connections carrying the
+                                        same subscription. Defaults to ``self.redundancy``.
+                                        With more than one, every update is delivered
+                                        once, from whichever connection is first.
+            on_gap_fill: Callback for the bars recovered after each outage (``GapFill``).
+            codec (TickCodec, optional): Interns the symbol of every update; prices and
+                                         volumes stay float64.
+        """
+        await self.subscribe(
+            {CHANNEL_ALL: args}, on_trade_message=on_trade_message,
+            on_quote_message=on_quote_message, redundancy=redundancy, on_gap_fill=on_gap_fill,
+            codec=codec
+        )
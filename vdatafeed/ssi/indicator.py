@@ -0,0 +1,142 @@
+""" Incremental per-symbol indicators computed from live trade ticks """
+from typing import Iterable
+
+import numpy as np
+
+from .codec import TickCodec
+from .columnar import grow_rows
+from .model import TradeTick
+from ..utils import SymbolTable
+
+
+class IndicatorEngine:
+    """
+    Keeps running indicators for every traded symbol with O(1) work per tick.
+    State lives in arrays indexed by symbol id, so the cost of a tick does not depend
+    on how long the session has been running and a snapshot of the whole market is a
+    handful of array copies.
+
+    Indicators:
+        vwap: session volume-weighted average price.
+        ema_<span>: exponential moving average of the trade price, one per span.
+        rolling_vol: volume of the last ``window`` trades (ring buffer).
+        high / low: session highest and lowest trade prices.
+
+    With a ``TickCodec`` the engine shares the codec's symbol ids with the hub and the
+    other stores; its state stays float64, symbols interned elsewhere have no trades.
+
+    Attach it to a hub with ``hub.attach(engine)`` to feed it from ``listen``.
+
+    Args:
+        ema_spans (Iterable[int]): The EMA spans, in trades. Defaults to (10, 30).
+        window (int): The number of trades of the rolling volume. Defaults to 100.
+        capacity (int): The initial number of symbols; grows on demand.
+        codec (TickCodec, optional): Shares its symbol ids.
+    """
+    def __init__(
+        self, ema_spans: Iterable[int] = (10, 30), window: int = 100, capacity: int = 64,
+        codec: TickCodec = None
+    ) -> None:
+        self.symbols: SymbolTable = SymbolTable() if codec is None else codec.symbols
+        self.ema_spans: tuple = tuple(ema_spans)
+        self.window: int = window
+        self.__alpha = np.array([2.0 / (span + 1) for span in self.ema_spans])
+        self.__capacity: int = 0
+        self.__price = np.zeros(0)
+        self.__pv = np.zeros(0)
+        self.__vol = np.zeros(0)
+        self.__ema = np.zeros((0, len(self.ema_spans)))
+        self.__high = np.zeros(0)
+        self.__low = np.zeros(0)
+        self.__count = np.zeros(0, dtype=np.int64)
+        self.__ring = np.zeros((0, window))
+        self.__ring_sum = np.zeros(0)
+        self.__reserve(capacity)
+
+    def __reserve(self, capacity: int) -> None:
+        if capacity <= self.__capacity:
+            return
+        self.__price = grow_rows(self.__price, capacity, np.nan)
+        self.__pv = grow_rows(self.__pv, capacity)
+        self.__vol = grow_rows(self.__vol, capacity)
+        self.__ema = grow_rows(self.__ema, capacity, np.nan)
+        self.__high = grow_rows(self.__high, capacity, -np.inf)
+        self.__low = grow_rows(self.__low, capacity, np.inf)
+        self.__count = grow_rows(self.__count, capacity)
+        self.__ring = grow_rows(self.__ring, capacity)
+        self.__ring_sum = grow_rows(self.__ring_sum, capacity)
+        self.__capacity = capacity
+
+    def __sync(self) -> None:
+        # a shared codec may hold ids assigned by other stores: give them empty rows
+        rows = len(self.symbols)
+        if rows > self.__capacity:
+            self.__reserve(max(2 * self.__capacity, rows))
+
+    def update(self, symbol: str, price: float, vol: float) -> int:
+        """
+        Applies one trade.
+        Returns:
+            int: The id of the symbol.
+        """
+        sid = self.symbols.id(symbol)
+        if sid >= self.__capacity:
+            self.__reserve(max(2 * self.__capacity, sid + 1))
+        if price is None:
+            return sid
+        vol = vol or 0.0
+        n = self.__count[sid]
+        self.__price[sid] = price
+        self.__pv[sid] += price * vol
+        self.__vol[sid] += vol
+        ema = self.__ema[sid]
+        if n:
+            ema += self.__alpha * (price - ema)
+        else:
+            ema[:] = price
+        if price > self.__high[sid]:
+            self.__high[sid] = price
+        if price < self.__low[sid]:
+            self.__low[sid] = price
+        slot = n % self.window
+        self.__ring_sum[sid] += vol - self.__ring[sid, slot]
+        self.__ring[sid, slot] = vol
+        self.__count[sid] = n + 1
+        return sid
+
+    def on_trade(self, tick: TradeTick) -> None:
+        self.update(tick.symbol, tick.price, tick.vol)
+
+    def get(self, symbol: str) -> dict:
+        """
+        Returns the current indicators of one symbol, or None if it never traded.
+        """
+        sid = self.symbols.get(symbol)
+        if sid is None:
+            return None
+        return {k: v[0].item() for k, v in self.__columns(slice(sid, sid + 1)).items()}
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current indicators of every symbol as arrays aligned with ``symbol``.
+        """
+        return self.__columns(slice(0, len(self.symbols)))
+
+    def __columns(self, rows: slice) -> dict:
+        self.__sync()
+        vol = self.__vol[rows]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = np.where(vol > 0, self.__pv[rows] / vol, np.nan)
+        columns = {
+            "symbol": np.asarray(self.symbols.names[rows], dtype=str),
+            "price": self.__price[rows].copy(),
+            "vwap": vwap,
+            "volume": vol.copy(),
+            "rolling_vol": self.__ring_sum[rows].copy(),
+            "high": self.__high[rows].copy(),
+            "low": self.__low[rows].copy(),
+            "trades": self.__count[rows].copy(),
+        }
+        for n, span in enumerate(self.ema_spans):
+            columns[f"ema_{span}"] = self.__ema[rows, n].copy()
+        return columns
@@ -0,0 +1,120 @@
+""" Arrow IPC export of bar data, to memory-mapped files or shared memory """
+import os
+from typing import Union
+
+import numpy as np
+
+from .columnar import BarColumns
+
+# shared memory blocks created by this process, whose unlinking stays with the writer
+_created: set = set()
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Arrow export requires pyarrow: pip install vdatafeed[arrow]") from e
+    return pa
+
+
+def to_table(bars: Union[BarColumns, list]):
+    """
+    Converts bars (``BarColumns`` or a list of OHLC rows) into an Arrow table:
+    dictionary-encoded symbols, date32 dates, int32 times and float64 values.
+    """
+    pa = _pyarrow()
+    if not isinstance(bars, BarColumns):
+        bars = BarColumns.from_models(bars)
+    columns = bars.to_dict()
+    arrays = [pa.array(columns["symbol"]).dictionary_encode()]
+    arrays += [pa.array(columns[name]) for name in BarColumns.fields[1:]]
+    return pa.Table.from_arrays(arrays, names=list(BarColumns.fields))
+
+
+def from_table(table) -> BarColumns:
+    """
+    Converts an Arrow table written by this module back into ``BarColumns``.
+    Numeric columns of a single-chunk table are views on the Arrow buffers.
+    """
+    pa = _pyarrow()
+    columns = {}
+    for name in BarColumns.fields:
+        chunks = table.column(name)
+        column = chunks.chunk(0) if chunks.num_chunks == 1 else chunks.combine_chunks()
+        if name == "symbol":
+            if pa.types.is_dictionary(column.type):
+                column = column.dictionary_decode()
+            columns[name] = np.asarray(column.to_pylist(), dtype=str)
+        else:
+            columns[name] = column.to_numpy(zero_copy_only=False)
+    return BarColumns(**columns)
+
+
+def write_ipc(bars: Union[BarColumns, list], path: str) -> str:
+    """
+    Writes bars to an Arrow IPC file atomically, through a temporary file and a rename.
+    Returns:
+        str: The written path.
+    """
+    pa = _pyarrow()
+    table = to_table(bars)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+
+def read_ipc(path: str):
+    """
+    Memory-maps an Arrow IPC file: the returned table reads the page cache directly,
+    without copying or parsing, and several processes share the same pages.
+    """
+    pa = _pyarrow()
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def write_shared(bars: Union[BarColumns, list], name: str = None):
+    """
+    Writes bars as an Arrow IPC stream into a new named shared memory block (the
+    stream format needs no footer, so the block may be larger than the data).
+    The caller owns the block: keep it open while consumers attach, then ``close()``
+    and ``unlink()`` it.
+    Returns:
+        SharedMemory: The block; consumers attach with ``read_shared(block.name)``.
+    """
+    from multiprocessing import shared_memory
+    pa = _pyarrow()
+    table = to_table(bars)
+    sizer = pa.MockOutputStream()
+    with pa.ipc.new_stream(sizer, table.schema) as writer:
+        writer.write_table(table)
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(sizer.size(), 1))
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(block.buf))
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    _created.add(block.name)
+    return block
+
+
+def read_shared(name: str) -> tuple:
+    """
+    Attaches to a shared memory block written by ``write_shared``, without copying.
+    Returns:
+        tuple: The table and the block; keep the block open while the table is used,
+               then drop the table and ``close()`` the block.
+    """
+    from multiprocessing import resource_tracker, shared_memory
+    pa = _pyarrow()
+    # the block belongs to the writer: the consumer must not unlink it when it exits
+    try:
+        block = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        block = shared_memory.SharedMemory(name=name)
+        if os.name == "posix" and block.name not in _created:
+            resource_tracker.unregister(block._name, "shared_memory")
+    table = pa.ipc.open_stream(pa.py_buffer(block.buf)).read_all()
+    return table, block
@@ -0,0 +1,200 @@
+""" Market-wide live table of the latest trade state of every symbol """
+import heapq
+from typing import List
+
+import numpy as np
+
+from .batch import TradeBatch
+from .codec import TickCodec
+from .columnar import grow_rows
+from .model import TradeTick
+from ..utils import SymbolTable
+
+COLUMNS = ("price", "ref_price", "change", "change_pct", "total_vol", "total_val",
+           "ceiling", "floor")
+
+
+class MarketTable:
+    """
+    Latest price, change versus the reference price, cumulative volume and value of
+    every symbol, in columnar arrays indexed by symbol id and updated in place.
+
+    Ranking queries use heaps maintained incrementally: every update pushes the new
+    value of the symbol and bumps its version, and entries whose version is outdated
+    are dropped lazily when they reach the top. A heap is created on its first query
+    and compacted when stale entries outnumber live ones. Symbols at their ceiling or
+    floor price are kept in sets.
+
+    With a ``TickCodec`` the table shares the codec's symbol ids with the hub and the
+    other stores; its columns stay float64. Symbols interned elsewhere that never
+    traded here are left out of the rankings and ``get``.
+
+    Attach it to a hub with ``hub.attach(table)`` to feed it from ``listen``.
+
+    Args:
+        capacity (int): The initial number of symbols; grows on demand.
+        codec (TickCodec, optional): Shares its symbol ids.
+    """
+    def __init__(self, capacity: int = 2048, codec: TickCodec = None) -> None:
+        self.symbols: SymbolTable = SymbolTable() if codec is None else codec.symbols
+        self.__capacity: int = 0
+        self.__columns: dict = {name: np.zeros(0) for name in COLUMNS}
+        self.__version = np.zeros(0, dtype=np.int64)
+        self.__heaps: dict = {}  # (column, descending) -> [(key, version, id), ...]
+        self.at_ceiling: set = set()
+        self.at_floor: set = set()
+        self.__reserve(capacity)
+
+    def __reserve(self, capacity: int) -> None:
+        if capacity <= self.__capacity:
+            return
+        for name in COLUMNS:
+            self.__columns[name] = grow_rows(self.__columns[name], capacity, np.nan)
+        self.__version = grow_rows(self.__version, capacity)
+        self.__capacity = capacity
+
+    def __id(self, symbol: str) -> int:
+        sid = self.symbols.id(symbol)
+        if sid >= self.__capacity:
+            self.__reserve(max(2 * self.__capacity, sid + 1))
+        return sid
+
+    def __sync(self) -> None:
+        # a shared codec may hold ids assigned by other stores: give them empty rows
+        rows = len(self.symbols)
+        if rows > self.__capacity:
+            self.__reserve(max(2 * self.__capacity, rows))
+
+    def update(
+        self, symbol: str, price: float, ref_price: float = None, total_vol: float = None,
+        total_val: float = None, ceiling: float = None, floor: float = None
+    ) -> int:
+        """
+        Applies the latest trade state of one symbol; None leaves a column unchanged.
+        Returns:
+            int: The id of the symbol.
+        """
+        sid = self.__id(symbol)
+        columns = self.__columns
+        for name, value in (
+            ("price", price), ("ref_price", ref_price), ("total_vol", total_vol),
+            ("total_val", total_val), ("ceiling", ceiling), ("floor", floor)
+        ):
+            if value is not None:
+                columns[name][sid] = value
+        ref = columns["ref_price"][sid]
+        columns["change"][sid] = columns["price"][sid] - ref
+        columns["change_pct"][sid] = columns["change"][sid] / ref * 100 if ref else np.nan
+        self.__touch(sid, symbol)
+        return sid
+
+    def on_trade(self, tick: TradeTick) -> None:
+        self.update(
+            tick.symbol, tick.price, tick.ref_price, tick.total_vol, tick.total_val,
+            tick.ceiling, tick.floor
+        )
+
+    def on_trades(self, batch: TradeBatch) -> None:
+        """
+        Applies a batch of trades at once; a symbol traded several times in the batch
+        ends with its last trade.
+        """
+        if not len(batch):
+            return
+        ids = np.array([self.__id(s) for s in batch.symbol], dtype=np.int64)
+        _, last = np.unique(ids[::-1], return_index=True)
+        rows = len(ids) - 1 - last
+        ids = ids[rows]
+        columns = self.__columns
+        for name in ("price", "ref_price", "total_vol", "total_val", "ceiling", "floor"):
+            values = getattr(batch, name)[rows]
+            known = ~np.isnan(values)
+            columns[name][ids[known]] = values[known]
+        ref = columns["ref_price"][ids]
+        columns["change"][ids] = columns["price"][ids] - ref
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns["change_pct"][ids] = np.where(
+                ref > 0, columns["change"][ids] / ref * 100, np.nan
+            )
+        for sid in ids.tolist():
+            self.__touch(sid, self.symbols.name(sid))
+
+    def __touch(self, sid: int, symbol: str) -> None:
+        columns = self.__columns
+        price = columns["price"][sid]
+        if price > 0 and price >= columns["ceiling"][sid]:
+            self.at_ceiling.add(symbol)
+        else:
+            self.at_ceiling.discard(symbol)
+        if price > 0 and price <= columns["floor"][sid]:
+            self.at_floor.add(symbol)
+        else:
+            self.at_floor.discard(symbol)
+        self.__version[sid] += 1
+        if not self.__heaps:
+            return
+        version = int(self.__version[sid])
+        for (name, descending), heap in self.__heaps.items():
+            value = float(columns[name][sid])
+            if value == value:  # not NaN
+                heapq.heappush(heap, (-value if descending else value, version, sid))
+            if len(heap) > 4 * len(self.symbols) + 1024:
+                self.__heaps[(name, descending)] = self.__build(name, descending)
+
+    def __build(self, name: str, descending: bool) -> list:
+        self.__sync()
+        n = len(self.symbols)
+        values = self.__columns[name][:n]
+        ids = np.flatnonzero(~np.isnan(values))
+        keys = -values[ids] if descending else values[ids]
+        heap = list(zip(keys.tolist(), self.__version[ids].tolist(), ids.tolist()))
+        heapq.heapify(heap)
+        return heap
+
+    def top(self, column: str, k: int = 10, descending: bool = True) -> List[tuple]:
+        """
+        Returns the ``k`` symbols with the highest (or lowest) value of a column,
+        e.g. ``top("change_pct")`` for the top gainers or ``top("total_val")``.
+        Returns:
+            list: (symbol, value) pairs, best first.
+        """
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column {column!r}, expected one of {COLUMNS}")
+        heap = self.__heaps.get((column, descending))
+        if heap is None:
+            heap = self.__heaps[(column, descending)] = self.__build(column, descending)
+        found: list = []
+        while heap and len(found) < k:
+            entry = heapq.heappop(heap)
+            if entry[1] == self.__version[entry[2]]:
+                found.append(entry)
+        for entry in found:
+            heapq.heappush(heap, entry)
+        return [
+            (self.symbols.name(sid), -key if descending else key) for key, _, sid in found
+        ]
+
+    def gainers(self, k: int = 10) -> List[tuple]:
+        return self.top("change_pct", k)
+
+    def losers(self, k: int = 10) -> List[tuple]:
+        return self.top("change_pct", k, descending=False)
+
+    def get(self, symbol: str) -> dict:
+        """
+        Returns the current state of one symbol, or None if it never traded.
+        """
+        sid = self.symbols.get(symbol)
+        if sid is None or sid >= self.__capacity or not self.__version[sid]:
+            return None
+        return {name: self.__columns[name][sid].item() for name in COLUMNS}
+
+    def snapshot(self) -> dict:
+        """
+        Returns copies of every column, aligned with ``symbols.names``.
+        """
+        self.__sync()
+        n = len(self.symbols)
+        columns = {name: self.__columns[name][:n].copy() for name in COLUMNS}
+        columns["symbol"] = np.asarray(self.symbols.names, dtype=str)
+        return columns
@@ -1,6 +1,9 @@
 """ Model for SSI datafeed """
+from datetime import date, time
 from typing import Optional
-from ..utils import BaseModel, Field, AliasChoices, model_validator
+from ..utils import (
+    BaseModel, Field, AliasChoices, model_validator, field_validator, create_model
+)
 
 
 class SecuritiesInfo(BaseModel):
@@ -332,7 +335,161 @@ class QuoteTick(BaseModel):
         _l = range(1, 11)
         _rev_l = list(reversed(_l))
         values['bid_price'] = [values.get(f"BidPrice{i}") for i in _rev_l]
-        values['bid_vol'] = [values.get(f"BidVol{i}") for i in _rev_l],
-        values['ask_price'] = [values.get(f"AskPrice{i}") for i in _l],
+        values['bid_vol'] = [values.get(f"BidVol{i}") for i in _rev_l]
+        values['ask_price'] = [values.get(f"AskPrice{i}") for i in _l]
         values['ask_vol'] = [values.get(f"AskVol{i}") for i in _l]
         return values
+
+
+def _tick_datetime(values: dict) -> Optional[str]:
+    # "DD/MM/YYYY" + "HH:MM:SS" -> "YYYY-MM-DD HH:MM:SS", None when the hub omits the date
+    trading_date, trading_time = values.get('TradingDate'), values.get('Time')
+    if not trading_date:
+        return None
+    return ' '.join(
+        ["-".join(reversed(trading_date.split("/")))] + ([trading_time] if trading_time else [])
+    )
+
+
+class IndexTick(BaseModel):
+    """
+    Index update from the ``MI`` hub channel.
+    """
+    datetime: Optional[str] = None
+    index: Optional[str] = Field(validation_alias=AliasChoices('index', 'IndexId'))
+    value: Optional[float] = Field(validation_alias=AliasChoices('value', 'IndexValue'))
+    prior_value: Optional[float] = Field(
+        None, validation_alias=AliasChoices('prior_value', 'PriorIndexValue')
+    )
+    change: Optional[float] = Field(None, validation_alias=AliasChoices('change', 'Change'))
+    ratio_change: Optional[float] = Field(
+        None, validation_alias=AliasChoices('ratio_change', 'RatioChange')
+    )
+    total_vol: Optional[float] = Field(
+        None, validation_alias=AliasChoices('total_vol', 'TotalQtty')
+    )
+    total_val: Optional[float] = Field(
+        None, validation_alias=AliasChoices('total_val', 'TotalValue')
+    )
+    advances: Optional[int] = Field(None, validation_alias=AliasChoices('advances', 'Advances'))
+    no_changes: Optional[int] = Field(
+        None, validation_alias=AliasChoices('no_changes', 'Nochanges')
+    )
+    declines: Optional[int] = Field(None, validation_alias=AliasChoices('declines', 'Declines'))
+    ceilings: Optional[int] = Field(None, validation_alias=AliasChoices('ceilings', 'Ceilings'))
+    floors: Optional[int] = Field(None, validation_alias=AliasChoices('floors', 'Floors'))
+    exchange: Optional[str] = Field(None, validation_alias=AliasChoices('exchange', 'Exchange'))
+
+    @model_validator(mode='before')
+    def set_custom_field(cls, values):
+        values['datetime'] = _tick_datetime(values)
+        return values
+
+
+class BarTick(BaseModel):
+    """
+    1-minute bar from the ``B`` hub channel.
+    """
+    symbol: Optional[str] = Field(validation_alias=AliasChoices('symbol', 'Symbol'))
+    trading_time: Optional[str] = Field(
+        None, validation_alias=AliasChoices('trading_time', 'TradingTime')
+    )
+    open: Optional[float] = Field(None, validation_alias=AliasChoices('open', 'Open'))
+    high: Optional[float] = Field(None, validation_alias=AliasChoices('high', 'High'))
+    low: Optional[float] = Field(None, validation_alias=AliasChoices('low', 'Low'))
+    close: Optional[float] = Field(None, validation_alias=AliasChoices('close', 'Close'))
+    vol: Optional[float] = Field(None, validation_alias=AliasChoices('vol', 'Volume'))
+    val: Optional[float] = Field(None, validation_alias=AliasChoices('val', 'Value'))
+
+
+class ForeignRoomTick(BaseModel):
+    """
+    Foreign ownership room update from the ``R`` hub channel.
+    """
+    datetime: Optional[str] = None
+    symbol: Optional[str] = Field(validation_alias=AliasChoices('symbol', 'Symbol'))
+    total_room: Optional[float] = Field(
+        None, validation_alias=AliasChoices('total_room', 'TotalRoom')
+    )
+    current_room: Optional[float] = Field(
+        None, validation_alias=AliasChoices('current_room', 'CurrentRoom')
+    )
+    buy_vol: Optional[float] = Field(None, validation_alias=AliasChoices('buy_vol', 'BuyVol'))
+    sell_vol: Optional[float] = Field(None, validation_alias=AliasChoices('sell_vol', 'SellVol'))
+    buy_val: Optional[float] = Field(None, validation_alias=AliasChoices('buy_val', 'BuyVal'))
+    sell_val: Optional[float] = Field(None, validation_alias=AliasChoices('sell_val', 'SellVal'))
+
+    @model_validator(mode='before')
+    def set_custom_field(cls, values):
+        values['datetime'] = _tick_datetime(values)
+        return values
+
+
+def blank_to_none(values: dict) -> dict:
+    """
+    Replaces the empty strings of a raw row by None, for typed models.
+    """
+    return {k: (None if v == "" else v) for k, v in values.items()}
+
+
+def _parse_trading_date(cls, value):
+    # DD/MM/YYYY, sliced rather than strptime: this runs once per row
+    if isinstance(value, str) and value[2:3] == "/":
+        return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+    return value
+
+
+def typed_model(model, text_fields: tuple, doc: str):
+    """
+    Derives a model with real types from a string model, keeping its aliases:
+    ``trading_date`` becomes a date, ``trading_time`` a time, ``text_fields`` stay
+    strings and every other field becomes a float. Numeric strings are converted by
+    the validator core; rows holding empty strings must go through ``blank_to_none``.
+    """
+    fields: dict = {}
+    for name, info in model.model_fields.items():
+        if name == "trading_date":
+            annotation = Optional[date]
+        elif name == "trading_time":
+            annotation = Optional[time]
+        elif name in text_fields:
+            annotation = Optional[str]
+        else:
+            annotation = Optional[float]
+        fields[name] = (annotation, Field(validation_alias=info.validation_alias))
+    typed = create_model(
+        model.__name__ + "Typed", __base__=model, __module__=__name__,
+        __validators__={
+            "parse_trading_date": field_validator("trading_date", mode="before")(
+                _parse_trading_date
+            ),
+        },
+        **fields
+    )
+    typed.__doc__ = doc
+    return typed
+
+
+InstrumentInfoTyped = typed_model(
+    InstrumentInfo, ("instrument",),
+    "``InstrumentInfo`` with float prices and volumes and a date ``trading_date``."
+)
+IndicesInfoTyped = typed_model(
+    IndicesInfo, ("index", "type", "name", "session"),
+    "``IndicesInfo`` with float values and counts and a date ``trading_date``."
+)
+EndOfDayOHLCTyped = typed_model(
+    EndOfDayOHLC, ("instrument", "exchange"),
+    "``EndOfDayOHLC`` with float OHLCV and a date ``trading_date``."
+)
+IntradayOHLCTyped = typed_model(
+    IntradayOHLC, ("instrument",),
+    "``IntradayOHLC`` with float OHLCV, a date ``trading_date`` and a time ``trading_time``."
+)
+# string model -> typed model, used when Config.output is EnumOutput.TYPED
+TYPED_MODELS: dict = {
+    InstrumentInfo: InstrumentInfoTyped,
+    IndicesInfo: IndicesInfoTyped,
+    EndOfDayOHLC: EndOfDayOHLCTyped,
+    IntradayOHLC: IntradayOHLCTyped,
+}
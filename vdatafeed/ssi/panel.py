@@ -0,0 +1,254 @@
+""" Symbol x date panels of daily stock prices, fetched with the fewest requests """
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Iterable, List
+
+import numpy as np
+
+from .columnar import parse_dates, parse_floats
+from .model import InstrumentInfo
+from ..utils import SymbolTable
+
+# Rough listings per exchange (2024), only used to estimate the cost of a date-major plan.
+# Listings change: pass ``PanelBuilder.count_listings(api)`` as ``market_sizes`` for the
+# current counts.
+MARKET_SIZES: dict = {"HOSE": 420, "HNX": 340, "UPCOM": 860}
+PAGE_ROWS = 1000
+FIELDS = ("open", "high", "low", "close", "close_adj", "total_vol", "total_val")
+
+
+class Panel:
+    """
+    Daily values of several symbols, one (symbols, dates) float64 array per field;
+    NaN where a symbol has no row for a date.
+    Attributes:
+        symbols (np.ndarray): The row labels (str).
+        dates (np.ndarray): The column labels, ascending (datetime64[D]).
+        values (dict): field -> (symbols, dates) array.
+        requests (int): The estimated requests (pages) of the plan used.
+        mode (str): The plan used, "symbol" or "date".
+    """
+    def __init__(
+        self, symbols: np.ndarray, dates: np.ndarray, values: dict, requests: int = 0,
+        mode: str = None
+    ) -> None:
+        self.symbols: np.ndarray = symbols
+        self.dates: np.ndarray = dates
+        self.values: dict = values
+        self.requests: int = requests
+        self.mode: str = mode
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.values[field]
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.symbols), len(self.dates)
+
+
+class _Scatter:
+    """
+    Scatters pages of ``InstrumentInfo`` rows into (symbols, dates) arrays as they
+    arrive, growing both axes by doubling when new symbols or dates appear. Rows of
+    symbols outside ``symbols`` (when given) are dropped without being kept.
+    """
+    def __init__(self, symbols: List[str] = None, fields: Iterable[str] = FIELDS) -> None:
+        self.fixed: bool = symbols is not None
+        self.symbols: SymbolTable = SymbolTable(symbols or ())
+        self.fields: tuple = tuple(fields)
+        self.days: dict = {}  # epoch day -> column
+        self.__lock = threading.Lock()
+        shape = (max(len(self.symbols), 1), 16)
+        self.__values: dict = {field: np.full(shape, np.nan) for field in self.fields}
+
+    def __reserve(self, rows: int, columns: int) -> None:
+        held = next(iter(self.__values.values())).shape if self.__values else (rows, columns)
+        if rows <= held[0] and columns <= held[1]:
+            return
+        shape = tuple(max(n, 2 * h) if n > h else h for n, h in zip((rows, columns), held))
+        for field, values in self.__values.items():
+            grown = np.full(shape, np.nan)
+            grown[:held[0], :held[1]] = values
+            self.__values[field] = grown
+
+    def add(self, rows: list) -> None:
+        rows = [InstrumentInfo(**i) if isinstance(i, dict) else i for i in rows]
+        if not rows:
+            return
+        dates = parse_dates(i.trading_date for i in rows)
+        columns = {field: parse_floats(getattr(i, field) for i in rows) for field in self.fields}
+        with self.__lock:
+            lookup = self.symbols.get if self.fixed else self.symbols.id
+            ids = np.array([lookup(i.instrument) for i in rows], dtype=object)
+            keep = (ids != None) & ~np.isnat(dates)  # noqa: E711
+            ids = ids[keep].astype(np.int64)
+            cols = np.array([
+                self.days.setdefault(d, len(self.days))
+                for d in dates[keep].astype(np.int64).tolist()
+            ], dtype=np.int64)
+            self.__reserve(len(self.symbols), len(self.days))
+            for field, column in columns.items():
+                self.__values[field][ids, cols] = column[keep]
+
+    def panel(self, requests: int = 0, mode: str = None) -> Panel:
+        names = np.asarray(self.symbols.names, dtype=str)
+        rows = np.arange(len(names)) if self.fixed else np.argsort(names)
+        days = np.fromiter(self.days, dtype=np.int64, count=len(self.days))
+        order = np.argsort(days)
+        columns = np.fromiter(self.days.values(), dtype=np.int64, count=len(self.days))[order]
+        values = {
+            field: values[rows][:, columns] for field, values in self.__values.items()
+        }
+        return Panel(
+            names[rows], days[order].astype("datetime64[D]"), values, requests=requests,
+            mode=mode
+        )
+
+
+class PanelBuilder:
+    """
+    Builds ``Panel``s from the daily stock price endpoint, choosing between two plans:
+
+    * symbol-major: one paginated query per symbol, ``ceil(days / 1000)`` pages each;
+    * date-major: whole-exchange queries without symbol, whose pages are always full
+      (an exchange of ``n`` listings over ``days`` days costs ``ceil(n * days / 1000)``
+      pages), split into date windows fetched concurrently.
+
+    The cheaper plan in estimated requests wins: a handful of symbols are fetched
+    one by one, a large universe exchange by exchange.
+
+    Args:
+        api: The datafeed API.
+        calendar (TradingCalendar, optional): Counts trading days exactly and keeps
+                                              date windows on trading days; weekdays
+                                              are counted otherwise.
+        workers (int): The number of queries in flight. Defaults to 4.
+        market_sizes (dict, optional): Listings per exchange, e.g. from
+                                       ``count_listings``. Defaults to ``MARKET_SIZES``,
+                                       rough counts that only size the estimates.
+    """
+    def __init__(
+        self, api, calendar=None, workers: int = 4, market_sizes: dict = None
+    ) -> None:
+        self.api = api
+        self.calendar = calendar
+        self.workers: int = workers
+        self.market_sizes: dict = dict(market_sizes or MARKET_SIZES)
+
+    @staticmethod
+    def count_listings(api, exchanges: Iterable[str] = MARKET_SIZES) -> dict:
+        """
+        Returns the number of listed securities of each exchange, from the securities
+        list: the exact ``market_sizes`` of the plan estimates.
+        """
+        return {e: len(api.get_instruments(e) or []) for e in exchanges}
+
+    def __days(self, from_date: str, to_date: str) -> int:
+        if self.calendar is not None:
+            return len(self.calendar.trading_days(from_date, to_date))
+        end = np.datetime64(to_date) + np.timedelta64(1, "D")
+        return int(np.busday_count(np.datetime64(from_date), end))
+
+    def estimate(self, symbols: List[str], from_date: str, to_date: str) -> dict:
+        """
+        Returns the estimated requests of each plan; the symbol-major plan is missing
+        when ``symbols`` is None (every listed symbol).
+        """
+        days = max(self.__days(from_date, to_date), 1)
+        costs = {
+            "date": sum(math.ceil(n * days / PAGE_ROWS) for n in self.market_sizes.values())
+        }
+        if symbols is not None:
+            costs["symbol"] = len(symbols) * math.ceil(days / PAGE_ROWS)
+        return costs
+
+    def plan(self, symbols: List[str], from_date: str, to_date: str) -> tuple:
+        """
+        Returns the cheaper mode ("symbol" or "date") and its estimated requests.
+        """
+        costs = self.estimate(symbols, from_date, to_date)
+        mode = min(costs, key=lambda m: (costs[m], m != "symbol"))
+        return mode, costs[mode]
+
+    def __windows(self, exchange: str, from_date: str, to_date: str) -> list:
+        """
+        Splits a range into date windows whose queries fill their pages, at least one
+        window per worker when the range is long enough.
+        """
+        days = max(self.__days(from_date, to_date), 1)
+        size = self.market_sizes.get(exchange, PAGE_ROWS)
+        pages = math.ceil(math.ceil(size * days / PAGE_ROWS) / self.workers)
+        # as many days as fit in ``pages`` full pages: only the last page is partial
+        per_window = max(1, pages * PAGE_ROWS // size)
+        if self.calendar is not None:
+            return list(self.calendar.split(from_date, to_date, per_window))
+        weekdays = np.arange(np.datetime64(from_date), np.datetime64(to_date) + 1)
+        weekdays = weekdays[np.is_busday(weekdays)]
+        return [
+            (str(weekdays[i]), str(weekdays[min(i + per_window, len(weekdays)) - 1]))
+            for i in range(0, len(weekdays), per_window)
+        ]
+
+    def __fetch(self, scatter: _Scatter, **kwargs) -> None:
+        scheduler = getattr(self.api, "scheduler", None)
+        with scheduler.priority(scheduler.BATCH) if scheduler else nullcontext():
+            for page in self.api.iter_daily_instruments_info(**kwargs):
+                scatter.add(page)
+
+    def build(
+        self, symbols: Iterable[str], from_date: str, to_date: str,
+        fields: Iterable[str] = FIELDS, mode: str = None
+    ) -> Panel:
+        """
+        Fetches the daily stock prices of ``symbols`` over a range and assembles them.
+        Each page is scattered into the panel as soon as it arrives, so memory holds
+        the panel and the pages in flight, not every row of the whole-exchange queries.
+        Args:
+            symbols (Iterable[str]): The universe; None for every listed symbol.
+            from_date (str): The first date (YYYY-MM-DD).
+            to_date (str): The last date (YYYY-MM-DD).
+            fields (Iterable[str]): ``InstrumentInfo`` fields to keep. Defaults to ``FIELDS``.
+            mode (str, optional): Forces "symbol" or "date" instead of the cheaper plan.
+        Returns:
+            Panel: Rows in the order of ``symbols`` (sorted when None), columns on the
+                   dates found in the responses.
+        """
+        symbols = None if symbols is None else list(dict.fromkeys(symbols))
+        mode = mode or self.plan(symbols, from_date, to_date)[0]
+        estimated = self.estimate(symbols, from_date, to_date).get(mode)
+        if mode == "symbol":
+            if symbols is None:
+                raise ValueError("The symbol-major plan needs a list of symbols")
+            queries = [
+                dict(instrument=s, from_date=from_date, to_date=to_date) for s in symbols
+            ]
+        elif mode == "date":
+            queries = [
+                dict(from_date=a, to_date=b, exchange=exchange)
+                for exchange in self.market_sizes
+                for a, b in self.__windows(exchange, from_date, to_date)
+            ]
+        else:
+            raise ValueError(f"Unknown mode {mode!r}, expected 'symbol' or 'date'")
+        print(f"[vDatafeed] Panel: {mode}-major, {len(queries)} queries, ~{estimated} pages")
+        scatter = _Scatter(symbols, fields)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.__fetch, scatter, **q) for q in queries]
+            for future in as_completed(futures):
+                future.result()
+        return scatter.panel(requests=estimated, mode=mode)
+
+    @staticmethod
+    def assemble(
+        rows: list, symbols: List[str] = None, fields: Iterable[str] = FIELDS,
+        requests: int = 0, mode: str = None
+    ) -> Panel:
+        """
+        Scatters ``InstrumentInfo`` rows (string or typed models, or raw dicts) into a
+        panel; rows of symbols outside ``symbols`` are dropped.
+        """
+        scatter = _Scatter(symbols, fields)
+        scatter.add(rows)
+        return scatter.panel(requests=requests, mode=mode)
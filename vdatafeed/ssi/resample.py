@@ -0,0 +1,268 @@
+""" Resampling of 1-minute bars into higher timeframes, session-aware """
+import threading
+from typing import Iterable
+
+import numpy as np
+
+from .columnar import BarColumns, grow_rows
+from ..utils import SymbolTable
+from .constant import TRADING_SESSIONS
+
+# frequency -> bucket width in seconds; None means one bucket per session / per day
+FREQUENCIES: dict = {
+    "5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "session": None, "1d": None,
+}
+_STARTS = np.array([s.hour * 3600 + s.minute * 60 for s, _ in TRADING_SESSIONS], dtype=np.int32)
+_ENDS = np.array([e.hour * 3600 + e.minute * 60 for _, e in TRADING_SESSIONS], dtype=np.int32)
+
+
+def bucket_times(time: np.ndarray, frequency: str) -> np.ndarray:
+    """
+    Returns the start (seconds since midnight) of the bucket of each bar time.
+    Buckets are anchored at the start of their session and never span the lunch break:
+    with "1h" the morning gives 09:00, 10:00 and 11:00 (until 11:30) and the afternoon
+    13:00 and 14:00. Bars before a session (ATO) or after it (ATC, put-through) fall in
+    its first or last bucket. "1d" gives one bucket per day, labelled 0.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency {frequency!r}, expected one of {list(FREQUENCIES)}")
+    if frequency == "1d":
+        return np.zeros(len(time), dtype=np.int32)
+    session = np.maximum(np.searchsorted(_STARTS, time, side="right") - 1, 0)
+    start = _STARTS[session]
+    if frequency == "session":
+        return start
+    width = FREQUENCIES[frequency]
+    offset = np.clip(time - start, 0, _ENDS[session] - start - 1)
+    return (start + offset // width * width).astype(np.int32)
+
+
+def _reduce(bars: BarColumns, time: np.ndarray) -> BarColumns:
+    """
+    Aggregates bars sharing (symbol, date, bucket ``time``): first open, highest high,
+    lowest low, last close, summed volume and value. Rows are taken in bar time order
+    within a bucket.
+    """
+    if not len(bars):
+        return BarColumns(symbol=[], date=[])
+    order = np.lexsort((bars.time, time, bars.date, bars.symbol))
+    symbol, date, time = bars.symbol[order], bars.date[order], time[order]
+    new = np.r_[
+        True, (symbol[1:] != symbol[:-1]) | (date[1:] != date[:-1]) | (time[1:] != time[:-1])
+    ]
+    first = np.flatnonzero(new)
+    last = np.r_[first[1:] - 1, len(order) - 1]
+    return BarColumns(
+        symbol=symbol[first],
+        date=date[first],
+        time=time[first],
+        open=bars.open[order][first],
+        high=np.fmax.reduceat(bars.high[order], first),
+        low=np.fmin.reduceat(bars.low[order], first),
+        close=bars.close[order][last],
+        vol=np.add.reduceat(np.nan_to_num(bars.vol[order]), first),
+        val=np.add.reduceat(np.nan_to_num(bars.val[order]), first),
+    )
+
+
+def resample(bars: BarColumns, frequency: str) -> BarColumns:
+    """
+    Resamples 1-minute bars of any number of symbols into ``frequency`` bars, ordered
+    by symbol, date and time; each bar is labelled with the start of its bucket.
+    """
+    return _reduce(bars, bucket_times(bars.time, frequency))
+
+
+def _stamps(bars: BarColumns) -> np.ndarray:
+    # (date, time) as seconds since the epoch, ordered like the bars of one symbol
+    return bars.date.astype(np.int64) * 86400 + bars.time
+
+
+def _latest(bars: BarColumns) -> BarColumns:
+    """
+    Keeps one bar per (symbol, date, time), the last one received: a minute delivered
+    again or revised replaces the earlier copy instead of adding to it.
+    """
+    if not len(bars):
+        return bars
+    order = np.lexsort((np.arange(len(bars)), bars.time, bars.date, bars.symbol))
+    symbol, date, time = bars.symbol[order], bars.date[order], bars.time[order]
+    last = np.r_[
+        (symbol[1:] != symbol[:-1]) | (date[1:] != date[:-1]) | (time[1:] != time[:-1]), True
+    ]
+    return bars.take(order[last])
+
+
+class _Buckets:
+    """
+    Resampled bars of every symbol of one frequency, stored in arrival order in arrays
+    grown by doubling; ``last`` holds the row of the latest bucket of each symbol id.
+    """
+    def __init__(self) -> None:
+        self.symbols: SymbolTable = SymbolTable()
+        self.size: int = 0
+        self.sid = np.zeros(0, dtype=np.int64)
+        self.stamp = np.zeros(0, dtype=np.int64)
+        self.columns: dict = {
+            "date": np.zeros(0, dtype="datetime64[D]"), "time": np.zeros(0, dtype=np.int32),
+            **{name: np.zeros(0) for name in BarColumns.fields[3:]},
+        }
+        self.last = np.zeros(0, dtype=np.int64)
+
+    def bars(self) -> BarColumns:
+        rows = slice(0, self.size)
+        return BarColumns(
+            symbol=np.asarray(self.symbols.names, dtype=str)[self.sid[rows]],
+            **{name: column[rows] for name, column in self.columns.items()}
+        )
+
+    def merge(self, fresh: BarColumns) -> None:
+        """
+        Merges resampled bars ordered by symbol, date and time, resampled from base
+        bars later than every base bar merged before for their symbol: a symbol's
+        first new bucket is either its latest bucket, combined in place, or a later
+        one; the rest are appended.
+        """
+        if not len(fresh):
+            return
+        starts = np.flatnonzero(np.r_[True, fresh.symbol[1:] != fresh.symbol[:-1]])
+        ends = np.r_[starts[1:], len(fresh)]
+        ids = np.array([self.symbols.id(i) for i in fresh.symbol[starts]], dtype=np.int64)
+        self.last = grow_rows(self.last, len(self.symbols), -1)
+        previous = self.last[ids]
+        stamp = _stamps(fresh)
+        known = previous >= 0
+        keep = np.ones(len(fresh), dtype=bool)
+        same = known.copy()
+        same[known] = stamp[starts[known]] == self.stamp[previous[known]]
+        rows, first = previous[same], starts[same]
+        if len(rows):
+            # the first new bucket of these symbols continues their latest one
+            columns = self.columns
+            columns["high"][rows] = np.fmax(columns["high"][rows], fresh.high[first])
+            columns["low"][rows] = np.fmin(columns["low"][rows], fresh.low[first])
+            columns["close"][rows] = fresh.close[first]
+            columns["vol"][rows] += np.nan_to_num(fresh.vol[first])
+            columns["val"][rows] += np.nan_to_num(fresh.val[first])
+            keep[first] = False
+        added = int(keep.sum())
+        end = self.size + added
+        if end > len(self.stamp):
+            capacity = max(2 * len(self.stamp), end)
+            self.sid = grow_rows(self.sid, capacity)
+            self.stamp = grow_rows(self.stamp, capacity)
+            for name, column in self.columns.items():
+                self.columns[name] = grow_rows(column, capacity)
+        self.sid[self.size:end] = np.repeat(ids, ends - starts)[keep]
+        self.stamp[self.size:end] = stamp[keep]
+        for name, column in self.columns.items():
+            column[self.size:end] = getattr(fresh, name)[keep]
+        position = self.size + np.cumsum(keep) - 1
+        self.last[ids] = np.where(keep[ends - 1], position[ends - 1], previous)
+        self.size = end
+
+
+class Resampler:
+    """
+    Keeps resampled views of a growing set of 1-minute bars.
+
+    Each requested frequency is computed once and then extended. New base bars are
+    resampled on their own; when every one of them is later than the last base bar
+    merged for its symbol (live and day-by-day updates), the latest bucket of the
+    symbol is combined in place and the following ones appended, so an update costs
+    O(new bars), not O(history). OHLCV aggregates compose, so a bucket completed
+    across two updates matches a single pass over all of its bars. ``get`` orders a
+    frequency once per update that changed it.
+
+    A base bar at or before the last one merged for its symbol is a minute delivered
+    again, revised (gap fill, ``B`` channel) or late. Within one update and in the
+    stored base bars, the last copy of a minute wins. With ``keep_base``, such a bar
+    makes every frequency re-aggregate the de-duplicated history once, so revisions
+    replace the earlier values and a late minute takes its place (e.g. as the open of
+    its bucket). Without the base bars the history cannot be redone: those bars are
+    ignored.
+
+    Args:
+        frequencies (Iterable[str]): Frequencies kept up to date from the start; others
+                                     are computed from the stored base bars on first use.
+        keep_base (bool): Keep the 1-minute bars, so that frequencies not listed in
+                          ``frequencies`` can be computed later and revised minutes
+                          replace their earlier values. Set False to bound memory to
+                          the resampled bars. Defaults to True.
+    """
+    def __init__(self, frequencies: Iterable[str] = (), keep_base: bool = True) -> None:
+        self.keep_base: bool = keep_base
+        self.ignored: int = 0  # base bars dropped as repeated or late, keep_base=False
+        self.__lock = threading.Lock()
+        self.__base: list = []
+        self.__symbols: SymbolTable = SymbolTable()
+        self.__through = np.zeros(0, dtype=np.int64)  # per symbol: last base stamp merged
+        self.__buckets: dict = {}  # frequency -> _Buckets
+        self.__views: dict = {}  # frequency -> ordered BarColumns returned by ``get``
+        for frequency in frequencies:
+            bucket_times(np.zeros(0, dtype=np.int32), frequency)  # validate
+            self.__buckets[frequency] = _Buckets()
+
+    @property
+    def frequencies(self) -> list:
+        return list(self.__buckets)
+
+    def update(self, bars: BarColumns) -> None:
+        """
+        Adds 1-minute bars of any symbols and extends every cached frequency.
+        """
+        if not len(bars):
+            return
+        bars = _latest(bars)
+        with self.__lock:
+            ids = np.array([self.__symbols.id(i) for i in bars.symbol], dtype=np.int64)
+            self.__through = grow_rows(self.__through, len(self.__symbols), np.iinfo(np.int64).min)
+            stamp = _stamps(bars)
+            late = stamp <= self.__through[ids]
+            np.maximum.at(self.__through, ids, stamp)
+            if self.keep_base:
+                self.__base.append(bars)
+            if late.any():
+                if self.keep_base:
+                    self.__redo()
+                    return
+                self.ignored += int(late.sum())
+                bars = bars.take(~late)
+            for frequency, buckets in self.__buckets.items():
+                buckets.merge(resample(bars, frequency))
+                self.__views.pop(frequency, None)
+
+    def __redo(self) -> None:
+        """
+        Re-aggregates every frequency from the de-duplicated base bars.
+        """
+        self.__base = [_latest(BarColumns.concat(self.__base))]
+        for frequency in self.__buckets:
+            buckets = self.__buckets[frequency] = _Buckets()
+            buckets.merge(resample(self.__base[0], frequency))
+            self.__views.pop(frequency, None)
+
+    def get(self, frequency: str) -> BarColumns:
+        """
+        Returns the bars of ``frequency``, ordered by symbol, date and time, computing
+        and caching them on first use.
+        """
+        with self.__lock:
+            view = self.__views.get(frequency)
+            if view is not None:
+                return view
+            buckets = self.__buckets.get(frequency)
+            if buckets is None:
+                bucket_times(np.zeros(0, dtype=np.int32), frequency)  # validate
+                if not self.keep_base:
+                    raise ValueError(
+                        f"Frequency {frequency!r} is not kept up to date and the base "
+                        "bars are not kept (keep_base=False)"
+                    )
+                if len(self.__base) > 1:
+                    self.__base = [_latest(BarColumns.concat(self.__base))]
+                buckets = self.__buckets[frequency] = _Buckets()
+                if self.__base:
+                    buckets.merge(resample(self.__base[0], frequency))
+            view = self.__views[frequency] = buckets.bars().sort()
+            return view
@@ -0,0 +1,168 @@
+""" Per-symbol routing of hub updates to many handlers """
+import itertools
+import threading
+from typing import Callable, Iterable, Union
+
+from .hub import KINDS
+from ..utils import SymbolTable
+
+
+def _symbols(symbols: Union[str, Iterable[str]]) -> set:
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    return {i.strip() for i in symbols if i.strip()}
+
+
+class TickRouter:
+    """
+    Dispatches hub updates to handlers registered per symbol, per basket of symbols
+    (e.g. the components of an index) or for every symbol (wildcard).
+
+    Each kind of update has a table indexed by symbol id holding the tuple of
+    handlers of that symbol. A tick costs one id lookup and the calls of its own
+    handlers: symbols nobody routed reach only the wildcard handlers. Routes are
+    added and removed by replacing the tuples of the symbols concerned (copy on
+    write), never the table, so dispatch needs no lock while routes change.
+
+    With a ``TickCodec`` the router shares the codec's symbol ids, like the stores
+    built with it: the symbols of the updates decoded by ``subscribe(..., codec=codec)``
+    are already interned. Symbols interned by other users of the codec have no routes.
+
+    Attach it to a hub with ``hub.attach(router)``.
+
+    Args:
+        codec (TickCodec, optional): Shares its symbol table.
+    """
+    def __init__(self, codec=None) -> None:
+        self.codec = codec
+        self.symbols: SymbolTable = SymbolTable() if codec is None else codec.symbols
+        self.__lock = threading.Lock()
+        self.__tokens = itertools.count(1)
+        self.__tables: dict = {kind: [] for kind in KINDS}  # kind -> [(token, handler)...]
+        self.__wildcards: dict = {kind: () for kind in KINDS}
+        self.__routes: dict = {}  # token -> (handler, kinds, symbols, basket)
+        self.__baskets: dict = {}  # name -> set of symbols
+
+    def __id(self, symbol: str) -> int:
+        sid = self.symbols.id(symbol) if self.codec is None else self.codec.id(symbol)
+        # a shared codec may hold ids assigned elsewhere: give them empty routes
+        for table in self.__tables.values():
+            table.extend(() for _ in range(sid + 1 - len(table)))
+        return sid
+
+    def __link(self, token: int, handler: Callable, kinds: tuple, symbols: Iterable[str]):
+        for symbol in symbols:
+            sid = self.__id(symbol)
+            for kind in kinds:
+                self.__tables[kind][sid] += ((token, handler),)
+
+    def __unlink(self, token: int, kinds: tuple, symbols: Iterable[str]):
+        for symbol in symbols:
+            sid = self.symbols.get(symbol)
+            if sid is None:
+                continue
+            for kind in kinds:
+                table = self.__tables[kind]
+                if sid < len(table):
+                    table[sid] = tuple(i for i in table[sid] if i[0] != token)
+
+    def route(
+        self, handler: Callable, symbols: Union[str, Iterable[str]] = None,
+        basket: str = None, kinds: Iterable[str] = ("trade", "quote")
+    ) -> int:
+        """
+        Registers ``handler`` for the updates of ``symbols``, of the members of
+        ``basket``, or of every symbol when both are omitted.
+        Args:
+            handler (callable): Called with each routed tick.
+            symbols (str or Iterable[str], optional): Symbols, list or comma-separated.
+            basket (str, optional): A basket name; its members may change afterwards.
+            kinds (Iterable[str]): The kinds of updates, among "trade", "quote", "index",
+                                   "bar" and "foreign_room". Defaults to trades and quotes.
+        Returns:
+            int: The route token, for ``unroute``.
+        """
+        kinds = tuple(kinds)
+        for kind in kinds:
+            if kind not in self.__tables:
+                raise ValueError(f"Unknown kind {kind!r}, expected one of {KINDS}")
+        if symbols is not None and basket is not None:
+            raise ValueError("Route either symbols or a basket, not both")
+        symbols = None if symbols is None else _symbols(symbols)
+        with self.__lock:
+            token = next(self.__tokens)
+            self.__routes[token] = (handler, kinds, symbols, basket)
+            if basket is not None:
+                self.__link(token, handler, kinds, self.__baskets.setdefault(basket, set()))
+            elif symbols is not None:
+                self.__link(token, handler, kinds, symbols)
+            else:
+                for kind in kinds:
+                    self.__wildcards[kind] += ((token, handler),)
+        return token
+
+    def unroute(self, token: int) -> None:
+        """
+        Removes a route; unknown tokens are ignored.
+        """
+        with self.__lock:
+            route = self.__routes.pop(token, None)
+            if route is None:
+                return
+            _, kinds, symbols, basket = route
+            if basket is not None:
+                self.__unlink(token, kinds, self.__baskets.get(basket, ()))
+            elif symbols is not None:
+                self.__unlink(token, kinds, symbols)
+            else:
+                for kind in kinds:
+                    self.__wildcards[kind] = tuple(
+                        i for i in self.__wildcards[kind] if i[0] != token
+                    )
+
+    def set_basket(self, name: str, symbols: Union[str, Iterable[str]]) -> None:
+        """
+        Defines or changes the members of a basket. Only the symbols entering or
+        leaving it are updated for the routes of the basket.
+        """
+        symbols = _symbols(symbols)
+        with self.__lock:
+            current = self.__baskets.get(name, set())
+            routes = [
+                (token, route) for token, route in self.__routes.items() if route[3] == name
+            ]
+            for token, (handler, kinds, _, _) in routes:
+                self.__unlink(token, kinds, current - symbols)
+                self.__link(token, handler, kinds, symbols - current)
+            self.__baskets[name] = symbols
+
+    def basket(self, name: str) -> set:
+        return set(self.__baskets.get(name, ()))
+
+    def dispatch(self, kind: str, symbol: str, tick) -> None:
+        """
+        Calls the handlers of ``kind`` routed to ``symbol`` and the wildcard handlers.
+        """
+        for _, handler in self.__wildcards[kind]:
+            handler(tick)
+        sid = self.symbols.get(symbol)
+        table = self.__tables[kind]
+        # the id may be newer than the table: the symbol has no routes yet
+        if sid is not None and sid < len(table):
+            for _, handler in table[sid]:
+                handler(tick)
+
+    def on_trade(self, tick) -> None:
+        self.dispatch("trade", tick.symbol, tick)
+
+    def on_quote(self, tick) -> None:
+        self.dispatch("quote", tick.symbol, tick)
+
+    def on_index(self, tick) -> None:
+        self.dispatch("index", tick.index, tick)
+
+    def on_bar(self, tick) -> None:
+        self.dispatch("bar", tick.symbol, tick)
+
+    def on_foreign_room(self, tick) -> None:
+        self.dispatch("foreign_room", tick.symbol, tick)
@@ -0,0 +1,180 @@
+""" Bounded per-symbol tape of recent live trades """
+from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+
+from .codec import PRICE_DTYPE, TIME_DTYPE, VOLUME_DTYPE, TickCodec
+from .columnar import grow_rows
+from .constant import TIMEZONE
+from .model import TradeTick
+from ..utils import SymbolTable
+
+
+class TickTape:
+    """
+    Keeps the last ``capacity`` trades of every symbol in preallocated columnar ring
+    buffers: price, vol, total_vol and timestamp (exchange time, datetime64[s]).
+
+    Each ring is stored twice back to back (a mirrored buffer): every trade is written
+    to slot ``i`` and ``i + capacity``, so the most recent trades always form one
+    contiguous slice and queries return array views without copying. Memory is fixed
+    per symbol, ``2 * capacity * 32`` bytes, whatever the length of the session.
+
+    With a ``TickCodec`` the tape shares the codec's symbol ids and stores prices in
+    ticks (int32), volumes as uint32 and timestamps as uint32 epoch seconds: ``2 *
+    capacity * 16`` bytes per symbol. Views then hold the encoded values (a missing
+    price is 0 ticks); pass ``decode=True`` to queries for decimal prices and datetime64
+    timestamps (copies). Symbols interned by other users of the codec hold no trades.
+    The memory saved costs time: every trade is encoded, about 2 to 3x slower than
+    the float64 tape (see ``benchmarks/bench_codec.py``).
+
+    Returned views alias the tape: they are overwritten once ``capacity`` newer trades
+    of the same symbol arrive, so copy them to keep them longer.
+
+    Attach it to a hub with ``hub.attach(tape)`` to feed it from ``listen``.
+
+    Args:
+        capacity (int): The number of trades kept per symbol. Defaults to 1024.
+        symbols (Iterable[str]): Symbols to allocate up front (others are added on demand).
+        codec (TickCodec, optional): Enables the compact encoding.
+    """
+    columns = ("price", "vol", "total_vol", "timestamp")
+
+    def __init__(
+        self, capacity: int = 1024, symbols: Iterable[str] = (), codec: TickCodec = None
+    ) -> None:
+        self.capacity: int = capacity
+        self.codec: TickCodec = codec
+        if codec is None:
+            self.symbols: SymbolTable = SymbolTable(symbols)
+            dtypes = (np.float64, np.float64, "datetime64[s]")
+        else:
+            self.symbols = codec.symbols
+            for symbol in symbols:
+                codec.id(symbol)
+            dtypes = (PRICE_DTYPE, VOLUME_DTYPE, TIME_DTYPE)
+        self.__rows: int = 0
+        self.__price = np.zeros((0, 2 * capacity), dtype=dtypes[0])
+        self.__vol = np.zeros((0, 2 * capacity), dtype=dtypes[1])
+        self.__total_vol = np.zeros((0, 2 * capacity), dtype=dtypes[1])
+        self.__timestamp = np.zeros((0, 2 * capacity), dtype=dtypes[2])
+        self.__count = np.zeros(0, dtype=np.int64)
+        self.__reserve(max(len(self.symbols), 1))
+
+    def __reserve(self, rows: int) -> None:
+        if rows <= self.__rows:
+            return
+        compact = self.codec is not None
+        self.__price = grow_rows(self.__price, rows, 0 if compact else np.nan)
+        self.__vol = grow_rows(self.__vol, rows)
+        self.__total_vol = grow_rows(self.__total_vol, rows)
+        self.__timestamp = grow_rows(self.__timestamp, rows, 0 if compact else np.datetime64("NaT"))
+        self.__count = grow_rows(self.__count, rows)
+        self.__rows = rows
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes for a in (self.__price, self.__vol, self.__total_vol, self.__timestamp)
+        )
+
+    def update(self, symbol: str, price: float, vol: float, total_vol: float, timestamp) -> int:
+        """
+        Appends one trade.
+        Args:
+            timestamp: The trade time (datetime, ISO string or datetime64).
+        Returns:
+            int: The id of the symbol.
+        """
+        sid = self.symbols.id(symbol)
+        if sid >= self.__rows:
+            self.__reserve(max(2 * self.__rows, sid + 1))
+        n = self.__count[sid]
+        slots = (n % self.capacity, n % self.capacity + self.capacity)
+        timestamp = np.datetime64(timestamp, "s")
+        if self.codec is not None:
+            price = self.codec.encode_price(sid, price)
+            vol, total_vol = self.codec.encode_volume(vol), self.codec.encode_volume(total_vol)
+            timestamp = self.codec.encode_time(timestamp)
+        for slot in slots:
+            self.__price[sid, slot] = np.nan if price is None else price
+            self.__vol[sid, slot] = vol or 0.0
+            self.__total_vol[sid, slot] = total_vol or 0.0
+            self.__timestamp[sid, slot] = timestamp
+        self.__count[sid] = n + 1
+        return sid
+
+    def on_trade(self, tick: TradeTick) -> None:
+        timestamp = tick.datetime or datetime.now(TIMEZONE).replace(tzinfo=None)
+        self.update(tick.symbol, tick.price, tick.vol, tick.total_vol, timestamp)
+
+    def count(self, symbol: str) -> int:
+        """
+        Returns the number of trades of ``symbol`` currently held (at most ``capacity``).
+        """
+        sid = self.symbols.get(symbol)
+        if sid is None or sid >= self.__rows:  # unknown, or interned by another user of the codec
+            return 0
+        return int(min(self.__count[sid], self.capacity))
+
+    def last(self, symbol: str, n: int = None, decode: bool = False) -> dict:
+        """
+        Returns the last ``n`` trades of ``symbol`` (all held trades by default), oldest
+        first, as views keyed by column name (decoded copies with ``decode``).
+        """
+        sid = self.symbols.get(symbol)
+        held = self.count(symbol)
+        n = held if n is None else max(0, min(n, held))
+        if n == 0:
+            return self.__views(0, slice(0, 0), decode)
+        end = int(self.__count[sid] % self.capacity) + self.capacity
+        return self.__views(sid, slice(end - n, end), decode)
+
+    def since(self, symbol: str, start, decode: bool = False) -> dict:
+        """
+        Returns the held trades of ``symbol`` at or after ``start`` (datetime, ISO string
+        or datetime64), oldest first, as views keyed by column name.
+        """
+        window = self.last(symbol)
+        start = np.datetime64(start, "s")
+        if self.codec is not None:
+            start = self.codec.encode_times(start)
+        skip = np.searchsorted(window["timestamp"], start, side="left")
+        window = {k: v[skip:] for k, v in window.items()}
+        return self.__decode(self.symbols.get(symbol) or 0, window, decode)
+
+    def recent(self, symbol: str, seconds: float, decode: bool = False, now=None) -> dict:
+        """
+        Returns the trades of ``symbol`` from the last ``seconds`` before ``now``
+        (exchange time, datetime or datetime64; defaults to the current time), e.g. none
+        when the symbol has not traded for longer.
+        """
+        window = self.last(symbol)
+        if now is None:
+            now = datetime.now(TIMEZONE).replace(tzinfo=None)
+        start = np.datetime64(now, "s") - np.timedelta64(int(seconds), "s")
+        if self.codec is not None:
+            start = self.codec.encode_times(start)
+        skip = np.searchsorted(window["timestamp"], start, side="right")
+        window = {k: v[skip:] for k, v in window.items()}
+        return self.__decode(self.symbols.get(symbol) or 0, window, decode)
+
+    def __decode(self, sid: int, window: dict, decode: bool) -> dict:
+        if not decode or self.codec is None:
+            return window
+        return {
+            "price": self.codec.decode_prices(sid, window["price"]),
+            "vol": window["vol"].astype(np.float64),
+            "total_vol": window["total_vol"].astype(np.float64),
+            "timestamp": self.codec.decode_times(window["timestamp"]),
+        }
+
+    def __views(self, sid: int, rows: slice, decode: bool = False) -> dict:
+        window = {
+            "price": self.__price[sid, rows],
+            "vol": self.__vol[sid, rows],
+            "total_vol": self.__total_vol[sid, rows],
+            "timestamp": self.__timestamp[sid, rows],
+        }
+        return self.__decode(sid, window, decode)
@@ -0,0 +1,234 @@
+""" Trading calendar of the Vietnamese exchanges, derived from SSI daily index data """
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Iterator, List
+
+import numpy as np
+
+from .columnar import parse_dates
+from .constant import EXCHANGE_INDICES, TIMEZONE, TRADING_SESSIONS
+
+# Days of daily index data fetched per request, on a fixed grid of epoch days
+CHUNK_DAYS = 30
+
+
+def session_minutes() -> int:
+    """
+    Returns the number of minutes of continuous trading in one day (one 1-minute bar each).
+    """
+    return sum(
+        (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+        for start, end in TRADING_SESSIONS
+    )
+
+
+class TradingCalendar:
+    """
+    Trading days of HOSE, HNX and UPCOM. A day is a trading day when the exchange's
+    main index (``EXCHANGE_INDICES``) has a daily row, so weekends and holidays come
+    from the exchange itself instead of a hard-coded list. Sessions and the lunch break
+    come from ``TRADING_SESSIONS``.
+
+    Daily index data is loaded on demand, ``CHUNK_DAYS`` days per request. Chunks that
+    are entirely in the past never change and are kept (and saved to ``path``, if set).
+    The chunk holding today is kept until the session close, since today's row may only
+    appear then; after the close it is fetched again every ``open_ttl`` seconds until
+    today's row is there.
+
+    Args:
+        api: The datafeed API, used to load daily index data.
+        path (str, optional): A JSON file keeping the calendar across runs.
+        open_ttl (float): Seconds the chunk holding today is kept after the session
+                          close while today's row is missing. Defaults to 900.
+    """
+    def __init__(self, api, path: str = None, open_ttl: float = 900) -> None:
+        self.api = api
+        self.path: str = path
+        self.open_ttl: float = open_ttl
+        self.__lock = threading.RLock()
+        # exchange -> {"chunks": set of loaded chunk ids, "days": set of epoch days,
+        #              "open": {chunk id holding today: fetch time, epoch seconds}}
+        self.__exchanges: dict = {}
+        self.__arrays: dict = {}  # exchange -> sorted datetime64[D] trading days
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as file:
+                    saved = json.load(file)
+                for exchange, entry in saved.items():
+                    self.__exchanges[exchange] = {
+                        "chunks": set(entry["chunks"]), "days": set(entry["days"]),
+                        "open": {int(k): v for k, v in entry.get("open", {}).items()},
+                    }
+            except (OSError, ValueError, KeyError):
+                self.__exchanges = {}
+
+    @staticmethod
+    def bars_per_day(frequency: str = "daily") -> int:
+        """
+        Returns the number of bars of one trading day: 1 for "daily", the session
+        minutes for "intraday" (1-minute bars).
+        """
+        return session_minutes() if frequency == "intraday" else 1
+
+    def trading_days(self, from_date: str, to_date: str, exchange: str = "HOSE") -> np.ndarray:
+        """
+        Returns the trading days of an inclusive YYYY-MM-DD range (datetime64[D]).
+        """
+        start, end = self.__bounds(from_date, to_date)
+        self.load(from_date, to_date, exchange)
+        with self.__lock:
+            days = self.__array(exchange)
+        return days[np.searchsorted(days, start):np.searchsorted(days, end, side="right")]
+
+    def is_trading_day(self, day: str, exchange: str = "HOSE") -> bool:
+        return len(self.trading_days(day, day, exchange)) == 1
+
+    def is_closed(self, from_date: str, to_date: str, exchange: str = "HOSE") -> bool:
+        """
+        Tells, without any request, whether a range is known to hold no trading day:
+        it only has weekend days, or it is already loaded and has no trading day.
+        """
+        if not from_date or not to_date:
+            return False
+        start, end = self.__bounds(from_date, to_date)
+        if end < start:
+            return True
+        if not np.busday_count(start, end + 1):
+            return True
+        now = datetime.now(TIMEZONE)
+        with self.__lock:
+            entry = self.__exchanges.get(exchange)
+            if entry is None or any(
+                not self.__loaded(entry, c, now) for c in self.__chunk_ids(start, end)
+            ):
+                return False
+            days = self.__array(exchange)
+        return np.searchsorted(days, start) == np.searchsorted(days, end, side="right")
+
+    def expected_bars(
+        self, from_date: str, to_date: str, bars_per_day: int = 1, exchange: str = "HOSE"
+    ) -> int:
+        """
+        Returns the number of bars one symbol should have over a range.
+        """
+        return len(self.trading_days(from_date, to_date, exchange)) * bars_per_day
+
+    def missing(self, dates, from_date: str, to_date: str, exchange: str = "HOSE") -> np.ndarray:
+        """
+        Returns the trading days of a range absent from ``dates`` (the dates of
+        received rows, in any supported format), e.g. to check a download is complete.
+        """
+        return np.setdiff1d(
+            self.trading_days(from_date, to_date, exchange), parse_dates(dates)
+        )
+
+    def split(
+        self, from_date: str, to_date: str, days: int, max_bars: int = None,
+        bars_per_day: int = 1, exchange: str = "HOSE"
+    ) -> Iterator[tuple]:
+        """
+        Splits a range into windows of at most ``days`` trading days and at most
+        ``max_bars`` expected bars. Windows start and end on trading days, so
+        non-trading stretches are never requested.
+        Yields:
+            tuple: The first and last dates (YYYY-MM-DD) of each window.
+        """
+        per_window = days
+        if max_bars:
+            per_window = max(1, min(days, max_bars // max(bars_per_day, 1)))
+        trading = self.trading_days(from_date, to_date, exchange)
+        for i in range(0, len(trading), per_window):
+            window = trading[i:i + per_window]
+            yield str(window[0]), str(window[-1])
+
+    def load(self, from_date: str, to_date: str, exchange: str = "HOSE") -> None:
+        """
+        Loads the daily index rows of every chunk of a range not loaded yet.
+        """
+        start, end = self.__bounds(from_date, to_date)
+        now = datetime.now(TIMEZONE)
+        today = np.datetime64(now.date(), "D")
+        end = min(end, today)
+        with self.__lock:
+            entry = self.__exchanges.setdefault(exchange, {"chunks": set(), "days": set()})
+            entry.setdefault("open", {})
+            changed = False
+            for chunk in self.__chunk_ids(start, end):
+                if self.__loaded(entry, chunk, now):
+                    continue
+                first = np.datetime64(chunk * CHUNK_DAYS, "D")
+                last = min(first + CHUNK_DAYS - 1, today)
+                dates = [
+                    row.get("TradingDate") if isinstance(row, dict) else row.trading_date
+                    for page in self.api.iter_daily_indices_info(
+                        EXCHANGE_INDICES[exchange], str(first), str(last)
+                    )
+                    for row in page
+                ]
+                loaded = parse_dates(d for d in dates if d)
+                entry["days"].update(int(d) for d in loaded.astype(np.int64))
+                if last < today:
+                    entry["chunks"].add(chunk)
+                    entry["open"].pop(chunk, None)
+                else:
+                    entry["open"][chunk] = now.timestamp()
+                self.__arrays.pop(exchange, None)
+                changed = True
+            if changed:
+                self.__save()
+
+    def __loaded(self, entry: dict, chunk: int, now: datetime) -> bool:
+        """
+        Tells whether a chunk is loaded and still valid: past chunks always are, the
+        chunk holding today until the next session close, or ``open_ttl`` seconds after
+        it while today's row is missing.
+        """
+        if chunk in entry["chunks"]:
+            return True
+        fetched = entry.get("open", {}).get(chunk)
+        if fetched is None:
+            return False
+        fetched = datetime.fromtimestamp(fetched, TIMEZONE)
+        if fetched.date() != now.date():
+            return False
+        close = datetime.combine(now.date(), TRADING_SESSIONS[-1][1], TIMEZONE)
+        if fetched < close:
+            return now < close
+        today = np.datetime64(now.date(), "D")
+        if not np.is_busday(today) or int(today.astype(np.int64)) in entry["days"]:
+            return True
+        return (now - fetched).total_seconds() < self.open_ttl
+
+    @staticmethod
+    def __bounds(from_date: str, to_date: str) -> tuple:
+        return np.datetime64(from_date[:10], "D"), np.datetime64(to_date[:10], "D")
+
+    @staticmethod
+    def __chunk_ids(start: np.datetime64, end: np.datetime64) -> List[int]:
+        first = int(start.astype(np.int64)) // CHUNK_DAYS
+        last = int(end.astype(np.int64)) // CHUNK_DAYS
+        return list(range(first, last + 1))
+
+    def __array(self, exchange: str) -> np.ndarray:
+        days = self.__arrays.get(exchange)
+        if days is None:
+            entry = self.__exchanges.get(exchange, {"days": ()})
+            days = np.array(sorted(entry["days"]), dtype=np.int64).astype("datetime64[D]")
+            self.__arrays[exchange] = days
+        return days
+
+    def __save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as file:
+            json.dump({
+                exchange: {
+                    "chunks": sorted(e["chunks"]), "days": sorted(e["days"]),
+                    "open": e.get("open", {}),
+                }
+                for exchange, e in self.__exchanges.items()
+            }, file)
+        os.replace(tmp, self.path)
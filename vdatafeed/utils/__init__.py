@@ -1,5 +1,16 @@
 from .enum_handler import EnumHandler  # noqa: F401
-from .model_handler import BaseModel, AliasChoices, Field, model_validator  # noqa: F401
+from .model_handler import (  # noqa: F401
+    BaseModel, AliasChoices, Field, model_validator, field_validator, create_model, list_adapter,
+    ValidationError
+)
 from .request_handler import request_handler  # noqa: F401
+from .rate_handler import RateLimiter  # noqa: F401
+from .cache_handler import ResponseCache, normalize_key  # noqa: F401
+from .json_handler import JSONStream, select  # noqa: F401
 from .socket_handler import SocketListener  # noqa: F401
 from .jwt_handler import jwt_handler  # noqa: F401
+from .token_handler import TokenStore  # noqa: F401
+from .symbol_handler import SymbolTable  # noqa: F401
+from .dedup_handler import DedupWindow, OccurrenceCounter  # noqa: F401
+from .scheduler_handler import RequestScheduler  # noqa: F401
+from .credential_handler import Credential, CredentialPool  # noqa: F401
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# Trading dates are Vietnamese dates, whatever the timezone of the caller
+VN_TZ = timezone(timedelta(hours=7))
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d")
+
+
+def normalize_key(url: str, params: dict) -> str:
+    """
+    Builds a stable key for a GET request: parameter names are case-folded,
+    unset parameters are dropped and the remaining ones are sorted.
+    """
+    items = sorted(
+        (str(k).lower(), str(v)) for k, v in (params or {}).items() if v is not None
+    )
+    return json.dumps([url.rstrip("/"), items], separators=(",", ":"))
+
+
+class ResponseCache:
+    """
+    Two-tier cache of decoded GET responses: an in-memory LRU in front of an
+    optional directory of JSON files that survives across runs.
+
+    Entries whose date parameters all lie strictly before today (Vietnam time)
+    never expire, because historical data does not change. Entries touching today
+    or later, or whose range has no end date (open-ended up to today), get
+    ``today_ttl`` seconds and entries without any date parameter (reference data
+    such as index lists) get ``reference_ttl`` seconds.
+
+    Responses are kept serialized: every hit returns a new copy, which callers may
+    modify freely.
+
+    Args:
+        maxsize (int): The maximum number of entries kept in memory.
+        directory (str, optional): The disk tier directory. Defaults to None (memory only).
+        today_ttl (float): The lifetime of entries touching today, in seconds.
+        reference_ttl (float): The lifetime of entries without dates, in seconds.
+    """
+    def __init__(
+        self, maxsize: int = 1024, directory: str = None,
+        today_ttl: float = 30, reference_ttl: float = 3600
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.directory: Optional[str] = directory
+        self.today_ttl: float = today_ttl
+        self.reference_ttl: float = reference_ttl
+        self.__memory: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats: dict = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counters and the number of entries in memory.
+        """
+        with self.__lock:
+            return dict(self.__stats, size=len(self.__memory))
+
+    def ttl(self, params: dict) -> Optional[float]:
+        """
+        Returns the lifetime of a response for these parameters, None meaning forever.
+        """
+        names = [k for k in (params or {}) if "date" in str(k).lower()]
+        if not names:
+            return self.reference_ttl
+        dates, bounded = [], False
+        for k in names:
+            if params[k] is None:
+                continue
+            for fmt in DATE_FORMATS:
+                try:
+                    dates.append(datetime.strptime(str(params[k]), fmt).date())
+                    bounded |= str(k).lower().startswith("to")
+                    break
+                except ValueError:
+                    continue
+        # without an end date the range runs up to today
+        if not bounded or max(dates) >= datetime.now(VN_TZ).date():
+            return self.today_ttl
+        return None
+
+    def get(self, url: str, params: dict) -> Optional[dict]:
+        key = normalize_key(url, params)
+        now = time.time()
+        with self.__lock:
+            entry = self.__memory.get(key)
+            if entry and (entry[0] is None or entry[0] > now):
+                self.__memory.move_to_end(key)
+                self.__stats["hits"] += 1
+                self.__stats["memory_hits"] += 1
+                return json.loads(entry[1])
+        entry = self.__read(key)
+        with self.__lock:
+            if entry and (entry[0] is None or entry[0] > now):
+                self.__store(key, entry)
+                self.__stats["hits"] += 1
+                self.__stats["disk_hits"] += 1
+                return json.loads(entry[1])
+            self.__stats["misses"] += 1
+        return None
+
+    def put(self, url: str, params: dict, value: dict) -> None:
+        key = normalize_key(url, params)
+        ttl = self.ttl(params)
+        entry = (None if ttl is None else time.time() + ttl, json.dumps(value))
+        with self.__lock:
+            self.__store(key, entry)
+        self.__write(key, entry)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__memory.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def __store(self, key: str, entry: tuple) -> None:
+        self.__memory[key] = entry
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.maxsize:
+            self.__memory.popitem(last=False)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def __read(self, key: str) -> Optional[tuple]:
+        if not self.directory:
+            return None
+        try:
+            with open(self.__path(key), "r") as file:
+                entry = json.load(file)
+            return entry["expires"], json.dumps(entry["value"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __write(self, key: str, entry: tuple) -> None:
+        if not self.directory:
+            return
+        path = self.__path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as file:
+            file.write(f'{{"expires": {json.dumps(entry[0])}, "value": {entry[1]}}}')
+        os.replace(tmp, path)
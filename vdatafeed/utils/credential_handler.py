@@ -0,0 +1,127 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import List
+
+from .rate_handler import RateLimiter
+from .token_handler import TokenStore
+
+
+class Credential:
+    """
+    One consumer ID with its own token, token store and rate budget.
+    Attributes:
+        consumer_id (str): The consumer ID.
+        consumer_secret (str): The consumer secret.
+        store (TokenStore): The access token file of this consumer ID.
+        limiter (RateLimiter): The rate budget of this consumer ID.
+        token (str): The access token in use, None until requested.
+        in_flight (int): The requests currently sent with this credential.
+        cooldown_until (float): The monotonic time until which the credential is skipped.
+    """
+    def __init__(
+        self, consumer_id: str, consumer_secret: str, store: TokenStore, limiter: RateLimiter
+    ) -> None:
+        self.consumer_id: str = consumer_id
+        self.consumer_secret: str = consumer_secret
+        self.store: TokenStore = store
+        self.limiter: RateLimiter = limiter
+        self.token: str = None
+        self.in_flight: int = 0
+        self.cooldown_until: float = 0.0
+        self.requests: int = 0
+        self.throttled: int = 0
+
+
+class CredentialPool:
+    """
+    Spreads requests across several credentials, each with its own rate budget.
+
+    ``acquire`` hands out the healthy credential with the fewest requests in flight
+    and the shortest rate limiter backlog ("least_loaded"), or the next healthy one in
+    turn ("round_robin"). A throttled credential is skipped for ``cooldown`` seconds;
+    when every credential is cooling down, ``acquire`` waits for the first to recover.
+    A pool of one credential never cools down: there is nothing to fail over to.
+
+    Args:
+        credentials (List[Credential]): The credentials, at least one.
+        strategy (str): "least_loaded" (default) or "round_robin".
+        cooldown (float): Seconds a throttled credential is skipped. Defaults to 60.
+    """
+    STRATEGIES = ("least_loaded", "round_robin")
+
+    def __init__(
+        self, credentials: List[Credential], strategy: str = "least_loaded", cooldown: float = 60
+    ) -> None:
+        if not credentials:
+            raise ValueError("A credential pool needs at least one credential")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {self.STRATEGIES}")
+        self.credentials: List[Credential] = list(credentials)
+        self.strategy: str = strategy
+        self.cooldown: float = cooldown
+        self.__lock = threading.Lock()
+        self.__turn: int = 0
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def __pick(self) -> Credential:
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                healthy = [c for c in self.credentials if c.cooldown_until <= now]
+                if healthy:
+                    if self.strategy == "round_robin":
+                        n = len(self.credentials)
+                        for step in range(n):
+                            credential = self.credentials[(self.__turn + step) % n]
+                            if credential.cooldown_until <= now:
+                                self.__turn = (self.__turn + step + 1) % n
+                                break
+                    else:
+                        credential = min(healthy, key=lambda c: (c.in_flight, c.limiter.backlog))
+                    credential.in_flight += 1
+                    credential.requests += 1
+                    return credential
+                wait = min(c.cooldown_until for c in self.credentials) - now
+            time.sleep(wait)
+
+    @contextmanager
+    def acquire(self):
+        """
+        Holds a credential for the duration of one request.
+        """
+        credential = self.__pick()
+        try:
+            yield credential
+        finally:
+            with self.__lock:
+                credential.in_flight -= 1
+
+    def throttle(self, credential: Credential, seconds: float = None) -> None:
+        """
+        Puts a credential on cooldown after the API refused it (HTTP 429).
+        """
+        with self.__lock:
+            credential.throttled += 1
+            if len(self.credentials) > 1:
+                credential.cooldown_until = time.monotonic() + (
+                    self.cooldown if seconds is None else seconds
+                )
+
+    @property
+    def stats(self) -> list:
+        """
+        Returns the requests sent, throttles and current state of every credential.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            return [
+                {
+                    "consumer_id": c.consumer_id, "requests": c.requests,
+                    "throttled": c.throttled, "in_flight": c.in_flight,
+                    "cooldown": max(c.cooldown_until - now, 0.0),
+                }
+                for c in self.credentials
+            ]
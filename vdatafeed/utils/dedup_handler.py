@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from typing import Hashable
+
+
+class DedupWindow:
+    """
+    Remembers the last ``size`` keys in a fixed ring, so memory stays bounded however
+    long it runs. Store small keys (e.g. hashes) to keep it compact.
+    """
+    def __init__(self, size: int = 8192) -> None:
+        self.size: int = size
+        self.__ring: list = [None] * size
+        self.__keys: set = set()
+        self.__pos: int = 0
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Records ``key``.
+        Returns:
+            bool: False if the key was already in the window.
+        """
+        if key in self.__keys:
+            return False
+        old = self.__ring[self.__pos]
+        if old is not None:
+            self.__keys.discard(old)
+        self.__ring[self.__pos] = key
+        self.__keys.add(key)
+        self.__pos = (self.__pos + 1) % self.size
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__keys
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+
+class OccurrenceCounter:
+    """
+    Counts how many times each key was seen, remembering the ``size`` most recently
+    seen keys so memory stays bounded.
+    """
+    def __init__(self, size: int = 8192) -> None:
+        self.size: int = size
+        self.__counts: OrderedDict = OrderedDict()
+
+    def add(self, key: Hashable) -> int:
+        """
+        Records one more occurrence of ``key``.
+        Returns:
+            int: The number of occurrences so far, this one included.
+        """
+        count = self.__counts.pop(key, 0) + 1
+        self.__counts[key] = count
+        if len(self.__counts) > self.size:
+            self.__counts.popitem(last=False)
+        return count
+
+    def __len__(self) -> int:
+        return len(self.__counts)
@@ -0,0 +1,138 @@
+import json
+import codecs
+from typing import Iterable, Iterator
+
+WHITESPACE = " \t\n\r"
+
+
+def select(obj, path: tuple) -> Iterator:
+    """
+    Yields the items reached by ``path`` in an already decoded document.
+    Object keys descend into their value and arrays are walked element by element,
+    e.g. ``("data", "RepeatedInfo")`` yields every RepeatedInfo item of every
+    element of ``data``.
+    """
+    if isinstance(obj, list):
+        for i in obj:
+            if path:
+                yield from select(i, path)
+            else:
+                yield i
+    elif isinstance(obj, dict) and path:
+        if obj.get(path[0]) is not None:
+            yield from select(obj[path[0]], path[1:])
+
+
+class JSONStream:
+    """
+    Incremental parser for a JSON document received as byte chunks.
+    Iterating yields the items selected by ``path`` (same semantics as ``select``) one
+    at a time while the body is still being received, so only the current item is
+    ever held as Python objects. The other top-level members (``totalRecord``,
+    ``message``...) are collected in ``meta``; members placed after the selected
+    array are only available once the iteration is finished.
+    Args:
+        chunks (Iterable[bytes]): The raw (already decompressed) body.
+        path (tuple): The members leading to the items. Defaults to ("data",).
+        on_close (callable, optional): Called once the document is consumed.
+    """
+    def __init__(self, chunks: Iterable[bytes], path: tuple = ("data",), on_close=None) -> None:
+        self.path: tuple = path
+        self.meta: dict = {}
+        self.__chunks = iter(chunks)
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__json = json.JSONDecoder()
+        self.__buf: str = ""
+        self.__pos: int = 0
+        self.__eof: bool = False
+        self.__on_close = on_close
+
+    def __iter__(self) -> Iterator:
+        try:
+            self.__skip()
+            yield from self.__container(self.path, top=True)
+        finally:
+            if self.__on_close:
+                self.__on_close()
+
+    def __fill(self) -> bool:
+        if self.__eof:
+            return False
+        if self.__pos > 65536:
+            self.__buf = self.__buf[self.__pos:]
+            self.__pos = 0
+        for chunk in self.__chunks:
+            text = self.__decoder.decode(chunk)
+            if text:
+                self.__buf += text
+                return True
+        self.__buf += self.__decoder.decode(b"", final=True)
+        self.__eof = True
+        return False
+
+    def __skip(self) -> None:
+        while True:
+            while self.__pos < len(self.__buf) and self.__buf[self.__pos] in WHITESPACE:
+                self.__pos += 1
+            if self.__pos < len(self.__buf) or not self.__fill():
+                return
+
+    def __peek(self) -> str:
+        self.__skip()
+        if self.__pos >= len(self.__buf):
+            raise ValueError("Unexpected end of JSON document")
+        return self.__buf[self.__pos]
+
+    def __expect(self, char: str) -> None:
+        if self.__peek() != char:
+            raise ValueError(f"Expected {char!r} at position {self.__pos}")
+        self.__pos += 1
+
+    def __value(self):
+        self.__skip()
+        while True:
+            try:
+                value, end = self.__json.raw_decode(self.__buf, self.__pos)
+                # a number ending exactly at the buffer end may continue in the next chunk
+                if end < len(self.__buf) or self.__eof or not self.__fill():
+                    self.__pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not self.__fill():
+                    raise
+
+    def __container(self, path: tuple, top: bool = False) -> Iterator:
+        if self.__peek() == "[":
+            self.__pos += 1
+            if self.__peek() == "]":
+                self.__pos += 1
+                return
+            while True:
+                if path:
+                    yield from self.__container(path)
+                else:
+                    yield self.__value()
+                if self.__peek() == "]":
+                    self.__pos += 1
+                    return
+                self.__expect(",")
+        elif self.__peek() == "{" and path:
+            self.__pos += 1
+            if self.__peek() == "}":
+                self.__pos += 1
+                return
+            while True:
+                key = self.__value()
+                self.__expect(":")
+                if key == path[0] and self.__peek() in "[{":
+                    yield from self.__container(path[1:])
+                else:
+                    value = self.__value()
+                    if top:
+                        self.meta[key] = value
+                if self.__peek() == "}":
+                    self.__pos += 1
+                    return
+                self.__expect(",")
+        else:
+            self.__value()
@@ -6,10 +6,15 @@ class JWTHandler:
     def is_expired(self, bearer_token: str) -> bool:
         if bearer_token is None:
             return True
-        decoded = jwt.decode(
-            bearer_token.replace("Bearer ", ""),
-            options={"verify_signature": False}
-        )
+        try:
+            decoded = jwt.decode(
+                bearer_token.replace("Bearer ", ""),
+                options={"verify_signature": False}
+            )
+        except jwt.PyJWTError:
+            return True  # damaged token file
+        if decoded.get("exp") is None:
+            return True
         return int(time.time()) > (decoded.get("exp") - 1)
 
 
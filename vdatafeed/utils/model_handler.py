@@ -1,4 +1,8 @@
+from functools import lru_cache
+from typing import List
+
 from pydantic import BaseModel as BM, ConfigDict, Field, AliasChoices, model_validator  # noqa: F401
+from pydantic import TypeAdapter, ValidationError, create_model, field_validator  # noqa: F401
 
 
 class BaseModel(BM):
@@ -6,3 +10,11 @@ class BaseModel(BM):
         use_enum_values=True,
         validate_return=True
     )
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model) -> TypeAdapter:
+    """
+    Returns the cached adapter validating a whole list of ``model`` rows in one call.
+    """
+    return TypeAdapter(List[model])
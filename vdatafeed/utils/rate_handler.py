@@ -0,0 +1,32 @@
+import time
+import threading
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls at least ``interval`` seconds apart.
+    Slots are reserved under a lock and waited for outside of it, so concurrent
+    workers sharing one limiter queue up behind the same request budget.
+    """
+    def __init__(self, interval: float = 1) -> None:
+        self.interval: float = interval
+        self.__lock = threading.Lock()
+        self.__next_slot: float = 0
+
+    def acquire(self) -> float:
+        with self.__lock:
+            now = time.monotonic()
+            slot = max(now, self.__next_slot)
+            self.__next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    @property
+    def backlog(self) -> float:
+        """
+        Returns the seconds until the next free slot, 0 when a call would not wait.
+        """
+        with self.__lock:
+            return max(self.__next_slot - time.monotonic(), 0.0)
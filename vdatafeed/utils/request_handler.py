@@ -1,13 +1,21 @@
 import time
 import requests
 
+from .rate_handler import RateLimiter
+from .json_handler import JSONStream
+
 
 class RequestHandler:
     def __init__(self) -> None:
         self.__timeout: int = 10
 
-    def get(self, url: str, headers: dict, params: dict, limit: int = 0) -> dict:
+    def get(
+        self, url: str, headers: dict, params: dict, limit: int = 0,
+        limiter: RateLimiter = None
+    ) -> dict:
         try:
+            if limiter:
+                limiter.acquire()
             print(f"[vDatafeed] Call ~> GET: {url}: {params}")
             res = requests.get(url, headers=headers, params=params, timeout=self.__timeout)
             if limit:
@@ -17,8 +25,52 @@ class RequestHandler:
         except requests.RequestException as e:
             raise e
 
-    def post(self, url: str, headers: dict, data: dict = {}, limit: int = 0) -> dict:
+    def get_bytes(
+        self, url: str, headers: dict, params: dict, limit: int = 0, limiter: RateLimiter = None
+    ) -> bytes:
+        """
+        Sends a GET request and returns the undecoded body, for parsing elsewhere.
+        """
+        try:
+            if limiter:
+                limiter.acquire()
+            print(f"[vDatafeed] Call ~> GET (raw): {url}: {params}")
+            res = requests.get(url, headers=headers, params=params, timeout=self.__timeout)
+            if limit:
+                time.sleep(limit)
+            res.raise_for_status()
+            return res.content
+        except requests.RequestException as e:
+            raise e
+
+    def stream(
+        self, url: str, headers: dict, params: dict, path: tuple = ("data",),
+        limit: int = 0, limiter: RateLimiter = None, chunk_size: int = 65536
+    ) -> JSONStream:
+        """
+        Sends a GET request and parses the body incrementally while it is received.
+        The connection is released once the returned stream has been iterated.
+        """
+        try:
+            if limiter:
+                limiter.acquire()
+            print(f"[vDatafeed] Call ~> GET (stream): {url}: {params}")
+            res = requests.get(
+                url, headers=headers, params=params, timeout=self.__timeout, stream=True
+            )
+            if limit:
+                time.sleep(limit)
+            res.raise_for_status()
+            return JSONStream(res.iter_content(chunk_size=chunk_size), path, on_close=res.close)
+        except requests.RequestException as e:
+            raise e
+
+    def post(
+        self, url: str, headers: dict, data: dict = {}, limit: int = 0, limiter: RateLimiter = None
+    ) -> dict:
         try:
+            if limiter:
+                limiter.acquire()
             print(f"[vDatafeed] Call ~> POST: {url} data: {data}")
             if data:
                 res = requests.post(url, headers=headers, json=data, timeout=self.__timeout)
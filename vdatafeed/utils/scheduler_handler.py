@@ -0,0 +1,158 @@
+import time
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Hashable
+
+from .rate_handler import RateLimiter
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("vdatafeed_priority", default=None)
+
+
+class _Entry:
+    __slots__ = ("key", "fn", "future", "enqueued", "priority", "dispatched")
+
+    def __init__(self, key: Hashable, fn: Callable, priority: int) -> None:
+        self.key = key
+        self.fn = fn
+        self.future: Future = Future()
+        self.enqueued: float = time.monotonic()
+        self.priority: int = priority
+        self.dispatched: bool = False
+
+
+class RequestScheduler:
+    """
+    Central queue in front of the request handler.
+
+    * Single-flight: a request whose key is already queued or running is merged into
+      it and shares its result instead of being sent again.
+    * Priorities: each slot of the rate budget goes to the highest priority waiting
+      request (lower number first), chosen when the slot becomes available. A lower
+      priority that has been passed over ``starvation`` times in a row is served
+      next, so bulk backfills keep progressing behind interactive lookups.
+    * Queue wait times are recorded per priority in ``stats``.
+
+    Args:
+        limiter (RateLimiter, optional): The rate budget shared by every request.
+        workers (int): The number of requests in flight at once. Defaults to 4.
+        starvation (int): Slots a waiting lower priority can be passed over. Defaults to 4.
+    """
+    INTERACTIVE = 0
+    NORMAL = 5
+    BATCH = 10
+
+    def __init__(self, limiter: RateLimiter = None, workers: int = 4, starvation: int = 4):
+        self.limiter: RateLimiter = limiter
+        self.starvation: int = starvation
+        self.default_priority: int = self.NORMAL
+        self.__cond = threading.Condition()
+        self.__queues: dict = {}  # priority -> deque of entries
+        self.__skipped: dict = {}  # priority -> slots passed over in a row
+        self.__pending: dict = {}  # key -> entry, queued or running
+        self.__waiting: int = 0
+        self.__claimed: int = 0  # workers holding or waiting for a rate slot
+        self.__stats: dict = {"submitted": 0, "merged": 0, "completed": 0, "wait": {}}
+        for n in range(workers):
+            threading.Thread(
+                target=self.__work, name=f"vdatafeed-scheduler-{n}", daemon=True
+            ).start()
+
+    @contextmanager
+    def priority(self, level: int):
+        """
+        Sets the priority of the requests submitted inside the block, including from
+        threads started with a copy of the current context.
+        """
+        token = _priority.set(level)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def submit(self, key: Hashable, fn: Callable, priority: int = None) -> Future:
+        """
+        Queues ``fn`` unless an identical request (same ``key``) is already pending.
+        Returns:
+            Future: The result of the (possibly shared) request.
+        """
+        if priority is None:
+            priority = _priority.get()
+        if priority is None:
+            priority = self.default_priority
+        with self.__cond:
+            self.__stats["submitted"] += 1
+            entry = self.__pending.get(key)
+            if entry is not None:
+                self.__stats["merged"] += 1
+                if not entry.dispatched and priority < entry.priority:
+                    # promote: the entry is served from whichever queue reaches it first
+                    entry.priority = priority
+                    self.__queues.setdefault(priority, deque()).append(entry)
+                return entry.future
+            entry = self.__pending[key] = _Entry(key, fn, priority)
+            self.__queues.setdefault(priority, deque()).append(entry)
+            self.__waiting += 1
+            self.__cond.notify()
+        return entry.future
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the request counters and the queue wait times (seconds) per priority.
+        """
+        with self.__cond:
+            wait = {
+                p: {"count": w[0], "mean": w[1] / w[0] if w[0] else 0.0, "max": w[2]}
+                for p, w in self.__stats["wait"].items()
+            }
+            return dict(self.__stats, wait=wait, queued=self.__waiting)
+
+    def __next(self) -> _Entry:
+        levels = sorted(p for p, q in self.__queues.items() if q)
+        chosen = levels[0]
+        for level in levels[1:]:
+            if self.__skipped.get(level, 0) >= self.starvation:
+                chosen = level
+                break
+        for level in levels:
+            self.__skipped[level] = 0 if level == chosen else self.__skipped.get(level, 0) + 1
+        while True:
+            entry = self.__queues[chosen].popleft()
+            if not entry.dispatched:
+                return entry
+            if not self.__queues[chosen]:
+                return None
+
+    def __work(self) -> None:
+        while True:
+            with self.__cond:
+                while self.__waiting <= self.__claimed:
+                    self.__cond.wait()
+                self.__claimed += 1
+            if self.limiter:
+                self.limiter.acquire()
+            with self.__cond:
+                self.__claimed -= 1
+                entry = None
+                while self.__waiting and entry is None:
+                    entry = self.__next()
+                if entry is None:
+                    continue  # another worker took it while we waited for the slot
+                entry.dispatched = True
+                self.__waiting -= 1
+                waited = time.monotonic() - entry.enqueued
+                stat = self.__stats["wait"].setdefault(entry.priority, [0, 0.0, 0.0])
+                stat[0] += 1
+                stat[1] += waited
+                stat[2] = max(stat[2], waited)
+            try:
+                entry.future.set_result(entry.fn())
+            except BaseException as e:
+                entry.future.set_exception(e)
+            finally:
+                with self.__cond:
+                    self.__pending.pop(entry.key, None)
+                    self.__stats["completed"] += 1
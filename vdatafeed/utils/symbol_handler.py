@@ -0,0 +1,44 @@
+import sys
+from typing import Iterable, List, Optional
+
+
+class SymbolTable:
+    """
+    Interns symbols into dense integer ids (0, 1, 2...) so that per-symbol state
+    can live in arrays indexed by id instead of dicts keyed by strings.
+    """
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self.__ids: dict = {}
+        self.__names: List[str] = []
+        for symbol in symbols:
+            self.id(symbol)
+
+    def id(self, symbol: str) -> int:
+        """
+        Returns the id of ``symbol``, assigning the next free id on first sight.
+        """
+        sid = self.__ids.get(symbol)
+        if sid is None:
+            symbol = sys.intern(str(symbol))  # also accepts numpy strings
+            sid = self.__ids[symbol] = len(self.__names)
+            self.__names.append(symbol)
+        return sid
+
+    def get(self, symbol: str) -> Optional[int]:
+        """
+        Returns the id of ``symbol`` or None if it was never seen.
+        """
+        return self.__ids.get(symbol)
+
+    def name(self, sid: int) -> str:
+        return self.__names[sid]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.__names)
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.__ids
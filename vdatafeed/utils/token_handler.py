@@ -0,0 +1,89 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class TokenStore:
+    """
+    Access token shared by every process using the same file.
+
+    Writes go through a temporary file and a rename, so readers never see a partial
+    token. Refreshes are serialized by an advisory lock on ``<path>.lock`` and the
+    file is read again once the lock is held: when several processes find the token
+    expired at the same time, the first one refreshes it and the others pick up its
+    token without a network call.
+
+    Args:
+        path (str): The token file. Defaults to "vdatafeed.session".
+    """
+    def __init__(self, path: str = "vdatafeed.session") -> None:
+        self.path: str = path
+        self.__lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def read(self) -> Optional[str]:
+        try:
+            with open(self.path, "r") as file:
+                return file.read().strip() or None
+        except OSError:
+            return None
+
+    def write(self, token: str) -> None:
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as file:
+            file.write(token)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.path)
+
+    @contextmanager
+    def lock(self):
+        """
+        Holds the exclusive advisory lock of the store, across threads and processes.
+        """
+        with self.__lock:
+            with open(self.path + ".lock", "a+") as file:
+                if fcntl:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+                else:
+                    while True:
+                        try:
+                            file.seek(0)
+                            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue  # LK_LOCK gives up after 10 seconds
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+                    else:
+                        file.seek(0)
+                        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def get(self, is_expired: Callable[[str], bool], refresh: Callable[[], str]) -> Optional[str]:
+        """
+        Returns a valid token, calling ``refresh`` only if no other process did it.
+        Args:
+            is_expired (callable): Tells whether a token must be replaced.
+            refresh (callable): Fetches a new token, or returns None on failure.
+        """
+        token = self.read()
+        if not is_expired(token):
+            return token
+        with self.lock():
+            token = self.read()
+            if not is_expired(token):
+                return token  # refreshed by another process while we waited
+            token = refresh()
+            if token:
+                self.write(token)
+            return token